@@ -2,15 +2,57 @@
 LqIconGenerator - Generate simple colored icons for buttons
 """
 
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QBrush, QPen, QFont, QPainterPath
-from PySide6.QtCore import Qt, QRect, QRectF
+from collections import OrderedDict
+
+from PySide6.QtGui import QIcon, QPixmap, QPainter, QBrush, QPen, QFont, QColor, QGuiApplication
+from PySide6.QtCore import Qt, QRect
+
+RIBBON_ICON_CACHE_SIZE = 256
+
+ACTION_ICON_SPECS = {
+    "Full Screen": {"icon_type": "fullscreen", "bg_color": "#4682B4"},
+    "MDI Mode": {"icon_type": "grid", "bg_color": "#5F9EA0"},
+    "Tab Mode": {"icon_type": "tab", "bg_color": "#6495ED"},
+    "Tile Window": {"icon_type": "grid", "bg_color": "#7B68EE"},
+    "Language": {"text": "A", "bg_color": "#4682B4"},
+    "Version": {"text": "V", "bg_color": "#5F9EA0"},
+    "Check Update": {"text": "↻", "bg_color": "#6495ED"},
+    "Help Document": {"text": "?", "bg_color": "#4682B4"},
+    "Assistant": {"text": "☺", "bg_color": "#5F9EA0"},
+}
 
 
 class LqIconGenerator:
     """Generate simple colored icons"""
 
+    _cache = OrderedDict()
+    _cache_limit = RIBBON_ICON_CACHE_SIZE
+    _fonts = {}
+    _atlas = None
+
+    @staticmethod
+    def device_pixel_ratio():
+        """Return the primary screen's device pixel ratio, or 1.0 without a screen."""
+        screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() else None
+        return screen.devicePixelRatio() if screen is not None else 1.0
+
     @staticmethod
-    def create_colored_icon(text="", bg_color="#2B579A", text_color="white", size=24, icon_type=None):
+    def cache_key(text="", bg_color="#2B579A", text_color="white", size=24, icon_type=None,
+                  device_pixel_ratio=None):
+        if device_pixel_ratio is None:
+            device_pixel_ratio = LqIconGenerator.device_pixel_ratio()
+        return (
+            text or "",
+            QColor(bg_color).rgba(),
+            QColor(text_color).rgba(),
+            int(size),
+            icon_type,
+            float(device_pixel_ratio),
+        )
+
+    @staticmethod
+    def create_colored_icon(text="", bg_color="#2B579A", text_color="white", size=24, icon_type=None,
+                            device_pixel_ratio=None):
         """Create a simple colored icon with text or shape
 
         Args:
@@ -19,24 +61,146 @@ class LqIconGenerator:
             text_color: Text color
             size: Icon size
             icon_type: Special icon type for drawing shapes
+            device_pixel_ratio: Rasterization scale, defaults to the primary screen's
+
+        Returns:
+            QIcon: Generated icon, shared with later calls using the same arguments
+        """
+        key = LqIconGenerator.cache_key(
+            text, bg_color, text_color, size, icon_type, device_pixel_ratio
+        )
+        icon = LqIconGenerator._cached(key)
+        if icon is None:
+            icon = LqIconGenerator.create_icons({key: key})[key]
+        return icon
+
+    @staticmethod
+    def create_icons(specs, device_pixel_ratio=None):
+        """Create several icons at once, rendering cache misses into one shared atlas.
+
+        Args:
+            specs: Mapping of name to ``create_colored_icon`` keyword arguments or cache keys
 
         Returns:
-            QIcon: Generated icon
+            dict: Mapping of name to QIcon
         """
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.GlobalColor.transparent)
+        icons = {}
+        missing = OrderedDict()
+        for name, spec in specs.items():
+            if isinstance(spec, tuple):
+                key = spec
+            else:
+                spec = dict(spec)
+                spec.setdefault("device_pixel_ratio", device_pixel_ratio)
+                key = LqIconGenerator.cache_key(**spec)
+            icon = LqIconGenerator._cached(key)
+            if icon is None:
+                missing.setdefault(key, []).append(name)
+            else:
+                icons[name] = icon
+        batches = {}
+        for key in missing:
+            batches.setdefault(key[5], []).append(key)
+        for keys in batches.values():
+            for key, pixmap in LqIconGenerator._render_atlas(keys).items():
+                icon = QIcon(pixmap)
+                LqIconGenerator._store(key, icon)
+                for name in missing[key]:
+                    icons[name] = icon
+        return icons
+
+    @staticmethod
+    def atlas():
+        """Return the pixmap the most recent batch of icons was rendered into."""
+        return LqIconGenerator._atlas
+
+    @staticmethod
+    def set_cache_limit(limit):
+        LqIconGenerator._cache_limit = max(1, int(limit))
+        LqIconGenerator._evict()
+
+    @staticmethod
+    def cache_limit():
+        return LqIconGenerator._cache_limit
 
-        painter = QPainter(pixmap)
+    @staticmethod
+    def cache_size():
+        return len(LqIconGenerator._cache)
+
+    @staticmethod
+    def clear_cache():
+        LqIconGenerator._cache.clear()
+        LqIconGenerator._fonts.clear()
+        LqIconGenerator._atlas = None
+
+    @staticmethod
+    def _cached(key):
+        icon = LqIconGenerator._cache.get(key)
+        if icon is not None:
+            LqIconGenerator._cache.move_to_end(key)
+        return icon
+
+    @staticmethod
+    def _store(key, icon):
+        LqIconGenerator._cache[key] = icon
+        LqIconGenerator._cache.move_to_end(key)
+        LqIconGenerator._evict()
+
+    @staticmethod
+    def _evict():
+        while len(LqIconGenerator._cache) > LqIconGenerator._cache_limit:
+            LqIconGenerator._cache.popitem(last=False)
+
+    @staticmethod
+    def _font(size):
+        font = LqIconGenerator._fonts.get(size)
+        if font is None:
+            font = LqIconGenerator._fonts[size] = QFont("Segoe UI", int(size * 0.35), QFont.Weight.Normal)
+        return font
+
+    @staticmethod
+    def _render_atlas(keys):
+        """Paint keys sharing one pixel ratio side by side and slice out per-icon pixmaps."""
+        ratio = keys[0][5]
+        width = sum(key[3] for key in keys)
+        height = max(key[3] for key in keys)
+        atlas = QPixmap(round(width * ratio), round(height * ratio))
+        atlas.setDevicePixelRatio(ratio)
+        atlas.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(atlas)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        offsets = []
+        x = 0
+        for key in keys:
+            offsets.append(x)
+            painter.save()
+            painter.translate(x, 0)
+            painter.setClipRect(0, 0, key[3], key[3])
+            LqIconGenerator._paint_icon(painter, *key[:5])
+            painter.restore()
+            x += key[3]
+        painter.end()
+        LqIconGenerator._atlas = atlas
 
-        # Import QColor here
-        from PySide6.QtGui import QColor
+        pixmaps = {}
+        for key, offset in zip(keys, offsets):
+            size = key[3]
+            source = QRect(round(offset * ratio), 0, round(size * ratio), round(size * ratio))
+            pixmap = atlas.copy(source)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmaps[key] = pixmap
+        return pixmaps
+
+    @staticmethod
+    def _paint_icon(painter, text, bg_color, text_color, size, icon_type):
+        bg_color = QColor.fromRgba(bg_color)
+        text_color = QColor.fromRgba(text_color)
 
         # Draw background only if we have content
         if text or icon_type:
             # Draw flat background
-            brush = QBrush(QColor(bg_color))
-            painter.setBrush(brush)
+            painter.setBrush(QBrush(bg_color))
             painter.setPen(Qt.PenStyle.NoPen)
 
             # Draw rounded rectangle with minimal radius for flat look
@@ -46,14 +210,14 @@ class LqIconGenerator:
             # Draw content
             if icon_type == "fullscreen":
                 # Draw fullscreen icon
-                painter.setPen(QPen(QColor(text_color), 2))
+                painter.setPen(QPen(text_color, 2))
                 painter.setBrush(Qt.BrushStyle.NoBrush)
                 inner_rect = QRect(8, 8, size-16, size-16)
                 painter.drawRect(inner_rect)
 
             elif icon_type == "grid":
                 # Draw grid icon for MDI/Tile
-                painter.setPen(QPen(QColor(text_color), 1.5))
+                painter.setPen(QPen(text_color, 1.5))
                 painter.setBrush(Qt.BrushStyle.NoBrush)
                 # Draw 4 squares
                 w = (size - 16) // 2
@@ -64,7 +228,7 @@ class LqIconGenerator:
 
             elif icon_type == "tab":
                 # Draw tab icon
-                painter.setPen(QPen(QColor(text_color), 1.5))
+                painter.setPen(QPen(text_color, 1.5))
                 painter.setBrush(Qt.BrushStyle.NoBrush)
                 # Draw tab shape
                 tab_w = size - 14
@@ -74,30 +238,11 @@ class LqIconGenerator:
 
             elif text:
                 # Draw text
-                painter.setPen(QPen(QColor(text_color)))
-                font = QFont("Segoe UI", int(size * 0.35), QFont.Weight.Normal)
-                painter.setFont(font)
+                painter.setPen(QPen(text_color))
+                painter.setFont(LqIconGenerator._font(size))
                 painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
 
-        painter.end()
-        return QIcon(pixmap)
-
     @staticmethod
     def get_action_icons():
         """Get predefined icons for all actions"""
-        icons = {
-            "Full Screen": LqIconGenerator.create_colored_icon(icon_type="fullscreen", bg_color="#4682B4"),
-            "MDI Mode": LqIconGenerator.create_colored_icon(icon_type="grid", bg_color="#5F9EA0"),
-            "Tab Mode": LqIconGenerator.create_colored_icon(icon_type="tab", bg_color="#6495ED"),
-            "Tile Window": LqIconGenerator.create_colored_icon(icon_type="grid", bg_color="#7B68EE"),
-            "Language": LqIconGenerator.create_colored_icon("A", "#4682B4"),
-            "Version": LqIconGenerator.create_colored_icon("V", "#5F9EA0"),
-            "Check Update": LqIconGenerator.create_colored_icon("↻", "#6495ED"),
-            "Help Document": LqIconGenerator.create_colored_icon("?", "#4682B4"),
-            "Assistant": LqIconGenerator.create_colored_icon("☺", "#5F9EA0"),
-        }
-        return icons
-
-
-# Import QColor for the module
-from PySide6.QtGui import QColor
\ No newline at end of file
+        return LqIconGenerator.create_icons(ACTION_ICON_SPECS)
@@ -16,8 +16,9 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QMdiArea,
 )
-from PySide6.QtCore import Qt, Signal, QEvent, QSize, QTimer
+from PySide6.QtCore import Qt, Signal, QEvent, QObject, QSize, QTimer
 from PySide6.QtGui import QAction, QIcon, QPainter, QColor, QPen, QPixmap, QPalette
+from shiboken6 import isValid as _qt_object_is_valid
 from .lq_styles import (
     LqStyle,
     RibbonPlatformLayout,
@@ -29,9 +30,11 @@ from .lq_ribbon_extras import (
     CallableList,
     LqRibbonCustomizeDialog,
     LqRibbonCustomizeManager,
+    LqRibbonListSearchProvider,
     LqRibbonProgressBar,
     LqRibbonQuickAccessBar,
     LqRibbonSearchBar,
+    LqRibbonSearchIndex,
     LqRibbonSystemButton,
     QtnRibbonMinimizeActionString,
     QtnRibbonSimplifiedRibbonActionString,
@@ -60,6 +63,19 @@ RIBBON_MAC_SIMPLIFIED_HEIGHT = 116
 RIBBON_MAC_GROUP_HEIGHT = 86
 RIBBON_MAC_WINDOW_BUTTON_SIZE = 12
 RIBBON_MAC_WINDOW_BUTTON_SPACING = 8
+RIBBON_LAYOUT_GEOMETRY = 0x01
+RIBBON_LAYOUT_METRICS = 0x02
+RIBBON_LAYOUT_WINDOW_CONTROLS = 0x04
+RIBBON_LAYOUT_SEARCH = 0x08
+RIBBON_LAYOUT_QUICK_ACCESS = 0x10
+RIBBON_LAYOUT_CHROME = (
+    RIBBON_LAYOUT_GEOMETRY
+    | RIBBON_LAYOUT_WINDOW_CONTROLS
+    | RIBBON_LAYOUT_SEARCH
+    | RIBBON_LAYOUT_QUICK_ACCESS
+)
+RIBBON_LAYOUT_ALL = RIBBON_LAYOUT_CHROME | RIBBON_LAYOUT_METRICS
+RIBBON_SEARCH_RECENT_BOOST = 15
 
 
 class _RibbonCollapseButton(QToolButton):
@@ -179,6 +195,39 @@ class _RibbonWindowButton(QToolButton):
             painter.drawLine(center_x + 5, center_y - 5, center_x - 5, center_y + 5)
 
 
+class _RibbonCentralWidgetWatcher(QObject):
+    """Drops the ribbon's cached MDI area and frame colours when the central widget changes."""
+
+    def __init__(self, ribbon_bar):
+        super().__init__(ribbon_bar)
+        self._ribbon_bar = ribbon_bar
+
+    def eventFilter(self, obj, event):
+        if (
+            event.type() in (QEvent.Type.ChildAdded, QEvent.Type.ChildRemoved)
+            and event.child().isWidgetType()
+        ):
+            self._ribbon_bar._invalidate_mdi_area()
+        elif event.type() == QEvent.Type.PaletteChange:
+            self._ribbon_bar._invalidate_paint_resources()
+        return False
+
+
+class _RibbonUpdateTransaction:
+    """Context manager that wraps LqRibbonBar.beginUpdate/endUpdate."""
+
+    def __init__(self, ribbon_bar):
+        self._ribbon_bar = ribbon_bar
+
+    def __enter__(self):
+        self._ribbon_bar.beginUpdate()
+        return self._ribbon_bar
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._ribbon_bar.endUpdate()
+        return False
+
+
 class LqRibbonBar(QTabWidget):
     """Ribbon bar that contains multiple ribbon pages"""
 
@@ -206,6 +255,7 @@ class LqRibbonBar(QTabWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._palette_theming = False
         self.pages = CallableList()
         self._quick_access_bar = LqRibbonQuickAccessBar(self)
         self._title_button_bar = QToolBar(self)
@@ -217,6 +267,9 @@ class LqRibbonBar(QTabWidget):
         self._ribbon_minimized = False
         self._ribbon_temporary_expanded = False
         self._ignore_next_tab_release = False
+        self._scoped_event_filter = True
+        self._application_event_filter_installed = False
+        self._filtered_event_count = 0
         self._minimization_enabled = True
         self._simplified_mode = False
         self._simplified_mode_enabled = True
@@ -241,9 +294,10 @@ class LqRibbonBar(QTabWidget):
         self._simplified_action.setCheckable(True)
         self._simplified_action.toggled.connect(self.setSimplifiedMode)
         self._search_suggestions = []
-        self._search_document_results = []
-        self._search_related_files = []
+        self._search_result_lists = {}
+        self._search_result_providers = {}
         self._search_actions = []
+        self._search_index = LqRibbonSearchIndex(self)
         self._recent_search_actions = []
         self._recent_search_limit = 8
         self._search_action_trigger_enabled = True
@@ -253,6 +307,19 @@ class LqRibbonBar(QTabWidget):
         self._key_tips = {}
         self._caption_drag_global_pos = None
         self._caption_drag_window_pos = None
+        self._layout_dirty = 0
+        self._layout_flush_pending = False
+        self._update_depth = 0
+        self._paint_resources_key = None
+        self._paint_resources = None
+        self._command_stack = None
+        self._central_widget = None
+        self._mdi_area = None
+        self._mdi_area_resolved = False
+        self._central_widget_watcher = _RibbonCentralWidgetWatcher(self)
+        self._update_start_page = None
+        self._update_current_page = None
+        self._deferred_pages = {}
         self._collapse_button = _RibbonCollapseButton(self)
         self._collapse_button.clicked.connect(
             lambda: self.setRibbonMinimized(not self._ribbon_minimized)
@@ -280,9 +347,7 @@ class LqRibbonBar(QTabWidget):
         self.tabBar().setExpanding(False)
         self.tabBar().setUsesScrollButtons(True)
         self.tabBar().setObjectName("lqRibbonTabBar")
-        app = QApplication.instance()
-        if app:
-            app.installEventFilter(self)
+        self._update_event_filter_scope()
 
         # Set height for ribbon area
         self.setFixedHeight(self._expanded_height())
@@ -290,7 +355,7 @@ class LqRibbonBar(QTabWidget):
         if stack:
             stack.setObjectName("lqRibbonCommandArea")
             self._configure_command_area_stack(stack)
-        self.setStyleSheet(self._style_sheet())
+        self._apply_theme()
         self._search_bar.setObjectName("lqRibbonSearchEdit")
         self._quick_access_bar.hide()
         self._title_button_bar.setObjectName("lqRibbonTitleButtonBar")
@@ -315,16 +380,16 @@ class LqRibbonBar(QTabWidget):
         """Paint the themed title and tab background."""
         super().paintEvent(event)
 
-        palette = LqStyle.palette(self._ribbon_style)
+        resources = self._frame_paint_resources()
         painter = QPainter(self)
         if self._is_macos_layout():
-            title_bg, line_color, title_text = self._mac_title_colors()
+            title_bg, line_color, title_text = resources["mac_title_colors"]
             painter.fillRect(
                 0,
                 0,
                 self.width(),
                 self.height(),
-                QColor(palette["ribbon_bg"]),
+                resources["ribbon_bg"],
             )
             painter.fillRect(0, 0, self.width(), RIBBON_MAC_TITLE_HEIGHT, title_bg)
             painter.fillRect(
@@ -369,13 +434,13 @@ class LqRibbonBar(QTabWidget):
             0,
             self.width(),
             self._collapsed_height(),
-            QColor(palette["caption_bg"]),
+            resources["caption_bg"],
         )
         stack = self._command_area_stack()
         if stack and stack.isVisible():
             command_rect = stack.geometry()
-            outer_color = self._command_frame_outer_color()
-            corner_radius = self._command_frame_corner_radius()
+            outer_color = resources["outer_color"]
+            corner_radius = resources["corner_radius"]
             corner_height = min(
                 command_rect.height(),
                 corner_radius + RIBBON_COMMAND_FRAME_LINE_WIDTH,
@@ -411,7 +476,7 @@ class LqRibbonBar(QTabWidget):
             title_right = max(0, self.width() - (RIBBON_WINDOW_BUTTON_WIDTH * 3) - 12)
             title_width = max(0, title_right - title_left)
             if title_width:
-                painter.setPen(QColor(palette["status_text"]))
+                painter.setPen(resources["status_text"])
                 painter.drawText(
                     title_left,
                     0,
@@ -425,12 +490,57 @@ class LqRibbonBar(QTabWidget):
                     ),
                 )
 
+    def _frame_paint_resources(self):
+        # The outer colour is not part of the key: palette and style changes,
+        # the central widget watcher and the command area stack set-up drop
+        # the cache when it may have changed.
+        window = self.window()
+        key = (
+            self._ribbon_style,
+            self._platform_layout,
+            self.width(),
+            self.height(),
+            bool(window and window.isMaximized()),
+        )
+        if key == self._paint_resources_key:
+            return self._paint_resources
+        palette = LqStyle.palette(self._ribbon_style)
+        outer_color = self._command_frame_outer_color()
+        self._paint_resources_key = key
+        self._paint_resources = {
+            "ribbon_bg": QColor(palette["ribbon_bg"]),
+            "caption_bg": QColor(palette["caption_bg"]),
+            "status_text": QColor(palette["status_text"]),
+            "mac_title_colors": self._mac_title_colors(),
+            "outer_color": outer_color,
+            "corner_radius": self._command_frame_corner_radius(),
+        }
+        return self._paint_resources
+
+    def _invalidate_paint_resources(self):
+        self._paint_resources_key = None
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self._update_layout()
+        if self._update_depth:
+            self._layout_dirty |= RIBBON_LAYOUT_CHROME
+            return
+        self._update_layout(RIBBON_LAYOUT_CHROME)
 
     def event(self, event):
         handled = super().event(event)
+        if event.type() in (
+            QEvent.Type.PaletteChange,
+            QEvent.Type.ApplicationPaletteChange,
+            QEvent.Type.StyleChange,
+        ):
+            self._invalidate_paint_resources()
+        if self._palette_theming and event.type() in (
+            QEvent.Type.Polish,
+            QEvent.Type.Show,
+        ):
+            # Style sheet polish pins child palettes; hand the theme back down.
+            LqStyle.propagate_palette(self, LqStyle.qpalette(self._ribbon_style))
         if event.type() in (
             QEvent.Type.LayoutRequest,
             QEvent.Type.PolishRequest,
@@ -438,10 +548,17 @@ class LqRibbonBar(QTabWidget):
             QEvent.Type.FontChange,
             QEvent.Type.StyleChange,
         ):
-            self._update_layout()
+            if self._update_depth:
+                self._layout_dirty |= RIBBON_LAYOUT_CHROME
+                return handled
+            # QTabWidget has just re-placed its tab bar and stack; put those
+            # back now and leave the rest of the chrome to the coalesced flush.
+            self._update_layout(RIBBON_LAYOUT_GEOMETRY)
+            self._invalidate_layout(RIBBON_LAYOUT_CHROME)
         return handled
 
     def eventFilter(self, obj, event):
+        self._filtered_event_count += 1
         if obj == self.tabBar() and event.type() == QEvent.Type.MouseButtonDblClick:
             tab_index = self.tabBar().tabAt(event.pos())
             if event.button() == Qt.MouseButton.LeftButton and tab_index >= 0:
@@ -475,9 +592,80 @@ class LqRibbonBar(QTabWidget):
                 self._hide_temporary_ribbon()
         return super().eventFilter(obj, event)
 
+    def _update_event_filter_scope(self):
+        # Idle ribbons only need tab bar clicks; the application-wide watch
+        # that dismisses a temporary expansion replaces it while expanded so
+        # tab bar events are never filtered twice.
+        app = QApplication.instance()
+        watch_application = app is not None and (
+            not self._scoped_event_filter or self._ribbon_temporary_expanded
+        )
+        if watch_application != self._application_event_filter_installed:
+            if watch_application:
+                app.installEventFilter(self)
+            else:
+                app.removeEventFilter(self)
+            self._application_event_filter_installed = watch_application
+        if watch_application:
+            self.tabBar().removeEventFilter(self)
+        else:
+            self.tabBar().installEventFilter(self)
+
+    def isScopedEventFilterEnabled(self):
+        return self._scoped_event_filter
+
+    def setScopedEventFilterEnabled(self, enabled):
+        self._scoped_event_filter = bool(enabled)
+        self._update_event_filter_scope()
+
+    def isApplicationEventFilterActive(self):
+        return self._application_event_filter_installed
+
+    def filteredEventCount(self):
+        return self._filtered_event_count
+
+    def resetFilteredEventCount(self):
+        self._filtered_event_count = 0
+
     def _style_sheet(self):
+        if self._palette_theming:
+            return LqStyle.get_static_ribbon_style(self._platform_layout)
         return LqStyle.get_ribbon_style(self._ribbon_style, self._platform_layout)
 
+    def _apply_theme(self):
+        LqStyle.apply_style_sheet(self, self._style_sheet())
+        tab_bar_style = search_style = ""
+        if self._palette_theming:
+            LqStyle.propagate_palette(self, LqStyle.qpalette(self._ribbon_style))
+            tab_bar_style = LqStyle.get_chrome_style(
+                "tab_bar", self._ribbon_style, self._platform_layout
+            )
+            search_style = LqStyle.get_chrome_style(
+                "search", self._ribbon_style, self._platform_layout
+            )
+        # Only these two small widgets are re-polished on a theme switch.
+        LqStyle.apply_style_sheet(self.tabBar(), tab_bar_style)
+        LqStyle.apply_style_sheet(self._search_bar, search_style)
+
+    def isPaletteThemingEnabled(self):
+        return self._palette_theming
+
+    def setPaletteThemingEnabled(self, enabled):
+        """Theme through QPalette and a static style sheet instead of per-style QSS."""
+        enabled = bool(enabled)
+        if self._palette_theming == enabled:
+            return
+        self._palette_theming = enabled
+        if not enabled:
+            self.setPalette(QPalette())
+        self.setAutoFillBackground(enabled)
+        self._apply_theme()
+        for page in self.pages:
+            if hasattr(page, "_update_surface_palette"):
+                page._update_surface_palette()
+        self._update_layout(RIBBON_LAYOUT_CHROME)
+        self.update()
+
     def _is_macos_layout(self):
         return self._platform_layout == RibbonPlatformLayout.MacOS
 
@@ -517,7 +705,8 @@ class LqRibbonBar(QTabWidget):
         if self._platform_layout == layout:
             return
         self._platform_layout = layout
-        self.setStyleSheet(self._style_sheet())
+        self._apply_theme()
+        self._update_layout(RIBBON_LAYOUT_METRICS)
         self._apply_ribbon_height()
         self.update()
 
@@ -536,20 +725,45 @@ class LqRibbonBar(QTabWidget):
     def _simplified_height(self):
         return RIBBON_MAC_SIMPLIFIED_HEIGHT if self._is_macos_layout() else RIBBON_SIMPLIFIED_HEIGHT
 
+    def _group_layout_metrics(self):
+        if self._is_macos_layout():
+            return RIBBON_MAC_GROUP_HEIGHT, (4, 3, 5, 2), 16
+        return RIBBON_GROUP_HEIGHT, (4, 5, 5, 5), 17
+
+    def _apply_group_metrics(self, group, metrics=None):
+        group_height, content_margins, title_height = metrics or self._group_layout_metrics()
+        group.setMinimumHeight(group_height)
+        if hasattr(group, "main_layout"):
+            group.main_layout.setContentsMargins(*content_margins)
+        if hasattr(group, "title_label"):
+            group.title_label.setFixedHeight(title_height)
+
+    def _apply_page_group_metrics(self, page, metrics=None):
+        if hasattr(page, "setSimplifiedMode") and page.simplifiedMode() != self._simplified_mode:
+            page.setSimplifiedMode(self._simplified_mode)
+        metrics = metrics or self._group_layout_metrics()
+        for group in getattr(page, "groups", []):
+            self._apply_group_metrics(group, metrics)
+
     def _apply_group_layout_metrics(self):
-        mac_layout = self._is_macos_layout()
-        group_height = RIBBON_MAC_GROUP_HEIGHT if mac_layout else RIBBON_GROUP_HEIGHT
-        content_margins = (4, 3, 5, 2) if mac_layout else (4, 5, 5, 5)
-        title_height = 16 if mac_layout else 17
+        metrics = self._group_layout_metrics()
         for page in self.pages:
-            for group in getattr(page, "groups", []):
-                group.setMinimumHeight(group_height)
-                if hasattr(group, "main_layout"):
-                    group.main_layout.setContentsMargins(*content_margins)
-                if hasattr(group, "title_label"):
-                    group.title_label.setFixedHeight(title_height)
+            self._apply_page_group_metrics(page, metrics)
+
+    def childEvent(self, event):
+        super().childEvent(event)
+        if event.type() in (QEvent.Type.ChildAdded, QEvent.Type.ChildRemoved):
+            self._command_stack = None
 
     def _command_area_stack(self):
+        stack = self._command_stack
+        if stack is not None and _qt_object_is_valid(stack):
+            return stack
+        stack = self._find_command_area_stack()
+        self._command_stack = stack
+        return stack
+
+    def _find_command_area_stack(self):
         stack = self.findChild(
             QStackedWidget,
             "lqRibbonCommandArea",
@@ -563,18 +777,63 @@ class LqRibbonBar(QTabWidget):
         )
         return stacks[0] if stacks else None
 
+    def _window_central_widget(self):
+        central_widget_getter = getattr(self.window(), "centralWidget", None)
+        central_widget = central_widget_getter() if callable(central_widget_getter) else None
+        if central_widget is not self._central_widget:
+            previous = self._central_widget
+            if previous is not None and _qt_object_is_valid(previous):
+                for widget in [previous, *previous.findChildren(QWidget)]:
+                    widget.removeEventFilter(self._central_widget_watcher)
+            if central_widget is not None and central_widget.parentWidget() is not None:
+                # Replacing the central widget adds and removes a child here.
+                central_widget.parentWidget().installEventFilter(self._central_widget_watcher)
+            self._central_widget = central_widget
+            self._invalidate_mdi_area()
+        return central_widget
+
+    def _invalidate_mdi_area(self):
+        self._mdi_area = None
+        self._mdi_area_resolved = False
+        self._invalidate_paint_resources()
+
+    def _window_mdi_area(self, central_widget):
+        # The result, found or not, is kept until the watcher sees a widget
+        # added or removed below the central widget.
+        mdi_area = self._mdi_area
+        if self._mdi_area_resolved and (mdi_area is None or _qt_object_is_valid(mdi_area)):
+            return mdi_area
+        mdi_area = self._watch_central_widget(central_widget)
+        self._mdi_area = mdi_area
+        self._mdi_area_resolved = True
+        return mdi_area
+
+    def _watch_central_widget(self, central_widget):
+        """Watch the widgets below the central widget and return its first MDI area."""
+        if isinstance(central_widget, QMdiArea):
+            central_widget.installEventFilter(self._central_widget_watcher)
+            return central_widget
+        mdi_area = None
+        pending = [central_widget]
+        while pending:
+            widget = pending.pop()
+            widget.installEventFilter(self._central_widget_watcher)
+            for child in widget.children():
+                if child is self or not child.isWidgetType():
+                    continue
+                if isinstance(child, QMdiArea):
+                    # Its sub-windows cannot change which area is found.
+                    child.installEventFilter(self._central_widget_watcher)
+                    mdi_area = mdi_area or child
+                else:
+                    pending.append(child)
+        return mdi_area
+
     def _command_frame_outer_color(self):
         window = self.window()
-        central_widget = None
-        central_widget_getter = getattr(window, "centralWidget", None)
-        if callable(central_widget_getter):
-            central_widget = central_widget_getter()
+        central_widget = self._window_central_widget()
         if central_widget:
-            mdi_area = (
-                central_widget
-                if isinstance(central_widget, QMdiArea)
-                else central_widget.findChild(QMdiArea)
-            )
+            mdi_area = self._window_mdi_area(central_widget)
             if mdi_area:
                 mdi_color = mdi_area.background().color()
                 if mdi_color.isValid():
@@ -617,12 +876,12 @@ class LqRibbonBar(QTabWidget):
     def _configure_command_area_stack(self, stack):
         stack.setObjectName("lqRibbonCommandArea")
         stack.setAutoFillBackground(True)
-        stack_palette = stack.palette()
-        stack_palette.setColor(
-            QPalette.ColorRole.Window,
-            self._command_frame_outer_color(),
-        )
-        stack.setPalette(stack_palette)
+        outer_color = self._command_frame_outer_color()
+        if stack.palette().color(QPalette.ColorRole.Window) != outer_color:
+            stack_palette = stack.palette()
+            stack_palette.setColor(QPalette.ColorRole.Window, outer_color)
+            stack.setPalette(stack_palette)
+            self._invalidate_paint_resources()
         stack.setContentsMargins(
             0,
             0,
@@ -638,18 +897,53 @@ class LqRibbonBar(QTabWidget):
                 RIBBON_COMMAND_FRAME_LINE_WIDTH,
             )
 
-    def _update_layout(self):
-        self._apply_group_layout_metrics()
-        if self._is_macos_layout():
-            self._update_macos_layout()
+    def _invalidate_layout(self, flags=RIBBON_LAYOUT_ALL):
+        """Mark layout parts dirty and flush them once on the next event loop turn."""
+        self._layout_dirty |= flags
+        if self._layout_flush_pending:
             return
-        tab_bar = self.tabBar()
-        tab_bar.setGeometry(0, self._caption_height(), self.width(), self._tab_height())
-        tab_bar.raise_()
-        self._quick_access_bar.actionCustomizeButton().setVisible(True)
-        command_area_visible = self._is_command_area_visible()
+        self._layout_flush_pending = True
+        QTimer.singleShot(0, self, self._flush_pending_layout)
+
+    def _flush_pending_layout(self):
+        self._layout_flush_pending = False
+        if not self._update_depth:
+            self._flush_layout()
+
+    def _flush_layout(self, flags=None):
+        if flags is None:
+            flags = self._layout_dirty
+        self._layout_dirty &= ~flags
+        if not flags:
+            return
+        if flags & RIBBON_LAYOUT_METRICS:
+            self._apply_group_layout_metrics()
+        if flags & RIBBON_LAYOUT_CHROME:
+            if self._is_macos_layout():
+                self._update_macos_layout(flags)
+            else:
+                self._update_classic_layout(flags)
 
-        stack = self._command_area_stack()
+    def _update_layout(self, flags=RIBBON_LAYOUT_ALL):
+        self._flush_layout(flags)
+
+    def _raise_chrome_widget(self, widget):
+        """Raise widget only if a shown sibling above it overlaps it."""
+        parent = widget.parentWidget()
+        if parent is None:
+            return
+        siblings = parent.children()
+        geometry = widget.geometry()
+        if any(
+            sibling.isWidgetType()
+            and not sibling.isHidden()
+            and sibling.geometry().intersects(geometry)
+            for sibling in siblings[siblings.index(widget) + 1:]
+        ):
+            widget.raise_()
+
+    def _update_classic_layout(self, flags=RIBBON_LAYOUT_CHROME):
+        command_area_visible = self._is_command_area_visible()
         quick_access_below = (
             command_area_visible
             and self._quick_access_position == 2
@@ -659,107 +953,112 @@ class LqRibbonBar(QTabWidget):
             RIBBON_QUICK_ACCESS_BELOW_HEIGHT if quick_access_below else 0
         )
 
-        if stack:
-            self._configure_command_area_stack(stack)
-            stack_top = self._collapsed_height()
-            stack_height = (
-                max(0, self.height() - stack_top - quick_access_reserve)
-                if command_area_visible
-                else 0
-            )
-            frame_x = self._command_frame_inset()
-            frame_width = max(0, self.width() - (frame_x * 2))
-            stack.setGeometry(
-                frame_x,
-                stack_top,
-                frame_width,
-                stack_height,
+        if flags & RIBBON_LAYOUT_GEOMETRY:
+            tab_bar = self.tabBar()
+            tab_bar.setGeometry(0, self._caption_height(), self.width(), self._tab_height())
+            self._raise_chrome_widget(tab_bar)
+            stack = self._command_area_stack()
+            if stack:
+                self._configure_command_area_stack(stack)
+                stack_top = self._collapsed_height()
+                stack_height = (
+                    max(0, self.height() - stack_top - quick_access_reserve)
+                    if command_area_visible
+                    else 0
+                )
+                frame_x = self._command_frame_inset()
+                frame_width = max(0, self.width() - (frame_x * 2))
+                stack.setGeometry(
+                    frame_x,
+                    stack_top,
+                    frame_width,
+                    stack_height,
+                )
+                stack.setVisible(command_area_visible)
+
+        if flags & RIBBON_LAYOUT_SEARCH:
+            compact_search = self._search_bar_appearance == 2
+            search_width = 36 if compact_search else min(524, max(120, self.width() - 220))
+            self._search_bar.setGeometry(
+                max(0, (self.width() - search_width) // 2),
+                7,
+                search_width,
+                22,
             )
-            stack.setVisible(command_area_visible)
-
-        compact_search = self._search_bar_appearance == 2
-        search_width = 36 if compact_search else min(524, max(120, self.width() - 220))
-        self._search_bar.setGeometry(
-            max(0, (self.width() - search_width) // 2),
-            7,
-            search_width,
-            22,
-        )
-        self._search_bar.raise_()
+            self._raise_chrome_widget(self._search_bar)
 
-        window_control_reserve = (
-            RIBBON_WINDOW_BUTTON_WIDTH * 3 if self._frame_theme_enabled else 0
-        )
-        title_bar_width = min(
-            self._title_button_bar.sizeHint().width(),
-            max(
-                0,
-                self.width()
-                - self._search_bar.geometry().right()
-                - window_control_reserve
-                - 12,
-            ),
-        )
-        if self._title_button_bar.actions() and title_bar_width > 0:
-            title_bar_x = max(
-                self._search_bar.geometry().right() + 8,
-                self.width() - title_bar_width - window_control_reserve - 8,
+            window_control_reserve = (
+                RIBBON_WINDOW_BUTTON_WIDTH * 3 if self._frame_theme_enabled else 0
             )
-            self._title_button_bar.setGeometry(title_bar_x, 6, title_bar_width, 24)
-            self._title_button_bar.show()
-            self._title_button_bar.raise_()
-        else:
-            self._title_button_bar.hide()
-
-        if not self._quick_access_bar.isHidden() and not quick_access_below:
-            quick_height = 24
-            if quick_access_below:
-                quick_x = 8
-                quick_y = max(
+            title_bar_width = min(
+                self._title_button_bar.sizeHint().width(),
+                max(
                     0,
-                    self.height()
-                    - RIBBON_QUICK_ACCESS_BELOW_HEIGHT
-                    + ((RIBBON_QUICK_ACCESS_BELOW_HEIGHT - quick_height) // 2),
-                )
-                quick_width = min(
-                    self._quick_access_bar.sizeHint().width(),
-                    max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 20),
+                    self.width()
+                    - self._search_bar.geometry().right()
+                    - window_control_reserve
+                    - 12,
+                ),
+            )
+            if self._title_button_bar.actions() and title_bar_width > 0:
+                title_bar_x = max(
+                    self._search_bar.geometry().right() + 8,
+                    self.width() - title_bar_width - window_control_reserve - 8,
                 )
+                self._title_button_bar.setGeometry(title_bar_x, 6, title_bar_width, 24)
+                self._title_button_bar.show()
+                self._raise_chrome_widget(self._title_button_bar)
             else:
-                quick_x = 0
-                quick_y = 6
-                quick_width = min(
-                    self._quick_access_bar.sizeHint().width(),
-                    max(0, self.width() - 48),
+                self._title_button_bar.hide()
+
+        if flags & RIBBON_LAYOUT_QUICK_ACCESS:
+            self._quick_access_bar.actionCustomizeButton().setVisible(True)
+            if not self._quick_access_bar.isHidden() and not quick_access_below:
+                quick_height = 24
+                if quick_access_below:
+                    quick_x = 8
+                    quick_y = max(
+                        0,
+                        self.height()
+                        - RIBBON_QUICK_ACCESS_BELOW_HEIGHT
+                        + ((RIBBON_QUICK_ACCESS_BELOW_HEIGHT - quick_height) // 2),
+                    )
+                    quick_width = min(
+                        self._quick_access_bar.sizeHint().width(),
+                        max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 20),
+                    )
+                else:
+                    quick_x = 0
+                    quick_y = 6
+                    quick_width = min(
+                        self._quick_access_bar.sizeHint().width(),
+                        max(0, self.width() - 48),
+                    )
+                self._quick_access_bar.setGeometry(
+                    quick_x,
+                    quick_y,
+                    quick_width,
+                    quick_height,
                 )
-            self._quick_access_bar.setGeometry(
-                quick_x,
-                quick_y,
-                quick_width,
-                quick_height,
+                self._raise_chrome_widget(self._quick_access_bar)
+
+        if flags & RIBBON_LAYOUT_GEOMETRY:
+            collapse_x = max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH)
+            collapse_y = max(0, self.height() - RIBBON_COLLAPSE_BUTTON_HEIGHT - 2)
+            self._collapse_button.setGeometry(
+                collapse_x,
+                collapse_y,
+                RIBBON_COLLAPSE_BUTTON_WIDTH,
+                RIBBON_COLLAPSE_BUTTON_HEIGHT,
             )
-            self._quick_access_bar.raise_()
-
-        collapse_x = max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH)
-        collapse_y = max(0, self.height() - RIBBON_COLLAPSE_BUTTON_HEIGHT - 2)
-        self._collapse_button.setGeometry(
-            collapse_x,
-            collapse_y,
-            RIBBON_COLLAPSE_BUTTON_WIDTH,
-            RIBBON_COLLAPSE_BUTTON_HEIGHT,
-        )
-        self._collapse_button.setCollapsed(self._ribbon_minimized)
-        self._collapse_button.setVisible(self._frame_theme_enabled and not self._ribbon_minimized)
-        self._collapse_button.raise_()
-        self._update_window_controls()
+            self._collapse_button.setCollapsed(self._ribbon_minimized)
+            self._collapse_button.setVisible(self._frame_theme_enabled and not self._ribbon_minimized)
+            self._raise_chrome_widget(self._collapse_button)
+        if flags & RIBBON_LAYOUT_WINDOW_CONTROLS:
+            self._update_window_controls()
 
-    def _update_macos_layout(self):
-        tab_bar = self.tabBar()
-        tab_bar.setGeometry(6, RIBBON_MAC_TITLE_HEIGHT, max(0, self.width() - 12), RIBBON_MAC_TAB_HEIGHT)
-        tab_bar.raise_()
+    def _update_macos_layout(self, flags=RIBBON_LAYOUT_CHROME):
         command_area_visible = self._is_command_area_visible()
-
-        stack = self._command_area_stack()
         quick_access_below = (
             command_area_visible
             and self._quick_access_position == 2
@@ -768,72 +1067,83 @@ class LqRibbonBar(QTabWidget):
         quick_access_reserve = (
             RIBBON_QUICK_ACCESS_BELOW_HEIGHT if quick_access_below else 0
         )
-        if stack:
-            self._configure_command_area_stack(stack)
-            stack_top = self._collapsed_height()
-            stack_height = (
-                max(0, self.height() - stack_top - quick_access_reserve)
-                if command_area_visible
-                else 0
-            )
-            stack.setGeometry(0, stack_top, self.width(), stack_height)
-            stack.setVisible(command_area_visible)
+        if flags & RIBBON_LAYOUT_GEOMETRY:
+            tab_bar = self.tabBar()
+            tab_bar.setGeometry(6, RIBBON_MAC_TITLE_HEIGHT, max(0, self.width() - 12), RIBBON_MAC_TAB_HEIGHT)
+            self._raise_chrome_widget(tab_bar)
+            stack = self._command_area_stack()
+            if stack:
+                self._configure_command_area_stack(stack)
+                stack_top = self._collapsed_height()
+                stack_height = (
+                    max(0, self.height() - stack_top - quick_access_reserve)
+                    if command_area_visible
+                    else 0
+                )
+                stack.setGeometry(0, stack_top, self.width(), stack_height)
+                stack.setVisible(command_area_visible)
 
         compact_search = self._search_bar_appearance == 2
         search_width = 34 if compact_search else min(300, max(170, self.width() // 4))
         search_x = max(120, self.width() - search_width - 18)
-        self._search_bar.setGeometry(search_x, 7, search_width, 24)
-        self._search_bar.raise_()
-
-        title_left = 84
-        if not self._quick_access_bar.isHidden():
-            self._quick_access_bar.actionCustomizeButton().setVisible(False)
-            quick_width = min(
-                self._quick_access_bar.sizeHint().width(),
-                max(0, search_x - title_left - 20),
+        if flags & RIBBON_LAYOUT_SEARCH:
+            self._search_bar.setGeometry(search_x, 7, search_width, 24)
+            self._raise_chrome_widget(self._search_bar)
+
+        # The caption row is shared: title buttons start after the quick
+        # access bar, so either part being dirty re-places both.
+        if flags & (RIBBON_LAYOUT_SEARCH | RIBBON_LAYOUT_QUICK_ACCESS):
+            title_left = 84
+            if not self._quick_access_bar.isHidden():
+                self._quick_access_bar.actionCustomizeButton().setVisible(False)
+                quick_width = min(
+                    self._quick_access_bar.sizeHint().width(),
+                    max(0, search_x - title_left - 20),
+                )
+                self._quick_access_bar.setGeometry(title_left, 7, quick_width, 24)
+                self._raise_chrome_widget(self._quick_access_bar)
+                title_left = self._quick_access_bar.geometry().right() + 8
+
+            title_right = max(title_left, search_x - 14)
+            title_bar_width = min(
+                self._title_button_bar.sizeHint().width(),
+                max(0, title_right - title_left),
             )
-            self._quick_access_bar.setGeometry(title_left, 7, quick_width, 24)
-            self._quick_access_bar.raise_()
-            title_left = self._quick_access_bar.geometry().right() + 8
-
-        title_right = max(title_left, search_x - 14)
-        title_bar_width = min(
-            self._title_button_bar.sizeHint().width(),
-            max(0, title_right - title_left),
-        )
-        if self._title_button_bar.actions() and title_bar_width > 0:
-            self._title_button_bar.setGeometry(title_left, 7, title_bar_width, 24)
-            self._title_button_bar.show()
-            self._title_button_bar.raise_()
-        else:
-            self._title_button_bar.hide()
+            if self._title_button_bar.actions() and title_bar_width > 0:
+                self._title_button_bar.setGeometry(title_left, 7, title_bar_width, 24)
+                self._title_button_bar.show()
+                self._raise_chrome_widget(self._title_button_bar)
+            else:
+                self._title_button_bar.hide()
 
-        if not self._quick_access_bar.isHidden() and quick_access_below:
-            quick_height = 24
-            quick_x = 8
-            quick_y = max(
-                0,
-                self.height()
-                - RIBBON_QUICK_ACCESS_BELOW_HEIGHT
-                + ((RIBBON_QUICK_ACCESS_BELOW_HEIGHT - quick_height) // 2),
-            )
-            quick_width = min(
-                self._quick_access_bar.sizeHint().width(),
-                max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 20),
+            if not self._quick_access_bar.isHidden() and quick_access_below:
+                quick_height = 24
+                quick_x = 8
+                quick_y = max(
+                    0,
+                    self.height()
+                    - RIBBON_QUICK_ACCESS_BELOW_HEIGHT
+                    + ((RIBBON_QUICK_ACCESS_BELOW_HEIGHT - quick_height) // 2),
+                )
+                quick_width = min(
+                    self._quick_access_bar.sizeHint().width(),
+                    max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 20),
+                )
+                self._quick_access_bar.setGeometry(quick_x, quick_y, quick_width, quick_height)
+                self._raise_chrome_widget(self._quick_access_bar)
+
+        if flags & RIBBON_LAYOUT_GEOMETRY:
+            self._collapse_button.setGeometry(
+                max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 4),
+                self._collapsed_height() + 2,
+                RIBBON_COLLAPSE_BUTTON_WIDTH,
+                RIBBON_COLLAPSE_BUTTON_HEIGHT,
             )
-            self._quick_access_bar.setGeometry(quick_x, quick_y, quick_width, quick_height)
-            self._quick_access_bar.raise_()
-
-        self._collapse_button.setGeometry(
-            max(0, self.width() - RIBBON_COLLAPSE_BUTTON_WIDTH - 4),
-            self._collapsed_height() + 2,
-            RIBBON_COLLAPSE_BUTTON_WIDTH,
-            RIBBON_COLLAPSE_BUTTON_HEIGHT,
-        )
-        self._collapse_button.setCollapsed(self._ribbon_minimized)
-        self._collapse_button.setVisible(self._frame_theme_enabled and not self._ribbon_minimized)
-        self._collapse_button.raise_()
-        self._update_window_controls()
+            self._collapse_button.setCollapsed(self._ribbon_minimized)
+            self._collapse_button.setVisible(self._frame_theme_enabled and not self._ribbon_minimized)
+            self._raise_chrome_widget(self._collapse_button)
+        if flags & RIBBON_LAYOUT_WINDOW_CONTROLS:
+            self._update_window_controls()
 
     def _update_window_controls(self):
         buttons = [self._minimize_button, self._maximize_button, self._close_button]
@@ -848,7 +1158,7 @@ class LqRibbonBar(QTabWidget):
                 button.setFixedSize(RIBBON_MAC_WINDOW_BUTTON_SIZE, RIBBON_MAC_WINDOW_BUTTON_SIZE)
                 button.setGeometry(x, y, RIBBON_MAC_WINDOW_BUTTON_SIZE, RIBBON_MAC_WINDOW_BUTTON_SIZE)
                 button.setVisible(self._frame_theme_enabled)
-                button.raise_()
+                self._raise_chrome_widget(button)
                 x += cell
             self._maximize_button.update()
             return
@@ -859,7 +1169,7 @@ class LqRibbonBar(QTabWidget):
             button.setFixedSize(RIBBON_WINDOW_BUTTON_WIDTH, RIBBON_WINDOW_BUTTON_HEIGHT)
             button.setGeometry(x, 0, RIBBON_WINDOW_BUTTON_WIDTH, RIBBON_WINDOW_BUTTON_HEIGHT)
             button.setVisible(self._frame_theme_enabled)
-            button.raise_()
+            self._raise_chrome_widget(button)
             x += RIBBON_WINDOW_BUTTON_WIDTH
         self._maximize_button.update()
 
@@ -940,8 +1250,11 @@ class LqRibbonBar(QTabWidget):
             and not self._quick_access_bar.isHidden()
         ):
             height += RIBBON_QUICK_ACCESS_BELOW_HEIGHT
+        resized = self.isVisible() and self.height() != height
         self.setFixedHeight(height)
-        self._update_layout()
+        if not resized:
+            # A visible resize has already re-laid the chrome in resizeEvent.
+            self._update_layout(RIBBON_LAYOUT_CHROME)
 
     def _show_temporary_ribbon(self):
         if (
@@ -951,6 +1264,7 @@ class LqRibbonBar(QTabWidget):
         ):
             return
         self._ribbon_temporary_expanded = True
+        self._update_event_filter_scope()
         self._apply_ribbon_height()
         self.ribbon_temporary_expanded_changed.emit(True)
         self.ribbonTemporaryExpandedChanged.emit(True)
@@ -959,6 +1273,7 @@ class LqRibbonBar(QTabWidget):
         if not self._ribbon_temporary_expanded:
             return
         self._ribbon_temporary_expanded = False
+        self._update_event_filter_scope()
         self._apply_ribbon_height()
         self.ribbon_temporary_expanded_changed.emit(False)
         self.ribbonTemporaryExpandedChanged.emit(False)
@@ -1011,12 +1326,38 @@ class LqRibbonBar(QTabWidget):
         """Qtitan/C++ compatible page add overload."""
         if isinstance(page_or_title, str):
             return self.add_page(page_or_title)
-        page = page_or_title
+        return self._append_page(page_or_title, True)
+
+    def addLazyPage(self, title, factory, search_terms=None):
+        """Add a page whose groups are built by factory(page) on first use.
+
+        The tab appears immediately; the factory runs the first time the page
+        becomes current, or when searchAction() finds no built match and one
+        of ``search_terms`` (strings, or a callable returning them) matches
+        the query. Without ``search_terms`` the page title is the only term,
+        so its commands are not found by their own text until it is built.
+        """
+        from .lq_ribbon_page import LqRibbonPage
+
+        page = LqRibbonPage(title, self, factory, search_terms)
+        return self._append_page(page, False)
+
+    def _append_page(self, page, make_current):
+        if self._update_depth:
+            if page not in self.pages:
+                self.pages.append(page)
+                self._deferred_pages[page] = None
+            if make_current:
+                self._update_current_page = page
+            return page
         if page not in self.pages:
             self.pages.append(page)
             self.addTab(page, str(page.title))
-        self.setCurrentWidget(page)
-        self._update_layout()
+            self._apply_page_group_metrics(page)
+        if make_current:
+            self.setCurrentWidget(page)
+        self._update_layout(RIBBON_LAYOUT_GEOMETRY)
+        self._invalidate_layout(RIBBON_LAYOUT_CHROME)
         return page
 
     def insertPage(self, index, page_or_title):
@@ -1024,15 +1365,20 @@ class LqRibbonBar(QTabWidget):
 
         page = LqRibbonPage(page_or_title, self) if isinstance(page_or_title, str) else page_or_title
         if page in self.pages:
-            old_index = self.pages.index(page)
             self.pages.remove(page)
-            self.removeTab(old_index)
+            self._remove_page_tab(page)
         if index < 0 or index > len(self.pages):
             index = len(self.pages)
         self.pages.insert(index, page)
+        if self._update_depth:
+            self._deferred_pages[page] = None
+            self._update_current_page = page
+            return page
         self.insertTab(index, page, str(page.title))
+        self._apply_page_group_metrics(page)
         self.setCurrentIndex(index)
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_GEOMETRY)
+        self._invalidate_layout(RIBBON_LAYOUT_CHROME)
         return page
 
     def movePage(self, page_or_index, new_index):
@@ -1040,13 +1386,19 @@ class LqRibbonBar(QTabWidget):
         if not (0 <= old_index < len(self.pages)):
             return
         page = self.pages.pop(old_index)
-        self.removeTab(old_index)
         if new_index < 0 or new_index > len(self.pages):
             new_index = len(self.pages)
         self.pages.insert(new_index, page)
+        if self._update_depth:
+            # The tab is reinserted at its new position by endUpdate().
+            self._remove_page_tab(page)
+            self._deferred_pages[page] = None
+            self._update_current_page = page
+            return
+        self.removeTab(old_index)
         self.insertTab(new_index, page, str(page.title))
         self.setCurrentIndex(new_index)
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_GEOMETRY)
 
     def get_page(self, index):
         """Get a page by index
@@ -1068,7 +1420,7 @@ class LqRibbonBar(QTabWidget):
         return len(self.pages)
 
     def currentPageIndex(self):
-        return self.currentIndex()
+        return self.pageIndex(self.currentWidget())
 
     def get_page_by_title(self, title):
         """Get a page by its title
@@ -1090,8 +1442,8 @@ class LqRibbonBar(QTabWidget):
         Returns:
             LqRibbonPage: The current page
         """
-        index = self.currentIndex()
-        return self.get_page(index)
+        page = self.currentWidget()
+        return page if page in self.pages else None
 
     def currentPage(self):
         return self.get_current_page()
@@ -1105,6 +1457,9 @@ class LqRibbonBar(QTabWidget):
         Args:
             index: Index of the new current page
         """
+        page = self.widget(index)
+        if page is not None and hasattr(page, "materialize"):
+            page.materialize()
         self.page_changed.emit(index)
         self.pageChanged.emit(index)
         self.current_page_index_changed.emit(index)
@@ -1119,7 +1474,15 @@ class LqRibbonBar(QTabWidget):
             index: Index of the page
             enabled: True to enable, False to disable
         """
-        self.setTabEnabled(index, enabled)
+        page = self.get_page(index)
+        if page is None:
+            return
+        tab_index = self.indexOf(page)
+        if tab_index >= 0:
+            self.setTabEnabled(tab_index, enabled)
+        else:
+            # Deferred tabs pick this up when endUpdate() inserts them.
+            page.setEnabled(enabled)
 
     def remove_page(self, index):
         """Remove a page
@@ -1128,10 +1491,25 @@ class LqRibbonBar(QTabWidget):
             index: Index of the page to remove
         """
         if 0 <= index < len(self.pages):
-            self.removeTab(index)
             page = self.pages.pop(index)
+            self._remove_page_tab(page)
             page.deleteLater()
 
+    def _remove_page_tab(self, page):
+        """Drop page's tab and any batch work still pending for it."""
+        self._deferred_pages.pop(page, None)
+        if self._update_current_page is page:
+            self._update_current_page = None
+        tab_index = self.indexOf(page)
+        if tab_index < 0:
+            return
+        # Inside a batch currentChanged is only emitted by endUpdate().
+        was_blocked = self.blockSignals(bool(self._update_depth) or self.signalsBlocked())
+        try:
+            self.removeTab(tab_index)
+        finally:
+            self.blockSignals(was_blocked)
+
     def removePage(self, page_or_index):
         index = page_or_index if isinstance(page_or_index, int) else self.pageIndex(page_or_index)
         self.remove_page(index)
@@ -1140,13 +1518,15 @@ class LqRibbonBar(QTabWidget):
         index = page_or_index if isinstance(page_or_index, int) else self.pageIndex(page_or_index)
         if 0 <= index < len(self.pages):
             page = self.pages.pop(index)
-            self.removeTab(index)
+            self._remove_page_tab(page)
             page.setParent(None)
 
     def clear_pages(self):
         """Remove all pages"""
         self.clear()
         self.pages.clear()
+        self._deferred_pages.clear()
+        self._update_current_page = None
 
     def clearPages(self):
         self.clear_pages()
@@ -1185,107 +1565,119 @@ class LqRibbonBar(QTabWidget):
         self._search_suggestions.clear()
 
     def setSearchDocumentResults(self, results):
-        self._search_document_results = list(results)
+        self._search_result_lists["document"] = LqRibbonListSearchProvider(results)
 
     def searchDocumentResults(self):
-        return list(self._search_document_results)
+        return self._search_result_items("document")
 
     def clearSearchDocumentResults(self):
-        self._search_document_results.clear()
+        self._search_result_lists.pop("document", None)
+
+    def setSearchDocumentProvider(self, provider):
+        """Stream document results from ``provider`` instead of the result list."""
+        self._set_search_result_provider("document", provider)
+
+    def searchDocumentProvider(self):
+        return self._search_result_providers.get("document")
 
     def setSearchRelatedFiles(self, files):
-        self._search_related_files = list(files)
+        self._search_result_lists["related"] = LqRibbonListSearchProvider(files)
 
     def searchRelatedFiles(self):
-        return list(self._search_related_files)
+        return self._search_result_items("related")
 
     def clearSearchRelatedFiles(self):
-        self._search_related_files.clear()
+        self._search_result_lists.pop("related", None)
+
+    def setSearchRelatedFilesProvider(self, provider):
+        """Stream related files from ``provider`` instead of the file list."""
+        self._set_search_result_provider("related", provider)
+
+    def searchRelatedFilesProvider(self):
+        return self._search_result_providers.get("related")
+
+    def _set_search_result_provider(self, kind, provider):
+        if provider is None:
+            self._search_result_providers.pop(kind, None)
+        else:
+            self._search_result_providers[kind] = provider
+
+    def _search_result_items(self, kind):
+        provider = self._search_result_lists.get(kind)
+        return provider.items() if provider is not None else []
+
+    def _search_result_provider(self, kind):
+        provider = self._search_result_providers.get(kind)
+        if provider is None:
+            provider = self._search_result_lists.get(kind)
+        return provider
 
     def registerSearchAction(self, action, keywords=None):
-        if action not in self._search_actions:
+        if action not in self._search_index:
             self._search_actions.append(action)
             self._search_bar.addSuggestedAction(action)
         action.setData(keywords or [])
+        self._search_index.addAction(action)
 
     def unregisterSearchAction(self, action):
-        if action in self._search_actions:
+        if action in self._search_index:
             self._search_actions.remove(action)
+            self._search_index.removeAction(action)
         self._search_bar.removeSuggestedAction(action)
 
     def searchActions(self):
         return list(self._search_actions)
 
+    def searchIndex(self):
+        return self._search_index
+
     def _normalized_search_text(self, text):
-        return str(text).replace("&", "").strip().lower()
+        return LqRibbonSearchIndex.normalize(text)
 
     def _search_phrase_tokens(self, text):
         return self._normalized_search_text(text).split()
 
     def _fuzzy_search_token_matches(self, candidate_token, query_token):
-        if not candidate_token or not query_token:
-            return False
-        if candidate_token.startswith(query_token):
-            return True
-        query_index = 0
-        for character in candidate_token:
-            if character == query_token[query_index]:
-                query_index += 1
-                if query_index == len(query_token):
-                    return True
-        return False
+        return LqRibbonSearchIndex.tokenMatches(candidate_token, query_token)
 
     def _fuzzy_search_term_matches(self, term, normalized_query):
-        if not normalized_query:
-            return False
-        normalized_term = self._normalized_search_text(term)
-        if normalized_query in normalized_term:
-            return True
-        term_tokens = self._search_phrase_tokens(normalized_term)
-        query_tokens = self._search_phrase_tokens(normalized_query)
-        if not term_tokens or not query_tokens:
-            return False
-
-        term_index = 0
-        for query_token in query_tokens:
-            matched = False
-            while term_index < len(term_tokens):
-                if self._fuzzy_search_token_matches(
-                    term_tokens[term_index], query_token
-                ):
-                    matched = True
-                    term_index += 1
-                    break
-                term_index += 1
-            if not matched:
-                acronym = "".join(token[0] for token in term_tokens if token)
-                return len(query_tokens) == 1 and self._fuzzy_search_token_matches(
-                    acronym, query_token
-                )
-        return True
+        return LqRibbonSearchIndex.termMatches(term, normalized_query)
 
     def _search_action_terms(self, action):
-        keywords = action.data() or []
-        if isinstance(keywords, str):
-            keywords = [keywords]
-        return [action.text()] + [str(keyword) for keyword in keywords]
+        return LqRibbonSearchIndex.actionTerms(action)
 
     def searchAction(self, text):
-        normalized = self._normalized_search_text(text)
-        for action in self._search_actions:
-            if any(
-                normalized == self._normalized_search_text(item)
-                for item in self._search_action_terms(action)
-            ):
-                return action
-        for action in self._search_actions:
-            if any(
-                self._fuzzy_search_term_matches(item, normalized)
-                for item in self._search_action_terms(action)
-            ):
-                return action
+        action = self._match_search_action(text)
+        if action is not None:
+            return action
+        # Lazy pages register their commands when built; only build those
+        # whose declared search terms match, so a miss builds nothing.
+        for page in list(self.pages):
+            if not hasattr(page, "lazySearchTerms"):
+                continue
+            terms = page.lazySearchTerms()
+            if not any(LqRibbonSearchIndex.termMatches(term, text) for term in terms):
+                continue
+            if page.materialize():
+                action = self._match_search_action(text)
+                if action is not None:
+                    return action
         return None
 
+    def _match_search_action(self, text):
+        ranked = self.rankedSearchActions(text, 1)
+        return ranked[0][0] if ranked else None
+
+    def _search_boosts(self):
+        return {
+            action: max(1, RIBBON_SEARCH_RECENT_BOOST - index)
+            for index, action in enumerate(self._recent_search_actions)
+        }
+
+    def rankedSearchActions(self, text, limit=None, accept=None):
+        """Return the best ``(action, score)`` matches for ``text``, best first."""
+        return self._search_index.search(text, limit, self._search_boosts(), accept)
+
     def triggerSearchAction(self, text):
         if not self._search_action_trigger_enabled:
             return False
@@ -1350,7 +1742,7 @@ class LqRibbonBar(QTabWidget):
         action = QAction(icon if isinstance(icon, QIcon) else QIcon(icon), text, self)
         action.setToolTip(text)
         self._title_button_bar.addAction(action)
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_SEARCH)
         return action
 
     def addAction(self, *args):
@@ -1364,9 +1756,14 @@ class LqRibbonBar(QTabWidget):
     def removeTitleButton(self, action):
         self._title_button_bar.removeAction(action)
         action.deleteLater()
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_SEARCH)
 
     def setCurrentPageIndex(self, index):
+        if self._update_depth:
+            page = self.get_page(index)
+            if page is not None:
+                self._update_current_page = page
+            return
         self.setCurrentIndex(index)
 
     def setRibbonMinimized(self, minimized):
@@ -1380,6 +1777,7 @@ class LqRibbonBar(QTabWidget):
         temporary_was_expanded = self._ribbon_temporary_expanded
         self._ribbon_minimized = minimized
         self._ribbon_temporary_expanded = False
+        self._update_event_filter_scope()
         self._apply_ribbon_height()
         self.ribbon_minimized_changed.emit(self._ribbon_minimized)
         self.ribbonMinimizedChanged.emit(self._ribbon_minimized)
@@ -1435,6 +1833,9 @@ class LqRibbonBar(QTabWidget):
         if enabled:
             self.setRibbonMinimized(False)
         self._simplified_action.setChecked(self._simplified_mode)
+        for page in self.pages:
+            if hasattr(page, "setSimplifiedMode"):
+                page.setSimplifiedMode(enabled)
         self._apply_ribbon_height()
         self.simplified_mode_changed.emit(self._simplified_mode)
         self.simplifiedModeChanged.emit(self._simplified_mode)
@@ -1448,7 +1849,7 @@ class LqRibbonBar(QTabWidget):
     def setFrameThemeEnabled(self, enabled=True):
         self._frame_theme_enabled = bool(enabled)
         self._search_bar.setVisible(enabled)
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_CHROME)
         self.update()
         self.frameThemeChanged.emit(self._frame_theme_enabled)
 
@@ -1492,8 +1893,11 @@ class LqRibbonBar(QTabWidget):
         if self._ribbon_style == style:
             return
         self._ribbon_style = style
-        self.setStyleSheet(self._style_sheet())
-        self._update_layout()
+        self._apply_theme()
+        for page in self.pages:
+            if hasattr(page, "_update_surface_palette"):
+                page._update_surface_palette()
+        self._update_layout(RIBBON_LAYOUT_CHROME)
         self.update()
         self.ribbonStyleChanged.emit(int(style))
 
@@ -1508,7 +1912,7 @@ class LqRibbonBar(QTabWidget):
         self._search_bar_appearance = appearance
         self._search_bar.setCompact(appearance == 2)
         self._search_bar.setVisible(appearance != 3)
-        self._update_layout()
+        self._update_layout(RIBBON_LAYOUT_CHROME)
 
     def searchBarAppearance(self):
         return self._search_bar_appearance
@@ -1607,10 +2011,75 @@ class LqRibbonBar(QTabWidget):
         self._update_layout()
 
     def beginUpdate(self):
-        self.setUpdatesEnabled(False)
+        """Start a batch of page/group changes; calls may be nested.
+
+        Until the matching endUpdate() tabs are not inserted, group metrics and
+        page layouts are not applied and currentChanged is not emitted.
+        Page-level calls (pages, pageCount(), pageIndex(), movePage(),
+        removePage(), detachPage(), set_page_enabled(), setCurrentPageIndex())
+        work on the batch without ending it; tabs of pages added or moved in
+        the batch only show up in count(), indexOf() and currentIndex() after
+        endUpdate().
+        """
+        self._update_depth += 1
+        if self._update_depth == 1:
+            self._update_start_page = self.currentWidget()
+            self._update_current_page = None
+            self.setUpdatesEnabled(False)
 
     def endUpdate(self):
+        """Finish a batch started by beginUpdate() and apply it in one pass."""
+        if not self._update_depth:
+            return
+        self._update_depth -= 1
+        if self._update_depth:
+            return
+        self._insert_deferred_tabs()
+        metrics = self._group_layout_metrics()
+        deferred_pages = list(self._deferred_pages)
+        self._deferred_pages.clear()
+        for page in deferred_pages:
+            if page in self.pages:
+                self._apply_page_group_metrics(page, metrics)
+                page.updateLayout()
+        self._update_layout(self._layout_dirty | RIBBON_LAYOUT_CHROME)
         self.setUpdatesEnabled(True)
+        start_page = self._update_start_page
+        self._update_start_page = None
+        if self.currentWidget() is not start_page:
+            self.currentChanged.emit(self.currentIndex())
+
+    def isUpdating(self):
+        return self._update_depth > 0
+
+    def updateTransaction(self):
+        """Return a context manager that batches changes between begin/endUpdate."""
+        return _RibbonUpdateTransaction(self)
+
+    def _defer_page_layout(self, page):
+        if not self._update_depth:
+            return False
+        self._deferred_pages[page] = None
+        return True
+
+    def _insert_deferred_tabs(self):
+        if not self._deferred_pages and self._update_current_page is None:
+            return
+        # Signals stay blocked so inserting the first tab or selecting the
+        # requested page does not emit currentChanged mid-batch; endUpdate()
+        # emits it once.
+        was_blocked = self.blockSignals(True)
+        try:
+            for index, page in enumerate(self.pages):
+                if self.indexOf(page) < 0:
+                    self.insertTab(index, page, str(page.title))
+                    if page.testAttribute(Qt.WidgetAttribute.WA_ForceDisabled):
+                        self.setTabEnabled(index, False)
+            if self._update_current_page in self.pages:
+                self.setCurrentWidget(self._update_current_page)
+        finally:
+            self.blockSignals(was_blocked)
+        self._update_current_page = None
 
     @staticmethod
     def loadTranslation(country=""):
@@ -3,8 +3,8 @@ LqRibbonButton - Ribbon button with different display styles
 """
 
 from PySide6.QtWidgets import QToolButton, QSizePolicy
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt, QEvent, QSize
+from PySide6.QtGui import QAction, QPainter, QPalette
 
 
 def _tool_button_style(style):
@@ -16,6 +16,16 @@ def _tool_button_style(style):
         return Qt.ToolButtonStyle.ToolButtonTextUnderIcon
 
 
+# Events after which a cached size hint may no longer match the button.
+_SIZE_HINT_EVENTS = (
+    QEvent.Type.Polish,
+    QEvent.Type.FontChange,
+    QEvent.Type.StyleChange,
+    QEvent.Type.ActionChanged,
+    QEvent.Type.LanguageChange,
+)
+
+
 class LqRibbonButton(QToolButton):
     """Ribbon button that can display icon and text in different styles"""
 
@@ -25,6 +35,8 @@ class LqRibbonButton(QToolButton):
         self._word_wrap = False
         self._large_icon = False
         self._simplified_mode = False
+        self._size_hint = None
+        self._minimum_size_hint = None
         self.init_ui()
 
         if action:
@@ -33,32 +45,131 @@ class LqRibbonButton(QToolButton):
     def init_ui(self):
         """Initialize the button UI"""
         # Set button properties based on style
-        self.setToolButtonStyle(self.button_style)
+        self._apply_style_metrics(self.button_style)
+
+        # Set auto raise for flat appearance
+        self.setAutoRaise(True)
+
+        # Set popup mode to instant popup if needed
+        self.setPopupMode(QToolButton.ToolButtonPopupMode.DelayedPopup)
+        self.updateIconSize()
 
-        if self.button_style == Qt.ToolButtonStyle.ToolButtonTextUnderIcon:
+    def _apply_style_metrics(self, style):
+        self.setToolButtonStyle(style)
+
+        if style == Qt.ToolButtonStyle.ToolButtonTextUnderIcon:
             # Large button with icon on top and text below
             self.setProperty("buttonStyle", "0")
             self._large_icon = True
             self.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
 
-        elif self.button_style == Qt.ToolButtonStyle.ToolButtonTextBesideIcon:
+        elif style == Qt.ToolButtonStyle.ToolButtonTextBesideIcon:
             # Medium button with icon and text side by side
             self.setProperty("buttonStyle", "1")
             self._large_icon = False
             self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
 
-        elif self.button_style == Qt.ToolButtonStyle.ToolButtonIconOnly:
+        elif style == Qt.ToolButtonStyle.ToolButtonIconOnly:
             # Icon only button
             self.setProperty("buttonStyle", "2")
             self._large_icon = False
             self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
-        # Set auto raise for flat appearance
-        self.setAutoRaise(True)
+    def displayStyle(self):
+        """Return the style the button is currently shown in."""
+        return self.toolButtonStyle()
 
-        # Set popup mode to instant popup if needed
-        self.setPopupMode(QToolButton.ToolButtonPopupMode.DelayedPopup)
+    def setDisplayStyle(self, style):
+        """Show the button in another style without changing its configured style."""
+        style = _tool_button_style(style)
+        if style == self.toolButtonStyle():
+            return
+        self._apply_style_metrics(style)
         self.updateIconSize()
+        # The style sheet keys metrics off the buttonStyle property.
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.invalidateSizeHint()
+        self.updateGeometry()
+
+    def invalidateSizeHint(self):
+        """Drop the cached size hints so the next layout pass measures again."""
+        self._size_hint = None
+        self._minimum_size_hint = None
+
+    def sizeHint(self):
+        if self._size_hint is None:
+            self._size_hint = super().sizeHint()
+        return QSize(self._size_hint)
+
+    def minimumSizeHint(self):
+        if self._minimum_size_hint is None:
+            self._minimum_size_hint = super().minimumSizeHint()
+        return QSize(self._minimum_size_hint)
+
+    def event(self, event):
+        if event.type() not in _SIZE_HINT_EVENTS:
+            return super().event(event)
+        # Polishing applies style sheet metrics inside the base handler.
+        handled = super().event(event)
+        self.invalidateSizeHint()
+        return handled
+
+    def setText(self, text):
+        self.invalidateSizeHint()
+        super().setText(text)
+
+    def setIcon(self, icon):
+        self.invalidateSizeHint()
+        super().setIcon(icon)
+
+    def setIconSize(self, size):
+        self.invalidateSizeHint()
+        super().setIconSize(size)
+
+    def setToolButtonStyle(self, style):
+        self.invalidateSizeHint()
+        super().setToolButtonStyle(style)
+
+    def setMenu(self, menu):
+        self.invalidateSizeHint()
+        super().setMenu(menu)
+
+    def setPopupMode(self, mode):
+        self.invalidateSizeHint()
+        super().setPopupMode(mode)
+
+    def setDefaultAction(self, action):
+        self.invalidateSizeHint()
+        super().setDefaultAction(action)
+
+    def _palette_themed(self):
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, "isPaletteThemingEnabled"):
+                return parent.isPaletteThemingEnabled()
+            parent = parent.parent()
+        return False
+
+    def paintEvent(self, event):
+        # With palette theming the static style sheet has no hover/pressed
+        # colours, so the button panel is painted from the palette here.
+        active = self.isDown() or self.underMouse()
+        if active and self.isEnabled() and self._palette_themed():
+            palette = self.palette()
+            down = self.isDown()
+            painter = QPainter(self)
+            rect = self.rect().adjusted(1, 1, -1, -1)
+            painter.fillRect(
+                rect,
+                palette.color(QPalette.ColorRole.Dark if down else QPalette.ColorRole.Highlight),
+            )
+            painter.setPen(
+                palette.color(QPalette.ColorRole.Shadow if down else QPalette.ColorRole.Mid)
+            )
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+            painter.end()
+        super().paintEvent(event)
 
     def set_button_style(self, style):
         """Change the button style
@@ -107,6 +218,7 @@ class LqRibbonButton(QToolButton):
     def setWordWrap(self, on):
         """Set whether button text may wrap."""
         self._word_wrap = bool(on)
+        self.invalidateSizeHint()
         self.updateGeometry()
 
     def isLargeIcon(self):
@@ -123,12 +235,22 @@ class LqRibbonButton(QToolButton):
         return self._simplified_mode
 
     def setSimplifiedMode(self, enabled):
-        """Toggle simplified icon-only display."""
-        self._simplified_mode = bool(enabled)
-        if enabled:
-            self.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
+        """Toggle simplified one-row display.
+
+        Large buttons keep their label beside a small icon; other buttons show
+        only their icon.
+        """
+        enabled = bool(enabled)
+        if enabled == self._simplified_mode:
+            return
+        self._simplified_mode = enabled
+        self.invalidateSizeHint()
+        if not enabled:
+            self.setDisplayStyle(self.button_style)
+        elif self.button_style == Qt.ToolButtonStyle.ToolButtonTextUnderIcon:
+            self.setDisplayStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
         else:
-            self.setToolButtonStyle(self.button_style)
+            self.setDisplayStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
         self.updateGeometry()
 
     def updateIconSize(self):
@@ -137,6 +259,7 @@ class LqRibbonButton(QToolButton):
 
     def changed(self):
         """Refresh visual metrics after action or style changes."""
+        self.invalidateSizeHint()
         self.updateIconSize()
         self.updateGeometry()
         self.update()
@@ -2,10 +2,41 @@
 Additional LqRibbon widgets and compatibility helpers.
 """
 
+import asyncio
+import bisect
+import heapq
+import inspect
+import logging
+import queue
+import sqlite3
+import threading
 import xml.etree.ElementTree as ET
-
-from PySide6.QtCore import Qt, QObject, QPoint, QRect, QSize, QTimer, Signal
-from PySide6.QtGui import QAction, QColor, QIcon, QPainter, QPixmap
+from collections import OrderedDict
+
+from PySide6.QtCore import (
+    Qt,
+    QElapsedTimer,
+    QEvent,
+    QObject,
+    QPoint,
+    QRect,
+    QRunnable,
+    QSize,
+    QSignalBlocker,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import (
+    QAction,
+    QColor,
+    QIcon,
+    QImage,
+    QImageReader,
+    QPainter,
+    QPalette,
+    QPixmap,
+)
 from PySide6.QtWidgets import (
     QCheckBox,
     QColorDialog,
@@ -28,6 +59,7 @@ from PySide6.QtWidgets import (
     QPushButton,
     QRadioButton,
     QScrollArea,
+    QScrollBar,
     QSizePolicy,
     QSlider,
     QSpinBox,
@@ -37,11 +69,13 @@ from PySide6.QtWidgets import (
     QTimeEdit,
     QToolBar,
     QToolButton,
+    QToolTip,
     QVBoxLayout,
     QWidget,
     QWidgetAction,
 )
 
+_logger = logging.getLogger(__name__)
 
 QtnRibbonCustomizeQuickAccessToolBarDotString = "Customize Quick Access Toolbar..."
 QtnRibbonCustomizeQuickAccessToolBarString = "Customize Quick Access Toolbar"
@@ -67,6 +101,8 @@ QtnRibbonSearchBarRelatedFilesString = "Related Files"
 QtnRibbonSearchBarNoResultsString = "No Results"
 QtnRibbonSearchBarNoResultsFoundString = "No results found for"
 QtnRibbonGalleryItemSize = QSize(72, 56)
+QtnRibbonGalleryScrollButtonWidth = 14
+QtnRibbonGalleryPopupRowCount = 6
 QtnRibbonGalleryItemString = "Gallery Item"
 
 
@@ -114,8 +150,9 @@ class LqRibbonControlSizeDefinition:
     def __init__(self, parent=None, group_size=GroupLarge):
         self.parent = parent
         self._group_size = group_size
-        self._image_size = self.ImageLarge
-        self._label_visible = True
+        large = group_size in (self.GroupLarge, self.GroupPopup)
+        self._image_size = self.ImageLarge if large else self.ImageSmall
+        self._label_visible = group_size != self.GroupSmall
         self._popup = False
         self._visible = True
         self._enabled = True
@@ -181,6 +218,10 @@ class LqRibbonControl(QWidget):
         self._default_action = None
         self._current_size = LqRibbonControlSizeDefinition.GroupLarge
         self._definitions = {}
+        self._visible = True
+        self._enabled = True
+        self._size_visible = True
+        self._size_enabled = True
 
     def parentGroup(self):
         return self.parent()
@@ -201,8 +242,35 @@ class LqRibbonControl(QWidget):
         self.sizeChanged(self._current_size)
         return True
 
+    def setVisible(self, visible):
+        """Show or hide the control; a size definition can still keep it hidden."""
+        self._visible = bool(visible)
+        super().setVisible(self._visible and self._size_visible)
+
+    def setEnabled(self, enabled):
+        """Enable or disable the control; a size definition can still disable it."""
+        self._enabled = bool(enabled)
+        super().setEnabled(self._enabled and self._size_enabled)
+
     def sizeChanged(self, size):
         self._current_size = size
+        definition = self._definitions.get(size)
+        visible = definition is None or definition.isVisible()
+        enabled = definition is None or definition.isEnabled()
+        # Definitions are combined with, not written over, the application's state.
+        if visible != self._size_visible:
+            self._size_visible = visible
+            super().setVisible(self._visible and visible)
+        if enabled != self._size_enabled:
+            self._size_enabled = enabled
+            super().setEnabled(self._enabled and enabled)
+
+    def sizeHintForSize(self, size):
+        """Return the size hint at a group size, or None if the control is hidden there."""
+        definition = self._definitions.get(size)
+        if not self._visible or (definition is not None and not definition.isVisible()):
+            return None
+        return self.sizeHint()
 
     def actionChanged(self):
         pass
@@ -252,15 +320,40 @@ class LqRibbonToolBarControl(LqRibbonControl):
         super().__init__(parent)
         self.toolbar = QToolBar(self)
         self.toolbar.setMovable(False)
+        # The control reports the toolbar's width itself; the layout only places it.
+        self.toolbar.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        self._actions = []
+        self._action_widths = {}
+        self._overflow_ends = None
+        self._overflow_cache = {}
+        self._overflow_count = None
+        self._overflow_updating = False
+        self._overflow_menu = QMenu(self)
+        self._overflow_button = QToolButton(self)
+        self._overflow_button.setObjectName("lqRibbonToolBarOverflowButton")
+        self._overflow_button.setText("\u2026")
+        self._overflow_button.setAutoRaise(True)
+        self._overflow_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self._overflow_button.setMenu(self._overflow_menu)
+        self._overflow_button.hide()
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
         layout.addWidget(self.toolbar)
+        layout.addWidget(self._overflow_button)
 
     def clear(self):
+        self._set_overflow_count(None)
+        for action in self._actions:
+            action.changed.disconnect(self._action_changed)
         self.toolbar.clear()
+        self._actions = []
+        self._action_widths.clear()
+        self._invalidate_overflow()
 
     def addAction(self, *args):
-        return self.toolbar.addAction(*args)
+        self._set_overflow_count(None)
+        return self._add_action(self.toolbar.addAction(*args))
 
     def addMenu(self, text_or_icon, text=None):
         if text is None:
@@ -271,20 +364,172 @@ class LqRibbonToolBarControl(LqRibbonControl):
         menu = QMenu(text, self)
         action = QAction(icon, text, self)
         action.setMenu(menu)
+        self._set_overflow_count(None)
         self.toolbar.addAction(action)
+        self._add_action(action)
         return menu
 
     def addWidget(self, widget):
-        return self.toolbar.addWidget(widget)
+        self._set_overflow_count(None)
+        return self._add_action(self.toolbar.addWidget(widget))
 
     def addSeparator(self):
-        return self.toolbar.addSeparator()
+        self._set_overflow_count(None)
+        return self._add_action(self.toolbar.addSeparator())
+
+    def _add_action(self, action):
+        self._actions.append(action)
+        action.changed.connect(self._action_changed)
+        self._invalidate_overflow()
+        return action
 
     def overflowMenu(self):
-        return QMenu(self)
+        """Return the persistent menu holding the actions that do not fit."""
+        return self._overflow_menu
 
     def isOverflowMenuIsEmpty(self):
-        return True
+        return not any(
+            action.isVisible() and not action.isSeparator()
+            for action in self._overflow_menu.actions()
+        )
+
+    def overflowCount(self):
+        """Return how many trailing actions are currently in the overflow menu."""
+        return len(self._actions) - self._split(self._overflow_count)[1]
+
+    def _action_changed(self):
+        action = self.sender()
+        # Actions in the overflow menu keep the width they last had in the toolbar.
+        if self.toolbar.widgetForAction(action) is not None:
+            self._action_widths.pop(action, None)
+        self._invalidate_overflow()
+
+    def _action_width(self, action):
+        """Return the action's toolbar width, remembered while it sits in the menu."""
+        if not action.isVisible():
+            return 0
+        width = self._action_widths.get(action)
+        if width is None:
+            widget = self.toolbar.widgetForAction(action)
+            if widget is None:
+                return 0
+            width = self._action_widths[action] = widget.sizeHint().width()
+        return width
+
+    def _overflow_layout(self):
+        """Return the right edge of every action when all of them sit in the toolbar."""
+        if self._overflow_ends is None:
+            layout = self.toolbar.layout()
+            spacing = layout.spacing()
+            right = layout.contentsMargins().left()
+            ends = []
+            shown = False
+            for action in self._actions:
+                width = self._action_width(action)
+                if width:
+                    if shown:
+                        right += spacing
+                    right += width
+                    shown = True
+                ends.append(right)
+            self._overflow_ends = ends
+        return self._overflow_ends
+
+    def _full_width(self):
+        layout = self.toolbar.layout()
+        ends = self._overflow_layout()
+        margins = layout.contentsMargins()
+        return (ends[-1] if ends else margins.left()) + margins.right()
+
+    def _invalidate_overflow(self):
+        self._overflow_ends = None
+        self._overflow_cache.clear()
+        self.updateGeometry()
+        self._update_overflow()
+
+    def _update_overflow(self):
+        if not self.isVisible() or self._overflow_updating:
+            return
+        self._overflow_updating = True
+        try:
+            available = self.contentsRect().width()
+            if available not in self._overflow_cache:
+                self._overflow_cache[available] = self._fitting_count(available)
+            count = self._overflow_cache[available]
+            while self._set_overflow_count(count):
+                # Actions back from the menu were measured again; refit with their widths.
+                self._overflow_ends = None
+                self._overflow_cache.clear()
+                self.updateGeometry()
+                count = self._overflow_cache[available] = self._fitting_count(available)
+        finally:
+            self._overflow_updating = False
+
+    def _fitting_count(self, available):
+        """Return how many leading actions fit beside the overflow button, or None for all."""
+        if self._full_width() <= available:
+            return None
+        right = self.toolbar.layout().contentsMargins().right()
+        limit = available - right - self._overflow_button.sizeHint().width()
+        return bisect.bisect_right(self._overflow_layout(), limit)
+
+    def _split(self, count):
+        """Return where the toolbar part ends and the menu part starts for a cut at count.
+
+        Separators at the cut are dropped from both sides.
+        """
+        if count is None:
+            return len(self._actions), len(self._actions)
+        end = start = count
+        while end and self._actions[end - 1].isSeparator():
+            end -= 1
+        while start < len(self._actions) and self._actions[start].isSeparator():
+            start += 1
+        return end, start
+
+    def _set_overflow_count(self, count):
+        """Keep the first count actions in the toolbar and the rest in the menu.
+
+        Returns True when an action moved back into the toolbar with a new width.
+        """
+        before_end, before_start = self._split(self._overflow_count)
+        end, start = self._split(count)
+        self._overflow_count = count
+        self._overflow_button.setVisible(count is not None)
+        for action in self._actions[end:before_end]:
+            self.toolbar.removeAction(action)
+        for action in self._actions[before_start:start]:
+            self._overflow_menu.removeAction(action)
+        if start < before_start:
+            menu_actions = self._overflow_menu.actions()
+            self._overflow_menu.insertActions(
+                menu_actions[0] if menu_actions else None, self._actions[start:before_start]
+            )
+        returned = self._actions[before_end:end]
+        self.toolbar.addActions(returned)
+        stale = False
+        for action in returned:
+            width = self._action_widths.pop(action, None)
+            stale = stale or (width is not None and width != self._action_width(action))
+        return stale
+
+    def sizeHint(self):
+        hint = super().sizeHint()
+        hint.setWidth(self._full_width())
+        return hint
+
+    def minimumSizeHint(self):
+        hint = super().minimumSizeHint()
+        hint.setWidth(self._overflow_button.sizeHint().width())
+        return hint
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_overflow()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_overflow()
 
 
 class LqRibbonButtonControl(LqRibbonWidgetControl):
@@ -296,6 +541,48 @@ class LqRibbonButtonControl(LqRibbonWidgetControl):
         self._large_icon = QIcon()
         self._small_icon = QIcon()
         self._label = ""
+        self._large_state = None
+
+    def _uses_large_state(self, size):
+        return size == LqRibbonControlSizeDefinition.GroupLarge and size not in self._definitions
+
+    def displayStyleForSize(self, size):
+        """Return the tool button style the control's button takes at a group size."""
+        if self._uses_large_state(size):
+            if self._large_state is not None:
+                return self._large_state[0]
+            return self.widget().toolButtonStyle()
+        definition = self._definitions.get(size) or LqRibbonControlSizeDefinition(self, size)
+        if definition.imageSize() == LqRibbonControlSizeDefinition.ImageLarge:
+            return Qt.ToolButtonStyle.ToolButtonTextUnderIcon
+        if definition.imageSize() == LqRibbonControlSizeDefinition.ImageNone:
+            return Qt.ToolButtonStyle.ToolButtonTextOnly
+        if definition.isLabelVisible():
+            return Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+        return Qt.ToolButtonStyle.ToolButtonIconOnly
+
+    def sizeChanged(self, size):
+        super().sizeChanged(size)
+        button = self.widget()
+        if self._uses_large_state(size):
+            if self._large_state is not None:
+                style, large_icon, icon = self._large_state
+                self._large_state = None
+                button.setDisplayStyle(style)
+                button.setIcon(icon)
+                button.setLargeIcon(large_icon)
+            return
+        if self._large_state is None:
+            self._large_state = (button.toolButtonStyle(), button.isLargeIcon(), button.icon())
+        definition = self.sizeDefinition(size)
+        large = definition.imageSize() == LqRibbonControlSizeDefinition.ImageLarge
+        button.setDisplayStyle(self.displayStyleForSize(size))
+        icon = self._large_icon if large else self._small_icon
+        if icon.isNull():
+            icon = self._small_icon if large else self._large_icon
+        if not icon.isNull():
+            button.setIcon(icon)
+        button.setLargeIcon(large)
 
     def largeIcon(self):
         return self._large_icon
@@ -394,81 +681,429 @@ class LqRibbonDateEditControl(LqRibbonWidgetControl):
         super().__init__(parent, QDateEdit())
 
 
+_GALLERY_ITEM_SEPARATOR = 0x01
+_GALLERY_ITEM_DISABLED = 0x02
+_GALLERY_ITEM_HIDDEN = 0x04
+_EMPTY_ICON = None
+
+
+def _empty_icon():
+    global _EMPTY_ICON
+    if _EMPTY_ICON is None:
+        _EMPTY_ICON = QIcon()
+    return _EMPTY_ICON
+
+
+def _load_thumbnail(source, size):
+    """Decode ``source`` into a QImage no larger than ``size`` (worker thread)."""
+    if callable(source):
+        image = source(QSize(size))
+        if isinstance(image, str):
+            source = image
+        else:
+            image = image if isinstance(image, QImage) else QImage()
+    if isinstance(source, str):
+        reader = QImageReader(source)
+        original = reader.size()
+        if original.isValid() and (
+            original.width() > size.width() or original.height() > size.height()
+        ):
+            reader.setScaledSize(original.scaled(size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+    if not image.isNull() and (
+        image.width() > size.width() or image.height() > size.height()
+    ):
+        image = image.scaled(
+            size,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    return image
+
+
+class _LqThumbnailTask(QRunnable):
+    def __init__(self, cache, key, source, size):
+        super().__init__()
+        self._cache = cache
+        self._key = key
+        self._source = source
+        self._size = QSize(size)
+
+    def run(self):
+        try:
+            image = _load_thumbnail(self._source, self._size)
+        except Exception:
+            image = QImage()
+        self._cache._loaded.emit(self._key, image)
+
+
+class LqRibbonThumbnailCache(QObject):
+    """Size-bounded LRU cache of scaled gallery thumbnails decoded off the GUI thread.
+
+    Sources are file or resource paths, or callables taking the target QSize
+    and returning a QImage (or a path). ``thumbnailReady`` fires in the GUI
+    thread with the cache key once a requested thumbnail is available.
+    Thumbnails requested in the current or the previous event-loop pass are
+    never evicted, so visible cells stay cached even above ``max_cost``.
+    """
+
+    thumbnailReady = Signal(object)
+    _loaded = Signal(object, QImage)
+    _shared = None
+
+    def __init__(self, parent=None, max_cost=32 * 1024 * 1024):
+        super().__init__(parent)
+        self._images = OrderedDict()
+        self._pending = set()
+        self._requested = set()
+        self._pinned = set()
+        self._pass_scheduled = False
+        self._total_cost = 0
+        self._max_cost = int(max_cost)
+        self._pool = QThreadPool(self)
+        self._loaded.connect(self._store, Qt.ConnectionType.QueuedConnection)
+
+    @classmethod
+    def instance(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def cacheKey(source, size):
+        return source, size.width(), size.height()
+
+    def threadPool(self):
+        return self._pool
+
+    def maxCost(self):
+        return self._max_cost
+
+    def setMaxCost(self, cost):
+        self._max_cost = max(0, int(cost))
+        self._evict()
+
+    def totalCost(self):
+        return self._total_cost
+
+    def count(self):
+        return len(self._images)
+
+    def contains(self, source, size):
+        return self.cacheKey(source, size) in self._images
+
+    def isPending(self, source, size):
+        return self.cacheKey(source, size) in self._pending
+
+    def thumbnail(self, source, size):
+        """Return the cached QImage, or None after queueing it for decoding."""
+        key = self.cacheKey(source, size)
+        requested = key in self._requested
+        self._pin(key)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        if not requested and key not in self._pending and not size.isEmpty():
+            self._pending.add(key)
+            self._pool.start(_LqThumbnailTask(self, key, source, size))
+        return None
+
+    def clear(self):
+        self._images.clear()
+        self._total_cost = 0
+
+    def waitForDone(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
+
+    @staticmethod
+    def _cost(image):
+        return max(1, image.sizeInBytes())
+
+    def _pin(self, key):
+        self._requested.add(key)
+        if not self._pass_scheduled:
+            self._pass_scheduled = True
+            QTimer.singleShot(0, self, self._end_pass)
+
+    def _end_pass(self):
+        self._pass_scheduled = False
+        self._pinned = self._requested
+        self._requested = set()
+        self._evict()
+
+    def _store(self, key, image):
+        if key not in self._pending:
+            return
+        self._pending.discard(key)
+        self._images[key] = image
+        self._total_cost += self._cost(image)
+        self._evict()
+        if key in self._images:
+            self.thumbnailReady.emit(key)
+
+    def _evict(self):
+        if self._total_cost <= self._max_cost:
+            return
+        pinned = self._pinned | self._requested
+        for key in list(self._images):
+            if self._total_cost <= self._max_cost:
+                break
+            if key not in pinned:
+                self._total_cost -= self._cost(self._images.pop(key))
+
+
+class LqRibbonGalleryAtlas:
+    """Sprite sheet shared by gallery items that each refer to one cell by index."""
+
+    def __init__(self, pixmap, image_size, transparent_color=QColor()):
+        pixmap = QPixmap(pixmap)
+        if isinstance(transparent_color, QColor) and transparent_color.isValid():
+            pixmap.setMask(
+                pixmap.createMaskFromColor(transparent_color, Qt.MaskMode.MaskInColor)
+            )
+        size = QSize(image_size) if isinstance(image_size, QSize) else QSize()
+        if size.isEmpty():
+            size = QSize(pixmap.height(), pixmap.height())
+        self._pixmap = pixmap
+        self._image_size = size
+        self._columns = pixmap.width() // size.width() if size.width() > 0 else 0
+        self._rows = pixmap.height() // size.height() if size.height() > 0 else 0
+        self._icons = OrderedDict()
+        self._icon_cache_limit = 64
+
+    def pixmap(self):
+        return self._pixmap
+
+    def imageSize(self):
+        return QSize(self._image_size)
+
+    def count(self):
+        return self._columns * self._rows
+
+    def sourceRect(self, index):
+        if not 0 <= index < self.count():
+            return QRect()
+        row, column = divmod(index, self._columns)
+        width = self._image_size.width()
+        height = self._image_size.height()
+        return QRect(column * width, row * height, width, height)
+
+    def iconCacheLimit(self):
+        return self._icon_cache_limit
+
+    def setIconCacheLimit(self, limit):
+        self._icon_cache_limit = max(1, int(limit))
+        self._trim_icons()
+
+    def icon(self, index):
+        """Return the cell at ``index`` as an icon.
+
+        Recently used cells are kept in a small LRU cache, so a large sheet
+        does not keep a copy of every cell it ever handed out.
+        """
+        icon = self._icons.get(index)
+        if icon is not None:
+            self._icons.move_to_end(index)
+            return icon
+        rect = self.sourceRect(index)
+        if not rect.isValid():
+            return QIcon()
+        icon = self._icons[index] = QIcon(self._pixmap.copy(rect))
+        self._trim_icons()
+        return icon
+
+    def _trim_icons(self):
+        while len(self._icons) > self._icon_cache_limit:
+            self._icons.popitem(last=False)
+
+    def paint(self, painter, target, index):
+        rect = self.sourceRect(index)
+        if rect.isValid():
+            painter.drawPixmap(target, self._pixmap, rect)
+
+
 class LqRibbonGalleryItem:
+    """Gallery entry kept compact for galleries with many thousands of items.
+
+    Icon-less items share one null QIcon and the role data dict is only
+    allocated by the first setData call.
+    """
+
+    __slots__ = (
+        "_caption",
+        "_icon",
+        "_tool_tip",
+        "_status_tip",
+        "_data",
+        "_index",
+        "_group",
+        "_flags",
+        "_thumbnail",
+        "_sprite",
+    )
+
     def __init__(self, caption=QtnRibbonGalleryItemString, icon=None):
         self._caption = str(caption)
-        self._icon = icon if isinstance(icon, QIcon) else QIcon(icon or "")
+        self._icon = None
         self._tool_tip = ""
         self._status_tip = ""
-        self._data = {}
+        self._data = None
         self._index = -1
-        self._separator = False
-        self._enabled = True
-        self._visible = True
+        self._group = None
+        self._flags = 0
+        self._thumbnail = None
+        self._sprite = None
+        if icon is not None:
+            self._icon = self._stored_icon(icon)
+
+    @staticmethod
+    def _stored_icon(icon):
+        if isinstance(icon, QIcon):
+            return None if icon.isNull() else icon
+        return QIcon(icon) if icon else None
+
+    def _notify_changed(self):
+        if self._group is not None:
+            self._group._item_changed(self)
+
+    def _set_flag(self, flag, on):
+        self._flags = self._flags | flag if on else self._flags & ~flag
+        self._notify_changed()
 
     def icon(self):
-        return self._icon
+        if self._icon is not None:
+            return self._icon
+        if self._sprite is not None:
+            return self._sprite[0].icon(self._sprite[1])
+        return _empty_icon()
+
+    def atlas(self):
+        return self._sprite[0] if self._sprite is not None else None
+
+    def mapIndex(self):
+        return self._sprite[1] if self._sprite is not None else -1
 
     def setIcon(self, icon):
-        self._icon = icon if isinstance(icon, QIcon) else QIcon(icon)
+        self._icon = self._stored_icon(icon)
+        self._notify_changed()
+
+    def thumbnailSource(self):
+        return self._thumbnail
+
+    def setThumbnailSource(self, source):
+        """Show a lazily decoded thumbnail from a path or callable instead of the icon."""
+        self._thumbnail = source
+        self._notify_changed()
 
     def caption(self):
         return self._caption
 
     def setCaption(self, caption):
         self._caption = str(caption)
+        self._notify_changed()
 
     def toolTip(self):
         return self._tool_tip
 
     def setToolTip(self, tool_tip):
         self._tool_tip = str(tool_tip)
+        self._notify_changed()
 
     def statusTip(self):
         return self._status_tip
 
     def setStatusTip(self, status_tip):
         self._status_tip = str(status_tip)
+        self._notify_changed()
 
     def getIndex(self):
+        if self._group is not None:
+            self._group._refresh_indexes()
         return self._index
 
     def isSeparator(self):
-        return self._separator
+        return bool(self._flags & _GALLERY_ITEM_SEPARATOR)
 
     def setSeparator(self, on):
-        self._separator = bool(on)
+        self._set_flag(_GALLERY_ITEM_SEPARATOR, on)
 
     def setEnabled(self, enabled):
-        self._enabled = bool(enabled)
+        self._set_flag(_GALLERY_ITEM_DISABLED, not enabled)
 
     def isEnabled(self):
-        return self._enabled
+        return not self._flags & _GALLERY_ITEM_DISABLED
 
     def setVisible(self, visible):
-        self._visible = bool(visible)
+        self._set_flag(_GALLERY_ITEM_HIDDEN, not visible)
 
     def isVisible(self):
-        return self._visible
+        return not self._flags & _GALLERY_ITEM_HIDDEN
 
     def data(self, role=Qt.ItemDataRole.UserRole):
-        return self._data.get(int(role))
+        return self._data.get(int(role)) if self._data else None
 
     def setData(self, role, value):
+        if self._data is None:
+            self._data = {}
         self._data[int(role)] = value
+        self._notify_changed()
 
 
 class LqRibbonGalleryGroup(QObject):
     changed = Signal()
+    itemsInserted = Signal(int, int)
+    itemsRemoved = Signal(int, int)
+    itemChanged = Signal(int)
+    modelReset = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._items = []
+        self._valid_indexes = 0
+        self._reset_depth = 0
+        self._atlases = {}
         self._size = QSize(QtnRibbonGalleryItemSize)
 
     def _refresh_indexes(self):
-        for index, item in enumerate(self._items):
-            item._index = index
+        # Indexes below the watermark are still correct; only renumber the rest.
+        for index in range(self._valid_indexes, len(self._items)):
+            self._items[index]._index = index
+        self._valid_indexes = len(self._items)
+
+    def _invalidate_indexes(self, first):
+        self._valid_indexes = min(self._valid_indexes, first)
+
+    def _notify(self, signal, *args):
+        if self._reset_depth:
+            return
+        signal.emit(*args)
+        self.changed.emit()
+
+    def _item_changed(self, item):
+        if not self._reset_depth:
+            self._notify(self.itemChanged, item.getIndex())
+
+    def _adopt(self, item, index):
+        if item._group is not None and item._group is not self:
+            item._group.takeItem(item.getIndex())
+        item._group = self
+        item._index = index
+
+    def beginReset(self):
+        """Suppress change signals until the matching endReset."""
+        self._reset_depth += 1
+
+    def endReset(self):
+        if not self._reset_depth:
+            return
+        self._reset_depth -= 1
+        if not self._reset_depth:
+            self.modelReset.emit()
+            self.changed.emit()
+
+    def isResetting(self):
+        return self._reset_depth > 0
 
     def addItem(self, caption=QtnRibbonGalleryItemString, icon=None, *args):
         if isinstance(caption, LqRibbonGalleryItem):
@@ -478,24 +1113,67 @@ class LqRibbonGalleryGroup(QObject):
         self.appendItem(item)
         return item
 
+    def addThumbnailItem(self, caption, source):
+        item = LqRibbonGalleryItem(caption)
+        item._thumbnail = source
+        self.appendItem(item)
+        return item
+
+    def addItems(self, items):
+        """Append items or captions with a single ``itemsInserted`` notification."""
+        items = [
+            item if isinstance(item, LqRibbonGalleryItem) else LqRibbonGalleryItem(item)
+            for item in items
+        ]
+        if not items:
+            return []
+        first = len(self._items)
+        for offset, item in enumerate(items):
+            self._adopt(item, first + offset)
+            self._items.append(item)
+        if self._valid_indexes == first:
+            self._valid_indexes = len(self._items)
+        self._notify(self.itemsInserted, first, len(self._items) - 1)
+        return items
+
+    def atlas(self, pixmap, map_size_image, transparent_color=QColor()):
+        """Return the shared atlas for ``pixmap``, masking it on first use."""
+        pixmap = pixmap if isinstance(pixmap, QPixmap) else QPixmap(pixmap)
+        size = QSize(map_size_image) if isinstance(map_size_image, QSize) else QSize()
+        color = QColor(transparent_color) if isinstance(transparent_color, QColor) else QColor()
+        key = (
+            pixmap.cacheKey(),
+            size.width(),
+            size.height(),
+            color.rgba() if color.isValid() else None,
+        )
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = LqRibbonGalleryAtlas(pixmap, size, color)
+        return atlas
+
     def addItemFromMap(self, caption, map_index, pixmap, map_size_image, transparent_color=QColor()):
-        del map_index, map_size_image, transparent_color
-        return self.addItem(caption, QIcon(pixmap) if isinstance(pixmap, QPixmap) else QIcon())
+        item = LqRibbonGalleryItem(caption)
+        item._sprite = (self.atlas(pixmap, map_size_image, transparent_color), int(map_index))
+        self.appendItem(item)
+        return item
 
     def appendItem(self, item):
         if not isinstance(item, LqRibbonGalleryItem):
             return
-        self._items.append(item)
-        self._refresh_indexes()
-        self.changed.emit()
+        self.addItems([item])
 
     def insertItem(self, index, item):
         if not isinstance(item, LqRibbonGalleryItem):
             return
         index = max(0, min(int(index), len(self._items)))
+        if index == len(self._items):
+            self.addItems([item])
+            return
+        self._adopt(item, index)
         self._items.insert(index, item)
-        self._refresh_indexes()
-        self.changed.emit()
+        self._invalidate_indexes(index)
+        self._notify(self.itemsInserted, index, index)
 
     def addSeparator(self, caption=QtnRibbonSeparatorString):
         item = LqRibbonGalleryItem(caption)
@@ -504,14 +1182,17 @@ class LqRibbonGalleryGroup(QObject):
         return item
 
     def clear(self):
+        for item in self._items:
+            item._group = None
+            item._index = -1
         self._items.clear()
-        self.changed.emit()
+        self._valid_indexes = 0
+        if not self._reset_depth:
+            self.modelReset.emit()
+            self.changed.emit()
 
     def remove(self, index):
-        if 0 <= index < len(self._items):
-            self._items.pop(index)
-            self._refresh_indexes()
-            self.changed.emit()
+        self.takeItem(index)
 
     def itemCount(self):
         return len(self._items)
@@ -524,8 +1205,9 @@ class LqRibbonGalleryGroup(QObject):
             return None
         item = self._items.pop(index)
         item._index = -1
-        self._refresh_indexes()
-        self.changed.emit()
+        item._group = None
+        self._invalidate_indexes(index)
+        self._notify(self.itemsRemoved, index, index)
         return item
 
     def size(self):
@@ -533,7 +1215,9 @@ class LqRibbonGalleryGroup(QObject):
 
     def setSize(self, size):
         self._size = QSize(size)
-        self.changed.emit()
+        if not self._reset_depth:
+            self.modelReset.emit()
+            self.changed.emit()
 
 
 class LqRibbonGallery(QWidget):
@@ -541,6 +1225,7 @@ class LqRibbonGallery(QWidget):
     itemClicked = Signal(object)
     currentItemChanged = Signal(object, object)
     selectionChanged = Signal(int)
+    scrollRowChanged = Signal(int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -551,22 +1236,45 @@ class LqRibbonGallery(QWidget):
         self._selected_index = -1
         self._checked_index = -1
         self._popup_menu = None
+        self._popup = None
+        self._popup_row_count = QtnRibbonGalleryPopupRowCount
+        self._scroll_buttons = None
         self._buttons = []
+        self._button_pool = []
+        self._separator_pool = []
+        self._virtualized = False
+        self._visible_indices = None
+        self._scroll_row = 0
+        self._hover_index = -1
+        self._pressed_index = -1
+        self._thumbnail_cache = None
+        self._watched_thumbnail_cache = None
+        self._waiting_thumbnails = set()
         self._layout = QGridLayout(self)
         self._layout.setContentsMargins(2, 2, 2, 2)
         self._layout.setHorizontalSpacing(2)
         self._layout.setVerticalSpacing(2)
         self.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
 
+    def _group_connections(self):
+        return (
+            (self._group.itemsInserted, self._items_inserted),
+            (self._group.itemsRemoved, self._items_removed),
+            (self._group.itemChanged, self._item_changed),
+            (self._group.modelReset, self.updateLayout),
+        )
+
     def setGalleryGroup(self, group):
         if self._group is not None:
-            try:
-                self._group.changed.disconnect(self.updateLayout)
-            except RuntimeError:
-                pass
+            for signal, slot in self._group_connections():
+                try:
+                    signal.disconnect(slot)
+                except RuntimeError:
+                    pass
         self._group = group
         if self._group is not None:
-            self._group.changed.connect(self.updateLayout)
+            for signal, slot in self._group_connections():
+                signal.connect(slot)
         self.updateLayout()
 
     def galleryGroup(self):
@@ -589,6 +1297,93 @@ class LqRibbonGallery(QWidget):
     def popupMenu(self):
         return self._popup_menu
 
+    def setPopupRowCount(self, count):
+        self._popup_row_count = max(1, int(count))
+
+    def popupRowCount(self):
+        return self._popup_row_count
+
+    def popupGallery(self):
+        if self._popup is None:
+            self._popup = LqRibbonGalleryPopup(self)
+        return self._popup
+
+    def isPopupVisible(self):
+        return self._popup is not None and self._popup.isVisible()
+
+    def showPopup(self):
+        popup = self.popupGallery()
+        popup.sync()
+        popup.adjustSize()
+        popup.move(self.mapToGlobal(QPoint(0, 0)))
+        popup.show()
+        popup.gallery.setFocus()
+
+    def hidePopup(self):
+        if self._popup is not None:
+            self._popup.hide()
+
+    def setScrollButtonsVisible(self, visible):
+        visible = bool(visible)
+        if visible == self.isScrollButtonsVisible():
+            return
+        if self._scroll_buttons is None:
+            self._scroll_buttons = []
+            for name, slot in (
+                ("lqRibbonGalleryScrollUp", self.scrollUp),
+                ("lqRibbonGalleryScrollDown", self.scrollDown),
+                ("lqRibbonGalleryExpand", self.showPopup),
+            ):
+                button = QToolButton(self)
+                button.setObjectName(name)
+                button.setAutoRaise(True)
+                button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+                button.clicked.connect(slot)
+                self._scroll_buttons.append(button)
+            self._scroll_buttons[0].setArrowType(Qt.ArrowType.UpArrow)
+            self._scroll_buttons[1].setArrowType(Qt.ArrowType.DownArrow)
+            self._scroll_buttons[2].setIcon(
+                self.style().standardIcon(QStyle.StandardPixmap.SP_ToolBarVerticalExtensionButton)
+            )
+        for button in self._scroll_buttons:
+            button.setVisible(visible)
+        right = 2 + (QtnRibbonGalleryScrollButtonWidth if visible else 0)
+        self._layout.setContentsMargins(2, 2, right, 2)
+        self._position_scroll_buttons()
+        self._update_scroll_buttons()
+        self.updateGeometry()
+
+    def isScrollButtonsVisible(self):
+        return self._scroll_buttons is not None and not self._scroll_buttons[0].isHidden()
+
+    def _position_scroll_buttons(self):
+        if not self.isScrollButtonsVisible():
+            return
+        width = QtnRibbonGalleryScrollButtonWidth
+        height = self.height() // 3
+        for position, button in enumerate(self._scroll_buttons):
+            top = position * height
+            bottom = self.height() if position == 2 else top + height
+            button.setGeometry(self.width() - width, top, width, bottom - top)
+
+    def _update_scroll_buttons(self):
+        if self._scroll_buttons is None:
+            return
+        up, down, expand = self._scroll_buttons
+        up.setEnabled(self._scroll_row > 0)
+        down.setEnabled(self._scroll_row < self.maxScrollRow())
+        expand.setEnabled(self._group is not None)
+
+    def scrollUp(self):
+        self.setScrollRow(self._scroll_row - 1)
+
+    def scrollDown(self):
+        self.setScrollRow(self._scroll_row + 1)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._position_scroll_buttons()
+
     def setColumnCount(self, count):
         self._column_count = max(1, int(count))
         self.updateLayout()
@@ -612,6 +1407,8 @@ class LqRibbonGallery(QWidget):
     def setSelectedItem(self, index):
         previous = self.item(self._selected_index)
         self._selected_index = index if self.item(index) is not None else -1
+        if self._virtualized:
+            self.update()
         self.selectionChanged.emit(self._selected_index)
         self.currentItemChanged.emit(self.item(self._selected_index), previous)
 
@@ -620,8 +1417,10 @@ class LqRibbonGallery(QWidget):
 
     def setCheckedIndex(self, index):
         self._checked_index = index if self.item(index) is not None else -1
-        for item_index, button in enumerate(self._buttons):
-            button.setChecked(item_index == self._checked_index)
+        if self._virtualized:
+            self.update()
+        for button in self._buttons:
+            button.setChecked(button.property("lqGalleryItemIndex") == self._checked_index)
 
     def checkedIndex(self):
         return self._checked_index
@@ -636,57 +1435,325 @@ class LqRibbonGallery(QWidget):
         return self._selected_index >= 0
 
     def ensureVisible(self, index):
+        cell = self._visible_cell(index)
+        if cell >= 0:
+            row = cell // self._column_count
+            if row < self._scroll_row:
+                self.setScrollRow(row)
+            elif row >= self._scroll_row + self._row_count:
+                self.setScrollRow(row - self._row_count + 1)
         self.setSelectedItem(index)
 
     def hideSelection(self):
         self._selected_index = -1
+        if self._virtualized:
+            self.update()
         self.selectionChanged.emit(-1)
 
-    def updateLayout(self):
+    def thumbnailCache(self):
+        return self._thumbnail_cache or LqRibbonThumbnailCache.instance()
+
+    def setThumbnailCache(self, cache):
+        self._thumbnail_cache = cache
+        self._waiting_thumbnails.clear()
+        self.updateLayout()
+
+    def _thumbnail_rect(self, rect, text_under_icon):
+        if text_under_icon:
+            return rect.adjusted(4, 4, -4, -20)
+        side = max(1, rect.height() - 4)
+        return QRect(rect.left() + 2, rect.top() + 2, side, side)
+
+    def _thumbnail_image(self, source, size):
+        cache = self.thumbnailCache()
+        if self._watched_thumbnail_cache is not cache:
+            if self._watched_thumbnail_cache is not None:
+                try:
+                    self._watched_thumbnail_cache.thumbnailReady.disconnect(self._thumbnail_ready)
+                except RuntimeError:
+                    pass
+            cache.thumbnailReady.connect(self._thumbnail_ready)
+            self._watched_thumbnail_cache = cache
+        ratio = self.devicePixelRatioF()
+        pixel_size = QSize(
+            max(1, round(size.width() * ratio)), max(1, round(size.height() * ratio))
+        )
+        image = cache.thumbnail(source, pixel_size)
+        if image is None:
+            self._waiting_thumbnails.add(cache.cacheKey(source, pixel_size))
+        return image
+
+    def _thumbnail_icon(self, source, size):
+        image = self._thumbnail_image(source, size)
+        if image is None or image.isNull():
+            return QIcon()
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        return QIcon(pixmap)
+
+    def _thumbnail_ready(self, key):
+        if key not in self._waiting_thumbnails:
+            return
+        self._waiting_thumbnails.discard(key)
+        if self._virtualized:
+            self.update()
+            return
+        for button in self._buttons:
+            item = self.item(button.property("lqGalleryItemIndex"))
+            if item is not None and item.thumbnailSource() == key[0]:
+                button.setIcon(self._thumbnail_icon(item.thumbnailSource(), button.iconSize()))
+
+    def isVirtualized(self):
+        return self._virtualized
+
+    def setVirtualized(self, enabled):
+        """Paint visible cells directly instead of creating a button per item."""
+        enabled = bool(enabled)
+        if self._virtualized == enabled:
+            return
+        self._virtualized = enabled
+        self._hover_index = self._pressed_index = -1
+        self.setMouseTracking(enabled)
+        self.updateLayout()
+
+    def _visible_item_indices(self):
+        if self._visible_indices is None:
+            self._visible_indices = []
+            if self._group is not None:
+                self._visible_indices = [
+                    index
+                    for index, item in enumerate(self._group._items)
+                    if item.isVisible()
+                ]
+        return self._visible_indices
+
+    def _visible_cell(self, index):
+        visible = self._visible_item_indices()
+        cell = bisect.bisect_left(visible, index)
+        return cell if cell < len(visible) and visible[cell] == index else -1
+
+    def totalRowCount(self):
+        count = len(self._visible_item_indices())
+        return (count + self._column_count - 1) // self._column_count
+
+    def maxScrollRow(self):
+        return max(0, self.totalRowCount() - self._row_count)
+
+    def scrollRow(self):
+        return self._scroll_row
+
+    def setScrollRow(self, row):
+        row = max(0, min(int(row), self.maxScrollRow()))
+        if row == self._scroll_row:
+            return
+        self._scroll_row = row
+        self._hover_index = -1
+        if self._virtualized:
+            self._update_scroll_buttons()
+            self.update()
+        else:
+            self.updateLayout()
+        self.scrollRowChanged.emit(row)
+
+    def _cell_rect(self, cell):
+        size = self.itemSize()
+        row = cell // self._column_count - self._scroll_row
+        column = cell % self._column_count
+        return QRect(
+            2 + column * (size.width() + 2),
+            2 + row * (size.height() + 2),
+            size.width(),
+            size.height(),
+        )
+
+    def visualRect(self, index):
+        cell = self._visible_cell(index)
+        row = cell // self._column_count - self._scroll_row if cell >= 0 else -1
+        if not 0 <= row < self._row_count:
+            return QRect()
+        return self._cell_rect(cell)
+
+    def itemAt(self, pos):
+        size = self.itemSize()
+        x = pos.x() - 2
+        y = pos.y() - 2
+        if x < 0 or y < 0:
+            return -1
+        column, column_offset = divmod(x, size.width() + 2)
+        row, row_offset = divmod(y, size.height() + 2)
+        if (
+            column >= self._column_count
+            or row >= self._row_count
+            or column_offset >= size.width()
+            or row_offset >= size.height()
+        ):
+            return -1
+        visible = self._visible_item_indices()
+        cell = (self._scroll_row + row) * self._column_count + column
+        return visible[cell] if cell < len(visible) else -1
+
+    def _displayed_cells(self):
+        first = self._scroll_row * self._column_count
+        return first, first + self._row_count * self._column_count
+
+    def _refresh_if_displayed(self, cell):
+        first, last = self._displayed_cells()
+        if cell >= last:
+            return
+        if self._virtualized:
+            self.update()
+        else:
+            self.updateLayout()
+
+    def _items_inserted(self, first, last):
+        if self._visible_indices is None:
+            self.updateLayout()
+            return
+        visible = self._visible_indices
+        count = last - first + 1
+        position = bisect.bisect_left(visible, first)
+        inserted = [
+            index for index in range(first, last + 1)
+            if self._group._items[index].isVisible()
+        ]
+        visible[position:] = inserted + [index + count for index in visible[position:]]
+        if self._selected_index >= first:
+            self._selected_index += count
+        if self._checked_index >= first:
+            self._checked_index += count
+        self._hover_index = self._pressed_index = -1
+        if inserted:
+            self._refresh_if_displayed(position)
+
+    def _items_removed(self, first, last):
+        if self._visible_indices is None:
+            self.updateLayout()
+            return
+        visible = self._visible_indices
+        count = last - first + 1
+        start = bisect.bisect_left(visible, first)
+        end = bisect.bisect_right(visible, last)
+        visible[start:] = [index - count for index in visible[end:]]
+        self._selected_index = self._shifted_index(self._selected_index, first, count)
+        self._checked_index = self._shifted_index(self._checked_index, first, count)
+        self._hover_index = self._pressed_index = -1
+        if start != end:
+            self._scroll_row = min(self._scroll_row, self.maxScrollRow())
+            self._refresh_if_displayed(start)
+
+    @staticmethod
+    def _shifted_index(index, first, count):
+        if index < first:
+            return index
+        return index - count if index >= first + count else -1
+
+    def _item_changed(self, index):
+        if self._visible_indices is None:
+            self.updateLayout()
+            return
+        visible = self._visible_indices
+        cell = bisect.bisect_left(visible, index)
+        listed = cell < len(visible) and visible[cell] == index
+        shown = self._group._items[index].isVisible()
+        if listed and not shown:
+            del visible[cell]
+        elif shown and not listed:
+            visible.insert(cell, index)
+        elif not shown:
+            return
+        self._scroll_row = min(self._scroll_row, self.maxScrollRow())
+        self._refresh_if_displayed(cell)
+
+    def _clear_buttons(self):
+        self._detach_cells()
+        for widget in self._button_pool + self._separator_pool:
+            widget.deleteLater()
+        self._button_pool.clear()
+        self._separator_pool.clear()
+
+    def _detach_cells(self):
         while self._layout.count():
-            child = self._layout.takeAt(0)
-            widget = child.widget()
-            if widget:
-                widget.deleteLater()
+            self._layout.takeAt(0)
+        for widget in self._button_pool + self._separator_pool:
+            widget.hide()
         self._buttons.clear()
+
+    def _pooled_separator(self, used):
+        if used < len(self._separator_pool):
+            return self._separator_pool[used]
+        separator = QFrame(self)
+        separator.setFrameShape(QFrame.Shape.HLine)
+        self._separator_pool.append(separator)
+        return separator
+
+    def _pooled_button(self, used):
+        if used < len(self._button_pool):
+            return self._button_pool[used]
+        button = QToolButton(self)
+        button.setCheckable(True)
+        button.clicked.connect(self._button_clicked)
+        self._button_pool.append(button)
+        return button
+
+    def _button_clicked(self):
+        self._activate_item(self.sender().property("lqGalleryItemIndex"))
+
+    def updateLayout(self):
+        self._visible_indices = None
+        row = min(self._scroll_row, self.maxScrollRow())
+        if row != self._scroll_row:
+            self._scroll_row = row
+            self.scrollRowChanged.emit(row)
+        self._update_scroll_buttons()
+        if self._virtualized:
+            self._clear_buttons()
+            self.updateGeometry()
+            self.update()
+            return
+        self._detach_cells()
         if self._group is None:
             return
 
-        visible_index = 0
         item_size = self.itemSize()
-        for item_index in range(self._group.itemCount()):
+        visible = self._visible_item_indices()
+        first, last = self._displayed_cells()
+        separators = 0
+        for cell in range(first, min(last, len(visible))):
+            item_index = visible[cell]
             item = self._group.item(item_index)
-            if item is None or not item.isVisible():
-                continue
-            row = visible_index // self._column_count
-            column = visible_index % self._column_count
-            if row >= self._row_count:
-                break
+            row = cell // self._column_count - self._scroll_row
+            column = cell % self._column_count
             if item.isSeparator():
-                separator = QFrame(self)
-                separator.setFrameShape(QFrame.Shape.HLine)
+                separator = self._pooled_separator(separators)
+                separators += 1
                 self._layout.addWidget(separator, row, column)
-                visible_index += 1
+                separator.show()
                 continue
-            button = QToolButton(self)
+            button = self._pooled_button(len(self._buttons))
             button.setText(item.caption())
-            button.setIcon(item.icon())
+            icon_size = QSize(16, 16)
+            if item.thumbnailSource() is not None:
+                icon_size = self._thumbnail_rect(
+                    QRect(QPoint(), item_size), item_size.height() >= 40
+                ).size()
+                button.setIcon(self._thumbnail_icon(item.thumbnailSource(), icon_size))
+            else:
+                button.setIcon(item.icon())
             button.setToolTip(item.toolTip())
             button.setStatusTip(item.statusTip())
             button.setEnabled(item.isEnabled())
-            button.setCheckable(True)
             button.setChecked(item_index == self._checked_index)
             button.setToolButtonStyle(
                 Qt.ToolButtonStyle.ToolButtonTextUnderIcon
                 if item_size.height() >= 40
                 else Qt.ToolButtonStyle.ToolButtonTextBesideIcon
             )
-            button.setIconSize(QSize(16, 16))
+            button.setIconSize(icon_size)
             button.setFixedSize(item_size)
-            button.clicked.connect(lambda checked=False, idx=item_index: self._activate_item(idx))
+            button.setProperty("lqGalleryItemIndex", item_index)
             self._layout.addWidget(button, row, column)
+            button.show()
             self._buttons.append(button)
-            visible_index += 1
         self.updateGeometry()
 
     def bestFit(self):
@@ -695,12 +1762,146 @@ class LqRibbonGallery(QWidget):
     def sizeHint(self):
         item_size = self.itemSize()
         width = self._column_count * item_size.width() + 6
+        if self.isScrollButtonsVisible():
+            width += QtnRibbonGalleryScrollButtonWidth
         height = self._row_count * item_size.height() + 6
         return QSize(width, height)
 
     def minimumSizeHint(self):
         return self.sizeHint()
 
+    def paintEvent(self, event):
+        if not self._virtualized:
+            super().paintEvent(event)
+            return
+        visible = self._visible_item_indices()
+        first = self._scroll_row * self._column_count
+        last = min(len(visible), first + self._row_count * self._column_count)
+        text_under_icon = self.itemSize().height() >= 40
+        painter = QPainter(self)
+        for cell in range(first, last):
+            rect = self._cell_rect(cell)
+            if rect.intersects(event.rect()):
+                self._paint_cell(painter, rect, visible[cell], text_under_icon)
+        painter.end()
+
+    def _paint_cell(self, painter, rect, index, text_under_icon):
+        item = self._group.item(index)
+        palette = self.palette()
+        if item.isSeparator():
+            painter.setPen(palette.color(QPalette.ColorRole.Mid))
+            painter.drawLine(rect.left(), rect.center().y(), rect.right(), rect.center().y())
+            return
+        if index in (self._checked_index, self._pressed_index):
+            painter.fillRect(rect, palette.color(QPalette.ColorRole.Highlight).lighter(160))
+            painter.setPen(palette.color(QPalette.ColorRole.Highlight))
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        elif index in (self._hover_index, self._selected_index) and item.isEnabled():
+            painter.fillRect(rect, palette.color(QPalette.ColorRole.Midlight))
+
+        mode = QIcon.Mode.Normal if item.isEnabled() else QIcon.Mode.Disabled
+        thumbnail = item.thumbnailSource()
+        if thumbnail is not None:
+            icon_rect = self._thumbnail_rect(rect, text_under_icon)
+        elif text_under_icon:
+            icon_rect = QRect(rect.center().x() - 8, rect.top() + 4, 16, 16)
+        else:
+            icon_rect = QRect(rect.left() + 4, rect.center().y() - 8, 16, 16)
+        if text_under_icon:
+            text_rect = rect.adjusted(2, icon_rect.bottom() - rect.top() + 3, -2, -2)
+            alignment = Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop
+        else:
+            text_rect = rect.adjusted(icon_rect.right() - rect.left() + 5, 0, -2, 0)
+            alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        if item._sprite is not None and item._icon is None:
+            painter.save()
+            if not item.isEnabled():
+                painter.setOpacity(0.4)
+            item._sprite[0].paint(painter, icon_rect, item._sprite[1])
+            painter.restore()
+        elif thumbnail is None:
+            item.icon().paint(painter, icon_rect, Qt.AlignmentFlag.AlignCenter, mode)
+        else:
+            self._paint_thumbnail(painter, icon_rect, thumbnail)
+        painter.setPen(
+            palette.color(
+                QPalette.ColorGroup.Normal if item.isEnabled() else QPalette.ColorGroup.Disabled,
+                QPalette.ColorRole.ButtonText,
+            )
+        )
+        caption = self.fontMetrics().elidedText(
+            item.caption(), Qt.TextElideMode.ElideRight, text_rect.width()
+        )
+        painter.drawText(text_rect, int(alignment), caption)
+
+    def _paint_thumbnail(self, painter, rect, source):
+        image = self._thumbnail_image(source, rect.size())
+        if image is None or image.isNull():
+            painter.fillRect(rect, self.palette().color(QPalette.ColorRole.Midlight))
+            return
+        ratio = self.devicePixelRatioF()
+        target = QRect(0, 0, round(image.width() / ratio), round(image.height() / ratio))
+        target.moveCenter(rect.center())
+        painter.drawImage(target, image)
+
+    def _set_hover_index(self, index):
+        if index != self._hover_index:
+            self._hover_index = index
+            self.update()
+
+    def mousePressEvent(self, event):
+        if self._virtualized and event.button() == Qt.MouseButton.LeftButton:
+            index = self.itemAt(event.position().toPoint())
+            item = self.item(index)
+            if item is not None and item.isEnabled() and not item.isSeparator():
+                self._pressed_index = index
+                self.update(self.visualRect(index))
+                event.accept()
+                return
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._virtualized and self._pressed_index >= 0:
+            index, self._pressed_index = self._pressed_index, -1
+            self.update(self.visualRect(index))
+            if self.itemAt(event.position().toPoint()) == index:
+                self._activate_item(index)
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._virtualized:
+            self._set_hover_index(self.itemAt(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        if self._virtualized:
+            self._set_hover_index(-1)
+        super().leaveEvent(event)
+
+    def wheelEvent(self, event):
+        step = -1 if event.angleDelta().y() > 0 else 1
+        row = self._scroll_row
+        self.setScrollRow(row + step)
+        if self._scroll_row != row:
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def event(self, event):
+        if self._virtualized and event.type() == QEvent.Type.ToolTip:
+            item = self.item(self.itemAt(event.pos()))
+            if item is not None and item.toolTip():
+                QToolTip.showText(
+                    event.globalPos(), item.toolTip(), self, self.visualRect(item.getIndex())
+                )
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
     def _activate_item(self, index):
         item = self.item(index)
         if item is None:
@@ -721,6 +1922,11 @@ class LqRibbonGallery(QWidget):
             next_index -= self._column_count
         elif key == Qt.Key.Key_Down:
             next_index += self._column_count
+        elif key in (Qt.Key.Key_PageUp, Qt.Key.Key_PageDown):
+            step = -self._row_count if key == Qt.Key.Key_PageUp else self._row_count
+            self.setScrollRow(self._scroll_row + step)
+            event.accept()
+            return
         elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Space):
             if self.item(self._selected_index) is not None:
                 self._activate_item(self._selected_index)
@@ -730,10 +1936,104 @@ class LqRibbonGallery(QWidget):
             super().keyPressEvent(event)
             return
         if self.itemCount():
-            self.setSelectedItem(max(0, min(next_index, self.itemCount() - 1)))
+            self.ensureVisible(max(0, min(next_index, self.itemCount() - 1)))
         event.accept()
 
 
+class LqRibbonGalleryPopup(QFrame):
+    """Expanded view of a gallery, painting the owner's group with a virtualized gallery."""
+
+    def __init__(self, owner):
+        super().__init__(owner, Qt.WindowType.Popup)
+        self.setObjectName("lqRibbonGalleryPopup")
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        self._owner = owner
+        self._menu_actions = None
+        self.gallery = LqRibbonGallery(self)
+        self.gallery.setVirtualized(True)
+        self.scroll_bar = QScrollBar(Qt.Orientation.Vertical, self)
+        self._actions_layout = QVBoxLayout()
+        self._actions_layout.setContentsMargins(0, 0, 0, 0)
+        self._actions_layout.setSpacing(0)
+
+        body = QHBoxLayout()
+        body.setContentsMargins(0, 0, 0, 0)
+        body.setSpacing(0)
+        body.addWidget(self.gallery)
+        body.addWidget(self.scroll_bar)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(1, 1, 1, 1)
+        layout.setSpacing(0)
+        layout.addLayout(body)
+        layout.addLayout(self._actions_layout)
+
+        self.scroll_bar.valueChanged.connect(self.gallery.setScrollRow)
+        self.gallery.scrollRowChanged.connect(self._gallery_scrolled)
+        self.gallery.itemClicked.connect(self._item_clicked)
+
+    def owner(self):
+        return self._owner
+
+    def sync(self):
+        owner = self._owner
+        gallery = self.gallery
+        if gallery._thumbnail_cache is not owner._thumbnail_cache:
+            gallery.setThumbnailCache(owner._thumbnail_cache)
+        if gallery.columnCount() != owner.columnCount():
+            gallery.setColumnCount(owner.columnCount())
+        if gallery.rowCount() != owner.popupRowCount():
+            gallery.setRowCount(owner.popupRowCount())
+        if gallery.galleryGroup() is not owner.galleryGroup():
+            gallery.setGalleryGroup(owner.galleryGroup())
+        gallery.setCheckedIndex(owner.checkedIndex())
+        gallery.setScrollRow(owner.scrollRow())
+        self._update_scroll_bar()
+        self._sync_menu_actions()
+
+    def _update_scroll_bar(self):
+        blocker = QSignalBlocker(self.scroll_bar)
+        self.scroll_bar.setRange(0, self.gallery.maxScrollRow())
+        self.scroll_bar.setPageStep(self.gallery.rowCount())
+        self.scroll_bar.setValue(self.gallery.scrollRow())
+        del blocker
+        self.scroll_bar.setVisible(self.gallery.maxScrollRow() > 0)
+
+    def _gallery_scrolled(self, row):
+        if self.scroll_bar.maximum() != self.gallery.maxScrollRow():
+            self._update_scroll_bar()
+        else:
+            self.scroll_bar.setValue(row)
+
+    def _sync_menu_actions(self):
+        menu = self._owner.popupMenu()
+        actions = tuple(menu.actions()) if menu is not None else ()
+        if actions == self._menu_actions:
+            return
+        self._menu_actions = actions
+        while self._actions_layout.count():
+            widget = self._actions_layout.takeAt(0).widget()
+            if widget:
+                widget.deleteLater()
+        for action in actions:
+            if action.isSeparator():
+                separator = QFrame(self)
+                separator.setFrameShape(QFrame.Shape.HLine)
+                self._actions_layout.addWidget(separator)
+                continue
+            button = QToolButton(self)
+            button.setDefaultAction(action)
+            button.setAutoRaise(True)
+            button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+            button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+            button.triggered.connect(self.hide)
+            self._actions_layout.addWidget(button)
+
+    def _item_clicked(self, item):
+        self.hide()
+        self._owner._activate_item(item.getIndex())
+        self._owner.ensureVisible(item.getIndex())
+
+
 class LqRibbonGalleryControl(LqRibbonWidgetControl):
     def __init__(self, parent=None, gallery=None):
         super().__init__(parent)
@@ -793,8 +2093,567 @@ class LqRibbonQuickAccessBar(QToolBar):
         return result
 
 
+class LqRibbonSearchProvider:
+    """Source of document or related-file results for the ribbon search popup.
+
+    ``search(query, limit)`` returns an iterable of result texts, an async
+    iterable, or a coroutine resolving to an iterable. Sync iterables may
+    yield ``None`` as a heartbeat so the popup can time-slice long scans.
+    ``limit`` is ``None`` when unbounded; the popup stops consuming once it
+    has enough results either way.
+    """
+
+    def search(self, query, limit):
+        return ()
+
+
+class LqRibbonListSearchProvider(LqRibbonSearchProvider):
+    """Substring search over an in-memory list of result texts."""
+
+    HEARTBEAT = 512
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._entries = None
+
+    def items(self):
+        return list(self._items)
+
+    def _normalized_entries(self):
+        if self._entries is None:
+            self._entries = tuple(
+                (str(item).strip(), str(item).replace("&", "").lower())
+                for item in self._items
+            )
+        return self._entries
+
+    def search(self, query, limit):
+        normalized = str(query).strip().lower()
+        if not normalized:
+            return
+        found = 0
+        for position, (text, normalized_text) in enumerate(self._normalized_entries(), 1):
+            if text and normalized in normalized_text:
+                yield text
+                found += 1
+                if limit and found >= limit:
+                    return
+            elif not position % self.HEARTBEAT:
+                yield None
+
+
+class LqRibbonSqliteSearchProvider(LqRibbonSearchProvider):
+    """Prefix search over a SQLite FTS5 table, best ``rank`` first."""
+
+    def __init__(self, database, table, column="title"):
+        self._database = database
+        self._table = str(table)
+        self._column = str(column)
+        self._connection = None
+
+    @staticmethod
+    def _quoted(text):
+        return '"' + str(text).replace('"', '""') + '"'
+
+    def connection(self):
+        if self._connection is None:
+            if isinstance(self._database, sqlite3.Connection):
+                self._connection = self._database
+            else:
+                self._connection = sqlite3.connect(self._database)
+        return self._connection
+
+    def search(self, query, limit):
+        terms = " ".join(f"{self._quoted(term)}*" for term in str(query).split())
+        if not terms:
+            return
+        table = self._quoted(self._table)
+        sql = (
+            f"SELECT {self._quoted(self._column)} FROM {table} "
+            f"WHERE {table} MATCH ? ORDER BY rank"
+        )
+        parameters = [terms]
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+        for row in self.connection().execute(sql, parameters):
+            yield str(row[0])
+
+
+_SEARCH_PROVIDER_WAITING = object()
+
+
+class _LqAsyncSearchWorker:
+    """One asyncio loop on a daemon thread that runs a search bar's async providers."""
+
+    def __init__(self):
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def submit(self, coroutine):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._run, args=(self._loop,), name="LqRibbonSearchWorker", daemon=True
+                ).start()
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    @staticmethod
+    def _run(loop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def stop(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+class _LqAsyncSearchStream:
+    """Runs an async provider result on the search worker loop and queues its items."""
+
+    DONE = object()
+
+    def __init__(self, source, limit, worker, notify=None):
+        self._source = source
+        self._limit = limit
+        self._notify = notify
+        self._queue = queue.SimpleQueue()
+        self._future = worker.submit(self._main())
+
+    async def _main(self):
+        try:
+            await self._consume()
+        except Exception as error:
+            self._queue.put(_LqSearchProviderError(error))
+        finally:
+            self._queue.put(self.DONE)
+            self._wake()
+
+    async def _consume(self):
+        source = self._source
+        if inspect.isawaitable(source):
+            source = await source
+        count = 0
+        if hasattr(source, "__aiter__"):
+            async for item in source:
+                self._put(item)
+                count += 1
+                if self._limit and count >= self._limit:
+                    break
+            return
+        for item in source or ():
+            self._put(item)
+            count += 1
+            if self._limit and count >= self._limit:
+                break
+
+    def _put(self, item):
+        self._queue.put(item)
+        self._wake()
+
+    def _wake(self):
+        if self._notify is not None:
+            try:
+                self._notify()
+            except RuntimeError:
+                # The search bar was deleted while the provider was still running.
+                self._notify = None
+
+    def get(self):
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def cancel(self):
+        self._notify = None
+        self._future.cancel()
+
+
+class _LqSearchProviderError:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _log_search_provider_error(provider, error=None):
+    _logger.error(
+        "Search provider %r failed", provider, exc_info=error if error is not None else True
+    )
+
+
+def _iter_search_provider(provider, query, limit, results, worker, notify=None):
+    """Append up to ``limit`` provider results to ``results``, yielding while busy.
+
+    Async providers run on ``worker``; while none of their results are queued this
+    yields ``_SEARCH_PROVIDER_WAITING`` and ``notify`` is called once more arrive.
+    Provider errors are logged and end that provider's results.
+    """
+    search = provider.search if hasattr(provider, "search") else provider
+    try:
+        source = search(query, limit or None)
+    except Exception:
+        _log_search_provider_error(provider)
+        return
+    if inspect.isawaitable(source) or hasattr(source, "__aiter__"):
+        stream = _LqAsyncSearchStream(source, limit, worker, notify)
+        try:
+            while True:
+                item = stream.get()
+                if item is _LqAsyncSearchStream.DONE:
+                    return
+                if item is None:
+                    yield _SEARCH_PROVIDER_WAITING
+                    continue
+                if isinstance(item, _LqSearchProviderError):
+                    _log_search_provider_error(provider, item.error)
+                    continue
+                if str(item).strip():
+                    results.append(str(item).strip())
+                    if limit and len(results) >= limit:
+                        return
+                yield
+        finally:
+            stream.cancel()
+    iterator = iter(source or ())
+    try:
+        while True:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except Exception:
+                _log_search_provider_error(provider)
+                return
+            if item is not None and str(item).strip():
+                results.append(str(item).strip())
+                if limit and len(results) >= limit:
+                    return
+            yield
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class _LqSearchIndexEntry:
+    __slots__ = ("order", "source", "terms", "keys")
+
+    def __init__(self, order, source, terms, keys):
+        self.order = order
+        self.source = source
+        self.terms = terms
+        self.keys = keys
+
+
+class LqRibbonSearchIndex(QObject):
+    """Incrementally maintained lookup tables for searchable ribbon actions."""
+
+    PREFIX_LENGTH = 8
+    SCORE_EXACT = 100
+    SCORE_PREFIX = 80
+    SCORE_TOKEN = 60
+    SCORE_ACRONYM = 40
+    SCORE_SUBSEQUENCE = 20
+    SCORE_TEXT_BONUS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = {}
+        self._next_order = 0
+        self._tables = {
+            "exact": {},
+            "token": {},
+            "prefix": {},
+            "acronym": {},
+            "char": {},
+            "pair": {},
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, action):
+        return action in self._entries
+
+    @staticmethod
+    def normalize(text):
+        return str(text).replace("&", "").strip().lower()
+
+    @staticmethod
+    def actionTerms(action):
+        keywords = action.data() or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        return [action.text()] + [str(keyword) for keyword in keywords]
+
+    @staticmethod
+    def tokenMatches(candidate_token, query_token):
+        if not candidate_token or not query_token:
+            return False
+        if candidate_token.startswith(query_token):
+            return True
+        query_index = 0
+        for character in candidate_token:
+            if character == query_token[query_index]:
+                query_index += 1
+                if query_index == len(query_token):
+                    return True
+        return False
+
+    @classmethod
+    def _match_term(cls, term, query, query_tokens):
+        normalized_term, term_tokens, acronym = term
+        if query in normalized_term:
+            return True
+        if not term_tokens or not query_tokens:
+            return False
+        term_index = 0
+        for query_token in query_tokens:
+            matched = False
+            while term_index < len(term_tokens):
+                if cls.tokenMatches(term_tokens[term_index], query_token):
+                    matched = True
+                    term_index += 1
+                    break
+                term_index += 1
+            if not matched:
+                return len(query_tokens) == 1 and cls.tokenMatches(acronym, query_token)
+        return True
+
+    @staticmethod
+    def _token_prefix_match(term_tokens, query_tokens):
+        term_index = 0
+        for query_token in query_tokens:
+            while term_index < len(term_tokens):
+                term_index += 1
+                if term_tokens[term_index - 1].startswith(query_token):
+                    break
+            else:
+                return False
+        return True
+
+    @classmethod
+    def _score_term(cls, term, query, query_tokens):
+        normalized_term, term_tokens, acronym = term
+        if normalized_term == query:
+            return cls.SCORE_EXACT
+        if normalized_term.startswith(query):
+            return cls.SCORE_PREFIX
+        if query_tokens and cls._token_prefix_match(term_tokens, query_tokens):
+            return cls.SCORE_TOKEN
+        if len(query_tokens) == 1 and acronym.startswith(query):
+            return cls.SCORE_ACRONYM
+        if cls._match_term(term, query, query_tokens):
+            return cls.SCORE_SUBSEQUENCE
+        return 0
+
+    @classmethod
+    def _prepare_term(cls, term):
+        normalized = cls.normalize(term)
+        tokens = tuple(normalized.split())
+        return normalized, tokens, "".join(token[0] for token in tokens)
+
+    @classmethod
+    def termMatches(cls, term, query):
+        query = cls.normalize(query)
+        if not query:
+            return False
+        return cls._match_term(cls._prepare_term(term), query, query.split())
+
+    def addAction(self, action):
+        if action in self._entries:
+            self.updateAction(action)
+            return
+        self._insert(action, self._next_order)
+        self._next_order += 1
+        action.changed.connect(self._action_changed)
+
+    def removeAction(self, action):
+        entry = self._entries.pop(action, None)
+        if entry is None:
+            return
+        self._drop_keys(action, entry.keys)
+        try:
+            action.changed.disconnect(self._action_changed)
+        except (RuntimeError, TypeError):
+            pass
+
+    def updateAction(self, action):
+        """Re-index ``action`` if its text or keywords changed."""
+        entry = self._entries.get(action)
+        if entry is None:
+            return False
+        source = tuple(self.actionTerms(action))
+        if source == entry.source:
+            return False
+        self._drop_keys(action, entry.keys)
+        self._insert(action, entry.order, source)
+        return True
+
+    def clear(self):
+        for action in list(self._entries):
+            self.removeAction(action)
+
+    def _action_changed(self):
+        action = self.sender()
+        if action is not None:
+            self.updateAction(action)
+
+    def _insert(self, action, order, source=None):
+        if source is None:
+            source = tuple(self.actionTerms(action))
+        terms = tuple(self._prepare_term(term) for term in source)
+        keys = set()
+        for normalized, tokens, acronym in terms:
+            keys.add(("exact", normalized))
+            keys.update(("char", character) for character in normalized if character != " ")
+            for token in tokens + (acronym,):
+                keys.update(("pair", pair) for pair in self._ordered_pairs(token))
+            for token in tokens:
+                keys.add(("token", token))
+                keys.update(
+                    ("prefix", token[:length])
+                    for length in range(1, min(len(token), self.PREFIX_LENGTH) + 1)
+                )
+            keys.update(
+                ("acronym", acronym[:length])
+                for length in range(1, min(len(acronym), self.PREFIX_LENGTH) + 1)
+            )
+        for table, key in keys:
+            self._tables[table].setdefault(key, set()).add(action)
+        self._entries[action] = _LqSearchIndexEntry(order, source, terms, keys)
+
+    @staticmethod
+    def _ordered_pairs(token):
+        pairs = set()
+        seen = ""
+        for character in token:
+            pairs.update(previous + character for previous in seen)
+            if character not in seen:
+                seen += character
+        return pairs
+
+    def _drop_keys(self, action, keys):
+        for table, key in keys:
+            bucket = self._tables[table].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(action)
+            if not bucket:
+                del self._tables[table][key]
+
+    def _ordered(self, actions):
+        return sorted(actions, key=lambda action: self._entries[action].order)
+
+    def exactMatches(self, text):
+        return self._ordered(self._tables["exact"].get(self.normalize(text), ()))
+
+    def _known_matches(self, query, query_tokens):
+        known = set(self._tables["exact"].get(query, ()))
+        if len(query_tokens) == 1:
+            known.update(self._tables["token"].get(query, ()))
+            if len(query) <= self.PREFIX_LENGTH:
+                known.update(self._tables["prefix"].get(query, ()))
+                known.update(self._tables["acronym"].get(query, ()))
+        return known
+
+    def _candidates(self, query_tokens):
+        # Every match is an ordered subsequence inside one token (or the
+        # acronym), so each adjacent query pair must be indexed for the action.
+        keys = set()
+        for token in query_tokens:
+            if len(token) == 1:
+                keys.add(("char", token))
+            keys.update(("pair", token[i:i + 2]) for i in range(len(token) - 1))
+        buckets = []
+        for table, key in keys:
+            bucket = self._tables[table].get(key)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        if not buckets:
+            return set()
+        buckets.sort(key=len)
+        return set(buckets[0]).intersection(*buckets[1:])
+
+    def _iter_matches(self, text):
+        query = self.normalize(text)
+        if not query:
+            return
+        query_tokens = query.split()
+        known = self._known_matches(query, query_tokens)
+        for action in self._ordered(self._candidates(query_tokens) | known):
+            if action in known or any(
+                self._match_term(term, query, query_tokens)
+                for term in self._entries[action].terms
+            ):
+                yield action
+
+    def matches(self, text):
+        """Return the indexed actions matching ``text`` in registration order."""
+        return list(self._iter_matches(text))
+
+    def firstMatch(self, text):
+        exact = self.exactMatches(text)
+        if exact:
+            return exact[0]
+        return next(self._iter_matches(text), None)
+
+    def search(self, text, limit=None, boosts=None, accept=None):
+        """Return up to ``limit`` ``(action, score)`` pairs, best first.
+
+        Scores rank exact > prefix > token > acronym > subsequence matches;
+        ``boosts`` maps actions to extra score and ``accept`` filters actions.
+        """
+        query = self.normalize(text)
+        if not query or (limit is not None and limit <= 0):
+            return []
+        query_tokens = query.split()
+        boosts = boosts or {}
+        heap = []
+        for action in self._candidates(query_tokens) | self._known_matches(query, query_tokens):
+            if accept is not None and not accept(action):
+                continue
+            entry = self._entries[action]
+            score = 0
+            for term_index, term in enumerate(entry.terms):
+                term_score = self._score_term(term, query, query_tokens)
+                if term_score and term_index == 0:
+                    term_score += self.SCORE_TEXT_BONUS
+                score = max(score, term_score)
+            if not score:
+                continue
+            # Ties keep registration order; orders are unique so actions
+            # themselves are never compared.
+            item = (score + boosts.get(action, 0), -entry.order, action)
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        ranked = []
+        while heap:
+            score, _order, action = heapq.heappop(heap)
+            ranked.append((action, score))
+        ranked.reverse()
+        return ranked
+
+
 class LqRibbonSearchBar(QLineEdit):
     show_help = Signal(str)
+    _providerResultsReady = Signal()
 
     def __init__(self, ribbon_bar=None):
         super().__init__(ribbon_bar)
@@ -806,6 +2665,20 @@ class LqRibbonSearchBar(QLineEdit):
         self._popup = QMenu(self)
         self._popup.setObjectName("lqRibbonSearchPopupMenu")
         self._popup_query = ""
+        self._popup_rows = []
+        self._popup_icons = {}
+        self._popup_job = None
+        self._pending_popup_query = ""
+        self._popup_debounce_interval = 120
+        self._popup_slice_interval = 8
+        self._popup_timer = QTimer(self)
+        self._popup_timer.setSingleShot(True)
+        self._popup_timer.timeout.connect(self._start_popup_job)
+        self._search_worker = _LqAsyncSearchWorker()
+        self.destroyed.connect(self._search_worker.stop)
+        self._providerResultsReady.connect(
+            self._continue_popup_job, Qt.ConnectionType.QueuedConnection
+        )
         self._popup_keyboard_active = False
         self._suppress_next_focus_popup = False
         self._icon = self.style().standardIcon(
@@ -875,9 +2748,23 @@ class LqRibbonSearchBar(QLineEdit):
             if action and action.isVisible() and action.text().strip()
         ]
         if normalized:
-            return [
+            if not self.ribbon_bar or not hasattr(self.ribbon_bar, "rankedSearchActions"):
+                return [
+                    action for action in actions
+                    if self._action_matches_text(action, normalized)
+                ]
+            candidates = set(actions)
+            ranked = [
+                action for action, _score in self.ribbon_bar.rankedSearchActions(
+                    normalized,
+                    self._max_search_item_count or None,
+                    candidates.__contains__,
+                )
+            ]
+            index = self.ribbon_bar.searchIndex()
+            return ranked + [
                 action for action in actions
-                if self._action_matches_text(action, normalized)
+                if action not in index and self._action_matches_text(action, normalized)
             ]
 
         ordered = []
@@ -905,41 +2792,38 @@ class LqRibbonSearchBar(QLineEdit):
                     break
         return ordered
 
-    def _matched_document_results(self, normalized):
-        if (
-            not normalized
-            or not self.ribbon_bar
-            or not hasattr(self.ribbon_bar, "searchDocumentResults")
-        ):
-            return []
-        results = []
-        for result in self.ribbon_bar.searchDocumentResults():
-            text = str(result).strip()
-            if text and normalized in text.replace("&", "").lower():
-                results.append(text)
-            if self._max_search_item_count and len(results) >= max(
-                1, self._max_search_item_count // 2
-            ):
-                break
-        return results
+    def popupDebounceInterval(self):
+        return self._popup_debounce_interval
 
-    def _matched_related_files(self, normalized):
-        if (
-            not normalized
-            or not self.ribbon_bar
-            or not hasattr(self.ribbon_bar, "searchRelatedFiles")
-        ):
-            return []
-        results = []
-        for result in self.ribbon_bar.searchRelatedFiles():
-            text = str(result).strip()
-            if text and normalized in text.replace("&", "").lower():
-                results.append(text)
-            if self._max_search_item_count and len(results) >= max(
-                1, self._max_search_item_count // 2
-            ):
-                break
-        return results
+    def setPopupDebounceInterval(self, msec):
+        self._popup_debounce_interval = max(0, int(msec))
+
+    def popupSliceInterval(self):
+        return self._popup_slice_interval
+
+    def setPopupSliceInterval(self, msec):
+        self._popup_slice_interval = max(1, int(msec))
+
+    def _result_provider(self, kind):
+        if not self.ribbon_bar:
+            return None
+        if hasattr(self.ribbon_bar, "_search_result_provider"):
+            return self.ribbon_bar._search_result_provider(kind)
+        getter = "searchDocumentResults" if kind == "document" else "searchRelatedFiles"
+        if not hasattr(self.ribbon_bar, getter):
+            return None
+        return LqRibbonListSearchProvider(getattr(self.ribbon_bar, getter)())
+
+    def _iter_matched_results(self, kind, normalized, results):
+        """Append matching result texts to ``results``, yielding between chunks."""
+        provider = self._result_provider(kind) if normalized else None
+        if provider is None:
+            return
+        limit = max(1, self._max_search_item_count // 2) if self._max_search_item_count else 0
+        yield from _iter_search_provider(
+            provider, normalized, limit, results, self._search_worker,
+            self._providerResultsReady.emit,
+        )
 
     def _selectable_popup_actions(self):
         return [
@@ -1019,16 +2903,35 @@ class LqRibbonSearchBar(QLineEdit):
         self._focus_without_popup()
         return True
 
-    def showPopup(self, text=""):
-        text = str(text)
-        self._popup_query = text
-        self._popup_keyboard_active = False
-        self._popup.clear()
+    def _popup_row_specs(self, text):
+        """Build the popup rows for ``text``.
+
+        First yields the rows known before any provider runs, then ``None`` while
+        providers are busy (``_SEARCH_PROVIDER_WAITING`` while only async results
+        are pending) and a partial row list whenever new results have arrived;
+        returns the final rows.
+        """
         normalized = text.strip().lower()
-        count = 0
+        actions = self._popup_action_rows(normalized)
+        document_results = []
+        related_files = []
+        yield self._compose_popup_rows(text, normalized, actions, document_results, related_files)
+        for kind, results in (("document", document_results), ("related", related_files)):
+            reported = 0
+            for chunk in self._iter_matched_results(kind, normalized, results):
+                if len(results) == reported:
+                    yield chunk
+                    continue
+                reported = len(results)
+                yield self._compose_popup_rows(
+                    text, normalized, actions, document_results, related_files
+                )
+        return self._compose_popup_rows(
+            text, normalized, actions, document_results, related_files
+        )
+
+    def _popup_action_rows(self, normalized):
         actions = self._ordered_popup_actions(normalized)
-        document_results = self._matched_document_results(normalized)
-        related_files = self._matched_related_files(normalized)
         if not normalized and self.ribbon_bar and hasattr(self.ribbon_bar, "recentSearchActions"):
             recent_actions = [
                 action for action in self.ribbon_bar.recentSearchActions()
@@ -1044,7 +2947,7 @@ class LqRibbonSearchBar(QLineEdit):
             ]
             grouped_actions = []
             if recent_actions:
-                self._popup.addSection(QtnRibbonSearchBarRecentActionsString)
+                grouped_actions.append(QtnRibbonSearchBarRecentActionsString)
                 grouped_actions.extend(recent_actions)
             if suggested_actions:
                 grouped_actions.append(QtnRibbonSearchBarSuggestedActionsString)
@@ -1061,65 +2964,191 @@ class LqRibbonSearchBar(QLineEdit):
             and not any(isinstance(action, str) for action in actions)
         ):
             actions = [QtnRibbonSearchBarActionsString] + actions
+        return actions
 
-        if document_results:
-            self._popup.addSection(QtnRibbonSearchBarDocumentResultsString)
-            document_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
-            for result in document_results:
-                if self._max_search_item_count and count >= self._max_search_item_count:
-                    break
-                result_action = self._popup.addAction(document_icon, result)
-                result_action.setProperty("lqRibbonSearchPopupRole", "result")
-                result_action.triggered.connect(
-                    lambda _checked=False, value=result: (
-                        self.ribbon_bar.searchSuggestionActivated.emit(value)
-                    )
-                )
-                count += 1
-
-        if related_files:
-            self._popup.addSection(QtnRibbonSearchBarRelatedFilesString)
-            file_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
-            for result in related_files:
+    def _compose_popup_rows(self, text, normalized, actions, document_results, related_files):
+        count = 0
+        rows = []
+        for title, results in (
+            (QtnRibbonSearchBarDocumentResultsString, document_results),
+            (QtnRibbonSearchBarRelatedFilesString, related_files),
+        ):
+            if not results:
+                continue
+            rows.append(("section", title))
+            for result in results:
                 if self._max_search_item_count and count >= self._max_search_item_count:
                     break
-                result_action = self._popup.addAction(file_icon, result)
-                result_action.setProperty("lqRibbonSearchPopupRole", "result")
-                result_action.triggered.connect(
-                    lambda _checked=False, value=result: (
-                        self.ribbon_bar.searchSuggestionActivated.emit(value)
-                    )
-                )
+                rows.append(("result", result))
                 count += 1
 
         for action in actions:
             if isinstance(action, str):
-                self._popup.addSection(action)
+                rows.append(("section", action))
                 continue
             if self._max_search_item_count and count >= self._max_search_item_count:
                 break
-            self._popup.addAction(action)
-            action.setProperty("lqRibbonSearchPopupRole", "action")
+            rows.append(("action", action))
             count += 1
         if normalized and not actions and not document_results and not related_files:
-            self._popup.addSection(QtnRibbonSearchBarNoResultsString)
-            no_result_icon = self.style().standardIcon(
-                QStyle.StandardPixmap.SP_MessageBoxInformation
+            rows.append(("section", QtnRibbonSearchBarNoResultsString))
+            rows.append(("no-result", text))
+        if self._help_enabled and text:
+            rows.append(("section", QtnRibbonSearchBarHelpString))
+            rows.append(("help", text))
+        return rows
+
+    def _popup_icon(self, pixmap):
+        icon = self._popup_icons.get(pixmap)
+        if icon is None:
+            icon = self._popup_icons[pixmap] = self.style().standardIcon(pixmap)
+        return icon
+
+    def _create_popup_row(self, spec):
+        role, value = spec
+        if role == "section":
+            action = QAction(value, self._popup)
+            action.setSeparator(True)
+            return action
+        if role == "result":
+            action = QAction(
+                self._popup_icon(QStyle.StandardPixmap.SP_FileIcon), value, self._popup
+            )
+            action.triggered.connect(
+                lambda _checked=False, value=value: (
+                    self.ribbon_bar.searchSuggestionActivated.emit(value)
+                )
             )
-            no_result_action = self._popup.addAction(
-                no_result_icon, f'{QtnRibbonSearchBarNoResultsFoundString} "{text}"'
+        elif role == "no-result":
+            action = QAction(
+                self._popup_icon(QStyle.StandardPixmap.SP_MessageBoxInformation),
+                f'{QtnRibbonSearchBarNoResultsFoundString} "{value}"',
+                self._popup,
             )
-            no_result_action.setEnabled(False)
-            no_result_action.setProperty("lqRibbonSearchPopupRole", "no-result")
-        if self._help_enabled and text:
-            self._popup.addSection(QtnRibbonSearchBarHelpString)
-            help_action = self._popup.addAction(f'{QtnRibbonSearchBarGetHelpString} "{text}"')
-            help_action.setProperty("lqRibbonSearchPopupRole", "help")
-            help_action.triggered.connect(lambda: self.show_help.emit(text))
+            action.setEnabled(False)
+        else:
+            action = QAction(f'{QtnRibbonSearchBarGetHelpString} "{value}"', self._popup)
+            action.triggered.connect(
+                lambda _checked=False, value=value: self.show_help.emit(value)
+            )
+        action.setProperty("lqRibbonSearchPopupRole", role)
+        return action
+
+    def _apply_popup_rows(self, rows):
+        """Update the popup menu to ``rows``, keeping the unchanged leading rows."""
+        current = self._popup_rows
+        same = 0
+        while (
+            same < min(len(current), len(rows))
+            and current[same][0] == rows[same]
+        ):
+            same += 1
+        if same == len(current) == len(rows):
+            return False
+        reusable = {}
+        for spec, action in current[same:]:
+            self._popup.removeAction(action)
+            if spec[0] != "action":
+                reusable.setdefault(spec, []).append(action)
+        kept = current[:same]
+        for spec in rows[same:]:
+            pool = reusable.get(spec)
+            if pool:
+                action = pool.pop()
+            elif spec[0] == "action":
+                action = spec[1]
+                action.setProperty("lqRibbonSearchPopupRole", "action")
+            else:
+                action = self._create_popup_row(spec)
+            self._popup.addAction(action)
+            kept.append((spec, action))
+        for pool in reusable.values():
+            for action in pool:
+                action.deleteLater()
+        self._popup_rows = kept
+        return True
+
+    def _present_popup(self, text, rows):
+        refresh = self._popup_query != text or not self._popup.isVisible()
+        self._popup_query = text
+        self._apply_popup_rows(rows)
+        if not refresh:
+            if self._popup.activeAction() not in self._selectable_popup_actions():
+                self._set_first_popup_action()
+            return
+        self._popup_keyboard_active = False
         if not self._popup.isEmpty():
             self._popup.popup(self.mapToGlobal(QPoint(0, self.height())))
             self._set_first_popup_action()
 
+    def _cancel_popup_job(self):
+        self._popup_timer.stop()
+        job, self._popup_job = self._popup_job, None
+        if job is not None:
+            job[1].close()
+
+    def schedulePopup(self, text=""):
+        """Refresh the popup for ``text`` after the debounce interval.
+
+        Each call supersedes the previous one; result lists are scanned in
+        time slices so typing does not block the event loop.
+        """
+        self._cancel_popup_job()
+        self._pending_popup_query = str(text)
+        self._popup_timer.start(self._popup_debounce_interval)
+
+    def isPopupPending(self):
+        return self._popup_timer.isActive() or self._popup_job is not None
+
+    def _start_popup_job(self, show=False):
+        text = self._pending_popup_query
+        rows = self._popup_row_specs(text)
+        initial = next(rows)
+        self._popup_job = (text, rows)
+        if self._continue_popup_job() or not show or self._popup_job is None:
+            return
+        # Providers are still busy: show what is known now and stream the rest.
+        if text == self._popup_query and self._popup_rows:
+            initial = [spec for spec, _action in self._popup_rows]
+        self._present_popup(text, initial)
+
+    def _continue_popup_job(self):
+        """Run one time slice of the popup job; return True if rows were presented."""
+        if self._popup_job is None:
+            return False
+        job = self._popup_job
+        text, rows = job
+        elapsed = QElapsedTimer()
+        elapsed.start()
+        partial = None
+        waiting = False
+        try:
+            while elapsed.elapsed() < self._popup_slice_interval:
+                chunk = next(rows)
+                if chunk is _SEARCH_PROVIDER_WAITING:
+                    # Resumed by _providerResultsReady once an async provider has more.
+                    waiting = True
+                    break
+                partial = chunk or partial
+        except StopIteration as finished:
+            if self._popup_job is not job:
+                return False
+            self._popup_job = None
+            self._present_popup(text, finished.value)
+            return True
+        if partial is not None:
+            # Stream results that arrived during this slice.
+            self._present_popup(text, partial)
+        if not waiting:
+            QTimer.singleShot(0, self, self._continue_popup_job)
+        return partial is not None
+
+    def showPopup(self, text=""):
+        """Show the popup for ``text`` now and keep streaming provider results into it."""
+        self._cancel_popup_job()
+        self._pending_popup_query = str(text)
+        self._start_popup_job(show=True)
+
     def closePopup(self):
         self._popup_keyboard_active = False
         self._popup.hide()
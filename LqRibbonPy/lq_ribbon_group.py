@@ -2,14 +2,25 @@
 LqRibbonGroup - Ribbon group that contains buttons and controls
 """
 
+from bisect import bisect_left, insort
+
 from PySide6.QtWidgets import (
     QGroupBox, QHBoxLayout, QVBoxLayout, QGridLayout,
     QWidget, QSizePolicy, QMenu, QFrame, QWidgetAction,
     QLabel, QToolButton
 )
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, QEvent, QPoint, QSize, QTimer, Signal
 from PySide6.QtGui import QAction, QColor, QIcon
-from .lq_ribbon_extras import CallableString, CallableList
+from .lq_ribbon_extras import CallableString, CallableList, LqRibbonControlSizeDefinition
+
+
+RIBBON_GROUP_SIZES = (
+    LqRibbonControlSizeDefinition.GroupLarge,
+    LqRibbonControlSizeDefinition.GroupMedium,
+    LqRibbonControlSizeDefinition.GroupSmall,
+    LqRibbonControlSizeDefinition.GroupPopup,
+)
+RIBBON_GROUP_LAYOUT_SIZES = RIBBON_GROUP_SIZES + (LqRibbonControlSizeDefinition.GroupSimplified,)
 
 
 class LqRibbonGroup(QGroupBox):
@@ -29,6 +40,11 @@ class LqRibbonGroup(QGroupBox):
         self.actions = CallableList()
         self._controls = CallableList()
         self._action_widgets = {}
+        self._widget_actions = {}
+        self._action_texts = {}
+        self._actions_by_text = {}
+        self._sequence = {}
+        self._next_sequence = 0
         self._option_button_action = None
         self._option_button_visible = False
         self._content_alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
@@ -38,6 +54,18 @@ class LqRibbonGroup(QGroupBox):
         self._icon = QIcon()
         self._title_color = QColor("#202020")
         self._controls_grouping = False
+        self._content_items = []
+        self._current_size = LqRibbonControlSizeDefinition.GroupLarge
+        self._width_table = None
+        self._width_table_key = None
+        self._size_hint = None
+        self._minimum_size_hint = None
+        self._reduced_layout = None
+        self._popup_button = None
+        self._popup_frame = None
+        self._popup_hidden = set()
+        self._measure_button = None
+        self._classic_minimum_height = 0
         self.init_ui()
 
     def init_ui(self):
@@ -73,12 +101,14 @@ class LqRibbonGroup(QGroupBox):
         self.option_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
         self.option_button.hide()
 
-        title_layout = QHBoxLayout()
-        title_layout.setContentsMargins(4, 0, 4, 0)
-        title_layout.setSpacing(2)
-        title_layout.addWidget(self.title_label, 1)
-        title_layout.addWidget(self.option_button)
-        outer_layout.addLayout(title_layout)
+        self.title_layout = QHBoxLayout()
+        self.title_layout.setContentsMargins(4, 0, 4, 0)
+        self.title_layout.setSpacing(2)
+        self.title_layout.addWidget(self.title_label, 1)
+        self.title_layout.addWidget(self.option_button)
+        # Keeps the row from capping the group's width while the title is hidden.
+        self.title_layout.addStretch(0)
+        outer_layout.addLayout(self.title_layout)
 
         # Create grid layout for small buttons
         self.grid_layout = QGridLayout()
@@ -98,16 +128,109 @@ class LqRibbonGroup(QGroupBox):
             self.grid_column += 1
         self._ensure_grid_layout()
 
+    def _add_content(self, kind, item):
+        self._content_items.append((kind, item))
+        self._content_changed()
+
+    def _remove_content(self, widget):
+        self._content_items = [entry for entry in self._content_items if entry[1] is not widget]
+        for layout in self._content_layouts():
+            layout.removeWidget(widget)
+        self._popup_hidden.discard(widget)
+        self._content_changed()
+
+    def _content_changed(self):
+        self.invalidateSizeHint()
+        self.invalidateWidthTable()
+        if self._current_size != LqRibbonControlSizeDefinition.GroupLarge:
+            self._arrange(self._current_size)
+        page = self.parentWidget()
+        while page is not None and not hasattr(page, "_group_content_changed"):
+            page = page.parentWidget()
+        if page is not None:
+            page._group_content_changed(self)
+
+    def _index_action(self, action, widget):
+        """Record action under its widget and current text for constant-time lookups.
+
+        Actions and widgets get increasing sequence numbers, so ``actions``,
+        ``buttons``, ``_controls`` and the per-text lists stay sorted by them.
+        """
+        self._action_widgets[action] = widget
+        self._widget_actions[widget] = action
+        self._sequence[widget] = self._next_sequence
+        if action not in self._action_texts:
+            self._sequence[action] = self._next_sequence
+            text = self._action_texts[action] = action.text()
+            self._actions_by_text.setdefault(text, []).append(action)
+            action.changed.connect(self._action_text_changed)
+        self._next_sequence += 1
+
+    def _unindex_action(self, action):
+        widget = self._action_widgets.pop(action, None)
+        if self._widget_actions.get(widget) is action:
+            del self._widget_actions[widget]
+        text = self._action_texts.pop(action, None)
+        if text is not None:
+            self._drop_text_entry(text, action)
+            action.changed.disconnect(self._action_text_changed)
+
+    def _sequence_position(self, items, item):
+        """Return the position of item in a list sorted by sequence, or -1."""
+        sequence = self._sequence.get(item)
+        if sequence is not None:
+            try:
+                position = bisect_left(items, sequence, key=self._sequence.__getitem__)
+            except KeyError:
+                position = len(items)
+            if position < len(items) and items[position] is item:
+                return position
+        # Items appended to the public lists directly are not sequenced.
+        return items.index(item) if item in items else -1
+
+    def _add_text_entry(self, text, action):
+        insort(
+            self._actions_by_text.setdefault(text, []),
+            action,
+            key=self._sequence.__getitem__,
+        )
+
+    def _drop_text_entry(self, text, action):
+        matches = self._actions_by_text[text]
+        del matches[self._sequence_position(matches, action)]
+        if not matches:
+            del self._actions_by_text[text]
+
+    def _action_text_changed(self):
+        action = self.sender()
+        old_text = self._action_texts.get(action)
+        text = action.text()
+        if old_text is None or old_text == text:
+            return
+        self._drop_text_entry(old_text, action)
+        self._action_texts[action] = text
+        self._add_text_entry(text, action)
+
+    @staticmethod
+    def _is_action_button(action, widget):
+        return hasattr(widget, "defaultAction") and widget.defaultAction() is action
+
+    def _discard(self, items, item):
+        position = self._sequence_position(items, item)
+        if position >= 0:
+            del items[position]
+
     def _forget_action_widget(self, action, widget):
+        self._remove_content(widget)
         self.main_layout.removeWidget(widget)
         self.grid_layout.removeWidget(widget)
-        if widget in self.buttons:
-            self.buttons.remove(widget)
-        if widget in self._controls:
-            self._controls.remove(widget)
-        self._action_widgets.pop(action, None)
-        if action in self.actions:
-            self.actions.remove(action)
+        if self._is_action_button(action, widget):
+            self._discard(self.buttons, widget)
+        self._discard(self._controls, widget)
+        self._unindex_action(action)
+        self._discard(self.actions, action)
+        self._sequence.pop(action, None)
+        self._sequence.pop(widget, None)
 
     def addAction(self, icon, text, tooltip=None, style=None):
         """Add an action button to the group (One-liner)
@@ -191,12 +314,14 @@ class LqRibbonGroup(QGroupBox):
         button = LqRibbonButton(action, button_style, self)
         self.buttons.append(button)
         self.actions.append(action)
-        self._action_widgets[action] = button
+        self._index_action(action, button)
 
         if button_style == Qt.ToolButtonStyle.ToolButtonTextBesideIcon:
             self._append_small_button(button)
+            self._add_content("small", button)
         else:
             self.main_layout.addWidget(button)
+            self._add_content("large", button)
 
         return button
 
@@ -210,6 +335,13 @@ class LqRibbonGroup(QGroupBox):
             old_index = self.actions.index(action)
             new_index = self.actions.index(before)
             self.actions.insert(new_index, self.actions.pop(old_index))
+            # Renumber the actions so they stay sorted by sequence; widget
+            # sequences keep their values, and new actions still sort last.
+            for sequence, item in enumerate(self.actions):
+                self._sequence[item] = sequence
+            matches = self._actions_by_text.get(self._action_texts.get(action))
+            if matches:
+                matches.sort(key=self._sequence.__getitem__)
         return action
 
     def add_separator(self):
@@ -218,10 +350,11 @@ class LqRibbonGroup(QGroupBox):
         separator.setFixedWidth(1)
         separator.setStyleSheet("background-color: #D1D1D1;")
         self.main_layout.addWidget(separator)
+        self._add_content("widget", separator)
         action = QAction(self)
         action.setSeparator(True)
         self.actions.append(action)
-        self._action_widgets[action] = separator
+        self._index_action(action, separator)
         return action
 
     def addSeparator(self):
@@ -234,9 +367,10 @@ class LqRibbonGroup(QGroupBox):
             widget: The widget to add
         """
         self.main_layout.addWidget(widget)
+        self._add_content("widget", widget)
         action = QWidgetAction(self)
         self.actions.append(action)
-        self._action_widgets[action] = widget
+        self._index_action(action, widget)
         return action
 
     def addWidget(self, *args):
@@ -267,6 +401,7 @@ class LqRibbonGroup(QGroupBox):
             layout: The layout to add
         """
         self.main_layout.addLayout(layout)
+        self._add_content("layout", layout)
 
     def get_action(self, text):
         """Get an action by its text
@@ -275,12 +410,10 @@ class LqRibbonGroup(QGroupBox):
             text: Text of the action
 
         Returns:
-            QAction: The action with the given text
+            QAction: The first action with the given text
         """
-        for action in self.actions:
-            if action.text() == text:
-                return action
-        return None
+        matches = self._actions_by_text.get(text)
+        return matches[0] if matches else None
 
     def get_button(self, text):
         """Get a button by its text
@@ -289,12 +422,11 @@ class LqRibbonGroup(QGroupBox):
             text: Text of the button
 
         Returns:
-            LqRibbonButton: The button with the given text
+            LqRibbonButton: The button of the action with the given text
         """
-        for button in self.buttons:
-            if button.text() == text:
-                return button
-        return None
+        action = self.get_action(text)
+        button = self._action_widgets.get(action)
+        return button if self._is_action_button(action, button) else None
 
     def on_action_triggered(self, action):
         """Handle action trigger
@@ -352,18 +484,20 @@ class LqRibbonGroup(QGroupBox):
         """
         self.title = CallableString(title)
         self.title_label.setText(title)
+        self.invalidateSizeHint()
+        if self._popup_button is not None:
+            self._popup_button.setText(title)
         self.titleChanged.emit(title)
 
     def setTitle(self, title):
-        self.title = CallableString(title)
-        self.title_label.setText(title)
-        self.titleChanged.emit(title)
+        self.set_title(title)
 
     def titleFont(self):
         return self.title_label.font()
 
     def setTitleFont(self, font):
         self.title_label.setFont(font)
+        self.invalidateSizeHint()
         self.titleFontChanged.emit(font)
 
     def titleColor(self):
@@ -382,10 +516,454 @@ class LqRibbonGroup(QGroupBox):
         return None
 
     def isReduced(self):
-        return False
+        return self._current_size != LqRibbonControlSizeDefinition.GroupLarge
+
+    def currentSize(self):
+        return self._current_size
+
+    def setCurrentSize(self, size):
+        """Lay the group out at a LqRibbonControlSizeDefinition group size."""
+        if size not in RIBBON_GROUP_LAYOUT_SIZES or size == self._current_size:
+            return
+        self._arrange(size)
+        self._current_size = size
+        super().setMinimumHeight(0 if self.simplifiedMode() else self._classic_minimum_height)
+        self.updateGeometry()
+
+    def simplifiedMode(self):
+        return self._current_size == LqRibbonControlSizeDefinition.GroupSimplified
+
+    def setSimplifiedMode(self, enabled):
+        """Show the group's commands in one row without a title, reusing its buttons."""
+        self.setCurrentSize(
+            LqRibbonControlSizeDefinition.GroupSimplified
+            if enabled
+            else LqRibbonControlSizeDefinition.GroupLarge
+        )
+
+    def simplifiedItems(self):
+        """Return the widgets laid out in the simplified row, in order."""
+        return [item for kind, item in self._content_items if kind != "layout"]
+
+    def setMinimumHeight(self, height):
+        self._classic_minimum_height = height
+        super().setMinimumHeight(0 if self.simplifiedMode() else height)
+
+    def invalidateWidthTable(self):
+        self._width_table = None
+
+    def invalidateSizeHint(self):
+        """Drop the cached size hints; layout requests from children also clear them."""
+        stale = self._size_hint is not None or self._minimum_size_hint is not None
+        self._size_hint = None
+        self._minimum_size_hint = None
+        if stale:
+            self.updateGeometry()
+
+    def sizeHint(self):
+        if self._size_hint is None:
+            self._size_hint = super().sizeHint()
+        return QSize(self._size_hint)
+
+    def minimumSizeHint(self):
+        if self._minimum_size_hint is None:
+            self._minimum_size_hint = super().minimumSizeHint()
+        return QSize(self._minimum_size_hint)
+
+    def widthTable(self):
+        """Return (size, width) pairs for each size that makes the group narrower.
+
+        The table is computed from the size hints of the group's widgets, without
+        rearranging the group, and reused until its content, title, font or
+        margins change.
+        """
+        key = self._current_width_table_key()
+        if self._width_table is not None and key == self._width_table_key:
+            return self._width_table
+        self.ensurePolished()
+        table = []
+        for size in RIBBON_GROUP_SIZES:
+            if size == LqRibbonControlSizeDefinition.GroupPopup:
+                if not self._content_items:
+                    break
+                width = self._popup_width()
+            else:
+                width = self._measure_width(size)
+            if not table or width < table[-1][1]:
+                table.append((size, width))
+        self._width_table = table
+        self._width_table_key = key
+        return table
+
+    def _measure_width(self, size):
+        """Return the width the group's size hint has when laid out at ``size``."""
+        sizes = LqRibbonControlSizeDefinition
+        if size in (sizes.GroupMedium, sizes.GroupSmall):
+            grid = self._ensure_reduced_layout()
+            widths = [self._reduced_content_width(size, grid.horizontalSpacing())]
+        else:
+            widths = self._large_content_widths()
+        margins = self.main_layout.contentsMargins()
+        content = self._spaced_width(widths, self.main_layout.spacing()) or 0
+        content += margins.left() + margins.right()
+        frame = self.contentsMargins()
+        return max(content, self._title_width()) + frame.left() + frame.right()
+
+    def _large_content_widths(self):
+        sizes = LqRibbonControlSizeDefinition
+        widths = []
+        columns = {}
+        grid_index = None
+        row = column = 0
+        for kind, item in self._content_items:
+            style = item.button_style if kind in ("large", "small") else None
+            width = self._item_width(kind, item, sizes.GroupLarge, style)
+            if kind != "small":
+                widths.append(width)
+                continue
+            if grid_index is None:
+                grid_index = len(widths)
+                widths.append(None)
+            if width is not None:
+                columns[column] = max(columns.get(column, 0), width)
+            row += 1
+            if row >= 3:
+                row = 0
+                column += 1
+        if grid_index is not None:
+            spacing = self.grid_layout.horizontalSpacing()
+            widths[grid_index] = self._spaced_width(columns.values(), spacing)
+        return widths
+
+    def _reduced_content_width(self, size, spacing):
+        small = size == LqRibbonControlSizeDefinition.GroupSmall
+        style = (
+            Qt.ToolButtonStyle.ToolButtonIconOnly
+            if small
+            else Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+        )
+        columns = {}
+        row = column = 0
+        for kind, item in self._content_items:
+            if kind in ("large", "small"):
+                width = self._item_width(kind, item, size, style)
+                if width is not None:
+                    columns[column] = max(columns.get(column, 0), width)
+                row += 1
+                if row >= 3:
+                    row = 0
+                    column += 1
+                continue
+            if row:
+                row = 0
+                column += 1
+            width = self._item_width(kind, item, size)
+            if width is not None:
+                columns[column] = width
+            column += 1
+        return self._spaced_width(columns.values(), spacing)
+
+    def _item_width(self, kind, item, size, style=None):
+        """Return the layout width of a content item at ``size``, or None if it is hidden."""
+        if kind == "layout":
+            return None if item.isEmpty() else item.sizeHint().width()
+        if kind in ("large", "small"):
+            if self._is_explicitly_hidden(item):
+                return None
+            return self._button_width(item, style)
+        if hasattr(item, "sizeHintForSize"):
+            hint = item.sizeHintForSize(size)
+            if hint is None:
+                return None
+            if hasattr(item, "displayStyleForSize"):
+                return self._button_width(item.widget(), item.displayStyleForSize(size))
+            return self._layout_width(item, hint)
+        if self._is_explicitly_hidden(item):
+            return None
+        return self._layout_width(item, item.sizeHint())
+
+    def _button_width(self, button, style):
+        """Return the width ``button`` would take in ``style``, measured off-screen."""
+        if button.displayStyle() == style:
+            return self._layout_width(button, button.sizeHint())
+        probe = self._ensure_measure_button()
+        menu = button.menu()
+        if menu is None and button.defaultAction() is not None:
+            menu = button.defaultAction().menu()
+        probe.setFont(button.font())
+        probe.setText(button.text())
+        probe.setIcon(button.icon())
+        probe.setPopupMode(button.popupMode())
+        probe.setMenu(menu)
+        probe.setWordWrap(button.wordWrap())
+        probe.setDisplayStyle(style)
+        probe.ensurePolished()
+        width = self._layout_width(probe, probe.sizeHint())
+        probe.setMenu(None)
+        return width
+
+    def _ensure_measure_button(self):
+        if self._measure_button is None:
+            from .lq_ribbon_button import LqRibbonButton
+
+            button = LqRibbonButton(None, Qt.ToolButtonStyle.ToolButtonTextUnderIcon, self)
+            button.setObjectName("lqRibbonGroupMeasureButton")
+            button.hide()
+            self._measure_button = button
+        return self._measure_button
+
+    def _title_width(self):
+        margins = self.title_layout.contentsMargins()
+        width = margins.left() + margins.right()
+        width += self._layout_width(self.title_label, self.title_label.sizeHint())
+        if self._option_button_visible:
+            width += self.title_layout.spacing()
+            width += self._layout_width(self.option_button, self.option_button.sizeHint())
+        return width
+
+    @staticmethod
+    def _layout_width(widget, hint):
+        """Return the width a box or grid layout gives ``widget`` for ``hint``."""
+        if widget.sizePolicy().horizontalPolicy() == QSizePolicy.Policy.Ignored:
+            return 0
+        width = max(hint.width(), widget.minimumSizeHint().width())
+        return max(min(width, widget.maximumWidth()), widget.minimumWidth())
+
+    @staticmethod
+    def _spaced_width(widths, spacing):
+        widths = [width for width in widths if width is not None]
+        if not widths:
+            return None
+        return sum(widths) + spacing * (len(widths) - 1)
+
+    @staticmethod
+    def _is_explicitly_hidden(widget):
+        return widget.isHidden() and widget.testAttribute(
+            Qt.WidgetAttribute.WA_WState_ExplicitShowHide
+        )
+
+    def _current_width_table_key(self):
+        margins = self.main_layout.contentsMargins()
+        return (
+            margins.left(),
+            margins.right(),
+            str(self.title),
+            self.font().key(),
+            self.title_label.font().key(),
+        )
+
+    def _content_layouts(self):
+        layouts = [self.main_layout, self.grid_layout]
+        if self._reduced_layout is not None:
+            layouts.append(self._reduced_layout)
+        if self._popup_frame is not None:
+            layouts.extend((self._popup_frame.layout(), self._popup_frame.grid_layout))
+        return layouts
+
+    def _detach_content(self):
+        for layout in self._content_layouts():
+            while layout.count():
+                layout.takeAt(0)
+
+    def _arrange(self, size):
+        """Rebuild the content layout for a group size without recreating widgets."""
+        try:
+            self._arrange_content(size)
+        finally:
+            # Showing and reparenting children queries hints mid-rebuild.
+            self.invalidateSizeHint()
+
+    def _arrange_content(self, size):
+        sizes = LqRibbonControlSizeDefinition
+        self._detach_content()
+        if size != sizes.GroupPopup:
+            self._restore_from_popup()
+        self.title_label.setVisible(size not in (sizes.GroupPopup, sizes.GroupSimplified))
+        if self._popup_button is not None:
+            self._popup_button.setVisible(size == sizes.GroupPopup)
+        for kind, item in self._content_items:
+            if kind in ("large", "small"):
+                item.setSimplifiedMode(size == sizes.GroupSimplified)
+
+        if size == sizes.GroupSimplified:
+            self._arrange_simplified()
+            return
+        if size in (sizes.GroupMedium, sizes.GroupSmall):
+            self._arrange_reduced(size)
+            return
+        for kind, item in self._content_items:
+            if kind in ("large", "small"):
+                item.setDisplayStyle(item.button_style)
+            elif hasattr(item, "sizeChanged") and hasattr(item, "currentSize"):
+                item.sizeChanged(sizes.GroupLarge)
+        if size == sizes.GroupPopup:
+            self._move_to_popup()
+            return
+        self.grid_row, self.grid_column = self._arrange_large(self.main_layout, self.grid_layout)
+
+    def _arrange_large(self, box, grid):
+        row = column = 0
+        for kind, item in self._content_items:
+            if kind == "small":
+                grid.addWidget(item, row, column)
+                if box.indexOf(grid) == -1:
+                    box.addLayout(grid)
+                row += 1
+                if row >= 3:
+                    row = 0
+                    column += 1
+            elif kind == "layout":
+                box.addLayout(item)
+            else:
+                box.addWidget(item)
+        return row, column
+
+    def _arrange_simplified(self):
+        for kind, item in self._content_items:
+            if kind == "layout":
+                self.main_layout.addLayout(item)
+                continue
+            if hasattr(item, "sizeChanged") and hasattr(item, "currentSize"):
+                item.sizeChanged(LqRibbonControlSizeDefinition.GroupSimplified)
+            self.main_layout.addWidget(item)
+
+    def _ensure_reduced_layout(self):
+        if self._reduced_layout is None:
+            self._reduced_layout = QGridLayout()
+            self._reduced_layout.setSpacing(2)
+            self._reduced_layout.setAlignment(
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+            )
+        return self._reduced_layout
+
+    def _arrange_reduced(self, size):
+        grid = self._ensure_reduced_layout()
+        small = size == LqRibbonControlSizeDefinition.GroupSmall
+        row = column = 0
+        for kind, item in self._content_items:
+            if kind in ("large", "small"):
+                if small:
+                    item.setDisplayStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
+                else:
+                    item.setDisplayStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+                grid.addWidget(item, row, column, Qt.AlignmentFlag.AlignLeft)
+                row += 1
+                if row >= 3:
+                    row = 0
+                    column += 1
+                continue
+            if row:
+                row = 0
+                column += 1
+            if kind == "layout":
+                grid.addLayout(item, 0, column, 3, 1)
+            else:
+                if hasattr(item, "sizeChanged") and hasattr(item, "currentSize"):
+                    item.sizeChanged(size)
+                grid.addWidget(item, 0, column, 3, 1)
+            column += 1
+        self.main_layout.addLayout(grid)
+
+    def _ensure_popup_button(self):
+        if self._popup_button is None:
+            from .lq_ribbon_button import LqRibbonButton
+
+            button = LqRibbonButton(None, Qt.ToolButtonStyle.ToolButtonTextUnderIcon, self)
+            button.setObjectName("lqRibbonGroupPopupButton")
+            button.setText(str(self.title))
+            button.setIcon(self._popup_icon())
+            button.clicked.connect(self.showReducedPopup)
+            button.hide()
+            self._popup_button = button
+        return self._popup_button
+
+    def _popup_icon(self):
+        if not self._icon.isNull():
+            return self._icon
+        for action in self.actions:
+            if not action.icon().isNull():
+                return action.icon()
+        return QIcon()
+
+    def _popup_width(self):
+        button = self._ensure_popup_button()
+        button.ensurePolished()
+        margins = self.main_layout.contentsMargins()
+        frame = self.contentsMargins()
+        width = button.sizeHint().width() + margins.left() + margins.right()
+        return max(self.minimumWidth(), width + frame.left() + frame.right())
+
+    def _ensure_popup_frame(self):
+        if self._popup_frame is None:
+            frame = QFrame(self, Qt.WindowType.Popup)
+            frame.setObjectName("lqRibbonGroupPopup")
+            frame.setFrameShape(QFrame.Shape.StyledPanel)
+            layout = QHBoxLayout(frame)
+            layout.setContentsMargins(4, 5, 5, 5)
+            layout.setSpacing(2)
+            layout.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+            frame.grid_layout = QGridLayout()
+            frame.grid_layout.setSpacing(2)
+            self._popup_frame = frame
+        return self._popup_frame
+
+    def _move_to_popup(self):
+        frame = self._ensure_popup_frame()
+        button = self._ensure_popup_button()
+        button.setIcon(self._popup_icon())
+        for kind, item in self._content_items:
+            if kind != "layout" and item.parentWidget() is not frame:
+                if self._is_explicitly_hidden(item):
+                    self._popup_hidden.add(item)
+                # Reparenting keeps explicitly hidden widgets hidden.
+                item.setParent(frame)
+                if item not in self._popup_hidden:
+                    item.show()
+        self._arrange_large(frame.layout(), frame.grid_layout)
+        self.main_layout.addWidget(button)
+        button.show()
+
+    def _restore_from_popup(self):
+        frame = self._popup_frame
+        if frame is None:
+            return
+        frame.hide()
+        for kind, item in self._content_items:
+            if kind != "layout" and item.parentWidget() is frame:
+                item.setParent(self)
+                if item not in self._popup_hidden:
+                    item.show()
+        self._popup_hidden.clear()
+
+    def reducedPopup(self):
+        """Return the popup that shows the content of a group reduced to one button."""
+        return self._popup_frame
+
+    def showReducedPopup(self):
+        if self._current_size != LqRibbonControlSizeDefinition.GroupPopup:
+            return
+        frame = self._popup_frame
+        frame.adjustSize()
+        frame.move(self._popup_button.mapToGlobal(QPoint(0, self._popup_button.height())))
+        frame.show()
+
+    def event(self, event):
+        if event.type() in (QEvent.Type.StyleChange, QEvent.Type.FontChange):
+            self._width_table = None
+        handled = super().event(event)
+        if event.type() in (
+            QEvent.Type.LayoutRequest,
+            QEvent.Type.Polish,
+            QEvent.Type.StyleChange,
+            QEvent.Type.FontChange,
+        ):
+            self.invalidateSizeHint()
+        return handled
 
     def setIcon(self, icon):
         self._icon = icon if isinstance(icon, QIcon) else QIcon(icon)
+        if self._popup_button is not None:
+            self._popup_button.setIcon(self._popup_icon())
 
     def icon(self):
         return self._icon
@@ -396,6 +974,7 @@ class LqRibbonGroup(QGroupBox):
     def setOptionButtonVisible(self, visible=True):
         self._option_button_visible = bool(visible)
         self.option_button.setVisible(self._option_button_visible)
+        self.invalidateSizeHint()
 
     def optionButtonAction(self):
         return self._option_button_action
@@ -424,6 +1003,7 @@ class LqRibbonGroup(QGroupBox):
 
     def setSpacing(self, spacing):
         self.main_layout.setSpacing(spacing)
+        self.invalidateSizeHint()
 
     def controlCount(self):
         return len(self._controls)
@@ -451,20 +1031,15 @@ class LqRibbonGroup(QGroupBox):
             self.add_widget(control)
 
     def removeControl(self, control):
-        if control in self._controls:
-            self._controls.remove(control)
+        if self._sequence_position(self._controls, control) >= 0:
             self.remove(control)
 
     def remove(self, widget):
-        action = None
-        for action, action_widget in list(self._action_widgets.items()):
-            if action_widget is widget:
-                break
-        else:
-            action = None
+        action = self._widget_actions.get(widget)
         if action is not None:
             self._forget_action_widget(action, widget)
         else:
+            self._remove_content(widget)
             self.main_layout.removeWidget(widget)
             self.grid_layout.removeWidget(widget)
             if widget in self.buttons:
@@ -2,10 +2,18 @@
 LqRibbonPage - Ribbon page that contains ribbon groups
 """
 
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QScrollArea
-from PySide6.QtCore import Qt, Signal
+import bisect
+
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QMenu, QScrollArea, QToolButton
+from PySide6.QtCore import Qt, Signal, QEvent, QTimer
 from PySide6.QtGui import QAction, QColor, QIcon, QPainter, QPainterPath, QPalette
-from .lq_ribbon_extras import CallableString, CallableList, ContextColor
+from .lq_ribbon_extras import (
+    CallableString,
+    CallableList,
+    ContextColor,
+    LqRibbonControlSizeDefinition,
+)
+from .lq_styles import LqStyle, RibbonStyle
 
 
 RIBBON_COMMAND_FRAME_LINE_WIDTH = 2
@@ -43,7 +51,7 @@ class LqRibbonPage(QWidget):
     activated = Signal()
     activating = Signal(object)
 
-    def __init__(self, title, parent=None):
+    def __init__(self, title, parent=None, factory=None, search_terms=None):
         super().__init__(parent)
         self.title = CallableString(title)
         self.groups = CallableList()
@@ -51,7 +59,54 @@ class LqRibbonPage(QWidget):
         self._context_color = QColor()
         self._context_title = ""
         self._context_group_name = ""
+        self._paint_resources_key = None
+        self._paint_resources = None
+        self._group_reduction_enabled = True
+        self._group_reduction_key = None
+        self._simplified_mode = False
+        self._applied_simplified_mode = False
+        self._overflow_items = None
+        self._overflow_ends = None
+        self._overflow_group_first = {}
+        self._overflow_cache = {}
+        self._overflow_count = None
+        self._overflow_hidden = set()
+        self._overflow_button = None
+        self._group_sizes_pending = False
+        self._factory = factory
+        self._search_terms = search_terms
+        if factory is None:
+            self.init_ui()
+
+    def isMaterialized(self):
+        return self._factory is None
+
+    def materialize(self):
+        """Build a lazy page by running its factory; returns True if it ran."""
+        factory = self._factory
+        if factory is None:
+            return False
+        self._factory = None
+        self._search_terms = None
         self.init_ui()
+        factory(self)
+        return True
+
+    def lazySearchTerms(self):
+        """Search terms declared for the commands of a page not built yet.
+
+        A page added without terms is found by its title.
+        """
+        if self._factory is None:
+            return []
+        if self._search_terms is None:
+            return [str(self.title)]
+        if callable(self._search_terms):
+            self._search_terms = self._search_terms()
+        if isinstance(self._search_terms, str):
+            self._search_terms = [self._search_terms]
+        self._search_terms = [str(term) for term in self._search_terms]
+        return self._search_terms
 
     def init_ui(self):
         """Initialize the page UI"""
@@ -87,61 +142,340 @@ class LqRibbonPage(QWidget):
 
         self.scroll_area.setWidget(self.groups_container)
         main_layout.addWidget(self.scroll_area)
+        self._update_surface_palette()
+
+    def _surface_widgets(self):
+        return (self, self.scroll_area, self.scroll_area.viewport(), self.groups_container)
 
     def _apply_surface_palette(self, background_color):
-        for widget in (self, self.scroll_area, self.scroll_area.viewport(), self.groups_container):
+        for widget in self._surface_widgets():
             widget.setAutoFillBackground(True)
             palette = widget.palette()
             palette.setColor(QPalette.ColorRole.Window, background_color)
             palette.setColor(QPalette.ColorRole.Base, background_color)
             widget.setPalette(palette)
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-
-        from .lq_styles import LqStyle, RibbonStyle
-
+    def _ribbon_style(self):
         ribbon_bar = self.ribbonBar()
-        style = (
+        return (
             ribbon_bar.ribbonStyle()
             if ribbon_bar and hasattr(ribbon_bar, "ribbonStyle")
             else RibbonStyle.Office2016Blue
         )
-        palette = LqStyle.palette(style)
-        frame_color = QColor(palette["page_border"])
-        if not frame_color.isValid() or self.width() <= 1 or self.height() <= 1:
-            return
 
-        background_color = QColor(palette["ribbon_bg"])
+    def _update_surface_palette(self):
+        """Apply the ribbon background to the page surfaces if it changed."""
+        if self._factory is not None:
+            return
+        background_color = QColor(LqStyle.palette(self._ribbon_style())["ribbon_bg"])
+        if all(
+            widget.palette().color(QPalette.ColorRole.Window) == background_color
+            for widget in self._surface_widgets()
+        ):
+            return
         self._apply_surface_palette(background_color)
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
-        line_width = RIBBON_COMMAND_FRAME_LINE_WIDTH
+    def showEvent(self, event):
+        self._update_surface_palette()
+        super().showEvent(event)
+        self._sync_simplified_mode()
+        self.adjustGroupSizes()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.adjustGroupSizes()
+
+    def isGroupReductionEnabled(self):
+        return self._group_reduction_enabled
+
+    def setGroupReductionEnabled(self, enabled):
+        """Reduce groups to fit the page width instead of scrolling horizontally."""
+        self._group_reduction_enabled = bool(enabled)
+        self._group_reduction_key = None
+        if not self._group_reduction_enabled and not self._applied_simplified_mode:
+            for group in self.groups:
+                if hasattr(group, "setCurrentSize"):
+                    group.setCurrentSize(LqRibbonControlSizeDefinition.GroupLarge)
+        self.adjustGroupSizes()
+
+    def _available_group_width(self):
+        margins = self.groups_layout.contentsMargins()
+        return self.scroll_area.contentsRect().width() - margins.left() - margins.right()
+
+    def adjustGroupSizes(self):
+        """Pick a size for every group from its width table so the page fits.
+
+        Groups are reduced one step at a time from right to left, large to
+        medium to small to popup, until their summed widths fit.
+        """
+        if self._factory is not None or not self.isVisible():
+            return
+        if self._applied_simplified_mode:
+            self._update_overflow()
+            return
+        if not self._group_reduction_enabled:
+            return
+        groups = [
+            group
+            for group in self.groups
+            if hasattr(group, "widthTable") and not group.isHidden()
+        ]
+        tables = [group.widthTable() for group in groups]
+        available = self._available_group_width()
+        key = (available, tuple(tuple(table) for table in tables))
+        if key == self._group_reduction_key:
+            return
+        self._group_reduction_key = key
+
+        levels = [0] * len(groups)
+        total = sum(table[0][1] for table in tables if table)
+        total += self.groups_layout.spacing() * max(0, len(groups) - 1)
+        reduced = True
+        while total > available and reduced:
+            reduced = False
+            for index in reversed(range(len(groups))):
+                table = tables[index]
+                level = levels[index]
+                if level + 1 >= len(table):
+                    continue
+                total -= table[level][1] - table[level + 1][1]
+                levels[index] = level + 1
+                reduced = True
+                if total <= available:
+                    break
+        for group, table, level in zip(groups, tables, levels):
+            if table:
+                group.setCurrentSize(table[level][0])
+
+    def event(self, event):
+        handled = super().event(event)
+        if event.type() == QEvent.Type.StyleChange and self._factory is None:
+            # Style sheet re-polishing resets the surface palettes of this page
+            # and its children; restore them once the whole subtree is done.
+            QTimer.singleShot(0, self, self._update_surface_palette)
+        return handled
+
+    def simplifiedMode(self):
+        return self._simplified_mode
+
+    def setSimplifiedMode(self, enabled):
+        """Lay the groups out in one row; hidden pages switch when next shown."""
+        self._simplified_mode = bool(enabled)
+        if self.isVisible():
+            self._sync_simplified_mode()
+            self.adjustGroupSizes()
+
+    def _sync_simplified_mode(self):
+        enabled = self._simplified_mode
+        if self._factory is not None or enabled == self._applied_simplified_mode:
+            return
+        self._applied_simplified_mode = enabled
+        self._group_reduction_key = None
+        if not enabled:
+            self._set_overflow_count(None)
+        self._invalidate_overflow()
+        for group in self.groups:
+            if hasattr(group, "setSimplifiedMode"):
+                group.setSimplifiedMode(enabled)
+
+    def _group_content_changed(self, group):
+        self._invalidate_overflow()
+        if not self._group_sizes_pending:
+            self._group_sizes_pending = True
+            QTimer.singleShot(0, self, self._adjust_pending_group_sizes)
+
+    def _adjust_pending_group_sizes(self):
+        self._group_sizes_pending = False
+        self.adjustGroupSizes()
+
+    def _invalidate_overflow(self):
+        if self._overflow_count is not None:
+            self._set_overflow_count(None)
+        self._overflow_items = None
+        self._overflow_cache.clear()
+
+    def _overflow_layout(self):
+        """Return the simplified items with their cumulative right edges."""
+        if self._overflow_items is None:
+            items = []
+            ends = []
+            first = {}
+            right = 0
+            for group in self.groups:
+                if not hasattr(group, "simplifiedItems") or self._is_app_hidden(group):
+                    continue
+                group_items = [
+                    widget for widget in group.simplifiedItems() if not self._is_app_hidden(widget)
+                ]
+                if not group_items:
+                    continue
+                margins = group.main_layout.contentsMargins()
+                if items:
+                    right += self.groups_layout.spacing()
+                right += margins.left() + margins.right()
+                first[group] = len(items)
+                for index, widget in enumerate(group_items):
+                    if index:
+                        right += group.main_layout.spacing()
+                    right += widget.sizeHint().width()
+                    items.append((group, widget))
+                    ends.append(right)
+            self._overflow_items = items
+            self._overflow_ends = ends
+            self._overflow_group_first = first
+        return self._overflow_items, self._overflow_ends
+
+    def _update_overflow(self):
+        items, ends = self._overflow_layout()
+        margins = self.layout().contentsMargins()
+        available = self.width() - margins.left() - margins.right()
+        count = self._overflow_cache.get(available)
+        if count is None:
+            if not ends or ends[-1] <= available:
+                count = len(items)
+            else:
+                button_width = self._ensure_overflow_button().sizeHint().width()
+                count = bisect.bisect_right(ends, available - button_width)
+            self._overflow_cache[available] = count
+        self._set_overflow_count(count)
+
+    def _set_overflow_count(self, count):
+        """Show the first count simplified items, or every item for None."""
+        previous = self._overflow_count
+        if count == previous:
+            return
+        items = self._overflow_items or []
+        total = len(items)
+        visible_before = total if previous is None else previous
+        visible_after = total if count is None else count
+        low, high = sorted((visible_before, visible_after))
+        groups = {}
+        for index in range(low, high):
+            group, widget = items[index]
+            self._set_overflow_hidden(widget, index >= visible_after)
+            groups[group] = None
+        for group in groups:
+            self._set_overflow_hidden(group, self._overflow_group_first[group] >= visible_after)
+        self._overflow_count = count
+        if self._overflow_button is not None:
+            self._overflow_button.setVisible(visible_after < total)
+
+    def _is_app_hidden(self, widget):
+        """Whether the application, not the overflow, hid widget."""
+        return (
+            widget not in self._overflow_hidden
+            and widget.isHidden()
+            and widget.testAttribute(Qt.WidgetAttribute.WA_WState_ExplicitShowHide)
+        )
+
+    def _set_overflow_hidden(self, widget, hidden):
+        # Only visibility the overflow changed itself is restored.
+        if hidden:
+            if not self._is_app_hidden(widget):
+                self._overflow_hidden.add(widget)
+                widget.hide()
+        elif widget in self._overflow_hidden:
+            self._overflow_hidden.discard(widget)
+            widget.show()
+
+    def _ensure_overflow_button(self):
+        if self._overflow_button is None:
+            button = QToolButton(self)
+            button.setObjectName("lqRibbonPageOverflowButton")
+            button.setText("\u2026")
+            button.setAutoRaise(True)
+            button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+            menu = QMenu(button)
+            menu.aboutToShow.connect(self._populate_overflow_menu)
+            button.setMenu(menu)
+            button.hide()
+            self.layout().addWidget(button)
+            self._overflow_button = button
+        return self._overflow_button
+
+    def overflowMenu(self):
+        """Return the menu listing simplified commands that do not fit, if any."""
+        return self._overflow_button.menu() if self._overflow_button is not None else None
+
+    def _populate_overflow_menu(self):
+        menu = self._overflow_button.menu()
+        menu.clear()
+        items = self._overflow_items or []
+        count = len(items) if self._overflow_count is None else self._overflow_count
+        section = None
+        for group, widget in items[count:]:
+            action = widget.defaultAction() if hasattr(widget, "defaultAction") else None
+            if action is None or action.isSeparator():
+                continue
+            if group is not section:
+                menu.addSection(str(group.title))
+                section = group
+            menu.addAction(action)
+
+    def _frame_paint_resources(self):
+        style = self._ribbon_style()
         window = self.window()
-        radius_px = 0 if window and window.isMaximized() else RIBBON_COMMAND_FRAME_CORNER_RADIUS
-        radius = min(float(radius_px), self.width() / 2.0, self.height() / 2.0)
+        maximized = bool(window and window.isMaximized())
         outer_color = (
             self.parentWidget().palette().color(QPalette.ColorRole.Window)
             if self.parentWidget()
             else QColor(Qt.GlobalColor.transparent)
         )
+        key = (style, self.width(), self.height(), maximized, outer_color.rgba())
+        if key == self._paint_resources_key:
+            return self._paint_resources
+
+        palette = LqStyle.palette(style)
+        radius_px = 0 if maximized else RIBBON_COMMAND_FRAME_CORNER_RADIUS
+        radius = min(float(radius_px), self.width() / 2.0, self.height() / 2.0)
+        width = float(self.width())
+        height = float(self.height())
         surface_path = QPainterPath()
         surface_path.moveTo(0.0, 0.0)
-        surface_path.lineTo(float(self.width()), 0.0)
-        surface_path.lineTo(float(self.width()), float(self.height()) - radius)
-        surface_path.quadTo(
-            float(self.width()),
-            float(self.height()),
-            float(self.width()) - radius,
-            float(self.height()),
-        )
-        surface_path.lineTo(radius, float(self.height()))
-        surface_path.quadTo(0.0, float(self.height()), 0.0, float(self.height()) - radius)
+        surface_path.lineTo(width, 0.0)
+        surface_path.lineTo(width, height - radius)
+        surface_path.quadTo(width, height, width - radius, height)
+        surface_path.lineTo(radius, height)
+        surface_path.quadTo(0.0, height, 0.0, height - radius)
         surface_path.closeSubpath()
-        painter.fillRect(self.rect(), outer_color)
+
+        left = 0.5
+        right = self.width() - 1.5
+        bottom = self.height() - 1.5
+        corner_path = QPainterPath()
+        corner_path.moveTo(left, bottom - radius)
+        corner_path.quadTo(left, bottom, left + radius, bottom)
+        corner_path.moveTo(right - radius, bottom)
+        corner_path.quadTo(right, bottom, right, bottom - radius)
+
+        self._paint_resources_key = key
+        self._paint_resources = {
+            "frame_color": QColor(palette["page_border"]),
+            "background_color": QColor(palette["ribbon_bg"]),
+            "outer_color": outer_color,
+            "radius_px": radius_px,
+            "surface_path": surface_path,
+            "corner_path": corner_path,
+        }
+        return self._paint_resources
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._factory is not None or self.width() <= 1 or self.height() <= 1:
+            return
+
+        resources = self._frame_paint_resources()
+        frame_color = resources["frame_color"]
+        if not frame_color.isValid():
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        line_width = RIBBON_COMMAND_FRAME_LINE_WIDTH
+        radius_px = resources["radius_px"]
+        painter.fillRect(self.rect(), resources["outer_color"])
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        painter.fillPath(surface_path, background_color)
+        painter.fillPath(resources["surface_path"], resources["background_color"])
 
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
         painter.fillRect(0, 0, line_width, max(1, self.height() - radius_px), frame_color)
@@ -162,15 +496,7 @@ class LqRibbonPage(QWidget):
 
         painter.setPen(frame_color)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        left = 0.5
-        right = self.width() - 1.5
-        bottom = self.height() - 1.5
-        corner_path = QPainterPath()
-        corner_path.moveTo(left, bottom - radius)
-        corner_path.quadTo(left, bottom, left + radius, bottom)
-        corner_path.moveTo(right - radius, bottom)
-        corner_path.quadTo(right, bottom, right, bottom - radius)
-        painter.drawPath(corner_path)
+        painter.drawPath(resources["corner_path"])
 
     def add_group(self, title):
         """Add a new ribbon group to the page
@@ -192,6 +518,7 @@ class LqRibbonPage(QWidget):
         """Qtitan/C++ compatible group add overload."""
         from .lq_ribbon_group import LqRibbonGroup
 
+        self.materialize()
         if len(args) == 1 and isinstance(args[0], LqRibbonGroup):
             group = args[0]
             if group in self.groups:
@@ -199,7 +526,7 @@ class LqRibbonPage(QWidget):
             self.groups.append(group)
             group.setParent(self.groups_container)
             self.groups_layout.addWidget(group)
-            self.updateLayout()
+            self._group_changed(group)
             return group
         if len(args) == 1:
             return self.add_group(args[0])
@@ -214,6 +541,7 @@ class LqRibbonPage(QWidget):
         """Insert a group or create one at index."""
         from .lq_ribbon_group import LqRibbonGroup
 
+        self.materialize()
         if len(args) == 1 and isinstance(args[0], LqRibbonGroup):
             group = args[0]
         elif len(args) == 1:
@@ -235,7 +563,7 @@ class LqRibbonPage(QWidget):
         self.groups.insert(index, group)
         group.setParent(self.groups_container)
         self.groups_layout.insertWidget(index, group)
-        self.updateLayout()
+        self._group_changed(group)
         return group
 
     def get_group(self, index):
@@ -378,13 +706,26 @@ class LqRibbonPage(QWidget):
     def setContextGroupName(self, group_name):
         self._context_group_name = group_name
 
-    def updateLayout(self):
+    def _group_changed(self, group):
         ribbon_bar = self.ribbonBar()
-        if ribbon_bar and hasattr(ribbon_bar, "_apply_group_layout_metrics"):
-            ribbon_bar._apply_group_layout_metrics()
+        if ribbon_bar and hasattr(ribbon_bar, "_defer_page_layout"):
+            if ribbon_bar._defer_page_layout(self):
+                return
+            ribbon_bar._apply_group_metrics(group)
+        self.updateLayout()
+
+    def updateLayout(self):
+        if self._factory is not None:
+            return
+        if self._applied_simplified_mode:
+            self._invalidate_overflow()
+            for group in self.groups:
+                if hasattr(group, "setSimplifiedMode"):
+                    group.setSimplifiedMode(True)
         self.updateGeometry()
         self.groups_container.updateGeometry()
         self.groups_container.update()
+        self.adjustGroupSizes()
 
 
 RibbonPage = LqRibbonPage
@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
     QLabel, QLineEdit, QPushButton, QTextEdit, QStatusBar
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QColor, QIcon, QPalette
 from shiboken6 import isValid as _qt_object_is_valid
 
 from .lq_ribbon_bar import LqRibbonBar
@@ -34,6 +34,7 @@ class LqRibbonWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 700)
 
         self._native_frame_enabled = False
+        self._palette_themed = False
         self._native_caption_height = 36
         self._native_resize_border_width = 5
 
@@ -124,12 +125,43 @@ class LqRibbonWindow(QMainWindow):
 
     def apply_styles(self):
         """Apply the active Ribbon style."""
-        self.setStyleSheet(
-            LqStyle.get_full_style(
-                self.ribbon_bar.ribbonStyle(),
-                self.ribbon_bar.platformLayout(),
-            )
-        )
+        style = self.ribbon_bar.ribbonStyle()
+        platform_layout = self.ribbon_bar.platformLayout()
+        if self.ribbon_bar.isPaletteThemingEnabled():
+            LqStyle.apply_style_sheet(self, LqStyle.get_static_style(platform_layout))
+            self._apply_palette_theme(style)
+            return
+        if self._palette_themed:
+            self._apply_palette_theme(None)
+        LqStyle.apply_style_sheet(self, LqStyle.get_full_style(style, platform_layout))
+
+    def _apply_palette_theme(self, style):
+        self._palette_themed = style is not None
+        LqStyle.propagate_palette(self, LqStyle.qpalette(style) if style is not None else QPalette())
+        colors = LqStyle.palette(style) if style is not None else None
+        status_bar = getattr(self, "status_bar", None)
+        if status_bar is not None and _qt_object_is_valid(status_bar):
+            palette = QPalette()
+            if colors:
+                palette = status_bar.palette()
+                palette.setColor(QPalette.ColorRole.Window, QColor(colors["caption_bg"]))
+                palette.setColor(QPalette.ColorRole.WindowText, QColor(colors["status_text"]))
+            status_bar.setAutoFillBackground(bool(colors))
+            status_bar.setPalette(palette)
+        display_area = getattr(self, "display_area", None)
+        if display_area is not None and _qt_object_is_valid(display_area):
+            palette = QPalette()
+            if colors:
+                palette = display_area.palette()
+                palette.setColor(QPalette.ColorRole.Base, QColor(colors["window_bg"]))
+            display_area.setPalette(palette)
+
+    def setPaletteThemingEnabled(self, enabled):
+        self.ribbon_bar.setPaletteThemingEnabled(enabled)
+        self.apply_styles()
+
+    def isPaletteThemingEnabled(self):
+        return self.ribbon_bar.isPaletteThemingEnabled()
 
     def on_action_triggered(self, action_name):
         """Handle action trigger and display in the main area"""
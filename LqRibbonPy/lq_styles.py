@@ -2,8 +2,12 @@
 LqRibbon style definitions shared by the Python Ribbon widgets.
 """
 
+import re
 from enum import IntEnum
 
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QWidget
+
 
 class RibbonStyle(IntEnum):
     """Named Ribbon styles that mirror the C++ example API."""
@@ -193,6 +197,84 @@ _STYLE_PALETTES = {
 }
 
 
+_STYLE_SHEET_CACHE = {}
+_STYLE_SHEET_CACHE_LIMIT = 64
+
+# Palette keys mapped onto QPalette roles for palette-only theming.
+_PALETTE_ROLE_KEYS = (
+    (QPalette.ColorRole.Window, "ribbon_bg"),
+    (QPalette.ColorRole.WindowText, "text"),
+    (QPalette.ColorRole.Base, "field_bg"),
+    (QPalette.ColorRole.AlternateBase, "popup_bg"),
+    (QPalette.ColorRole.Text, "text"),
+    (QPalette.ColorRole.Button, "ribbon_bg"),
+    (QPalette.ColorRole.ButtonText, "text"),
+    (QPalette.ColorRole.Highlight, "group_hover"),
+    (QPalette.ColorRole.HighlightedText, "text"),
+    (QPalette.ColorRole.Light, "selected_tab_bg"),
+    (QPalette.ColorRole.Midlight, "border"),
+    (QPalette.ColorRole.Mid, "command_hover_border"),
+    (QPalette.ColorRole.Dark, "group_pressed"),
+    (QPalette.ColorRole.Shadow, "command_pressed_border"),
+    (QPalette.ColorRole.ToolTipBase, "popup_bg"),
+    (QPalette.ColorRole.ToolTipText, "text"),
+    (QPalette.ColorRole.Link, "accent"),
+)
+_STATIC_COLOR = "palette-color"
+_STYLE_RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_THEMED_CHROME_SELECTORS = {
+    "tab_bar": "QTabBar#lqRibbonTabBar",
+    "search": "QLineEdit#lqRibbonSearchEdit",
+}
+
+
+def _cached_style_sheet(kind, style, platform_layout, build):
+    # The palette contents are part of the key so edits made through
+    # LqStyle.palette() produce a fresh sheet instead of a stale cached one.
+    style = _coerce_style(style)
+    if platform_layout is not None:
+        platform_layout = _coerce_platform_layout(platform_layout)
+    key = (kind, style, platform_layout, tuple(_STYLE_PALETTES[style].items()))
+    style_sheet = _STYLE_SHEET_CACHE.get(key)
+    if style_sheet is None:
+        if len(_STYLE_SHEET_CACHE) >= _STYLE_SHEET_CACHE_LIMIT:
+            _STYLE_SHEET_CACHE.clear()
+        style_sheet = build(style, platform_layout)
+        _STYLE_SHEET_CACHE[key] = style_sheet
+    return style_sheet
+
+
+def _static_style_sheet(build, platform_layout):
+    # Build with every colour replaced by a marker, then drop the marked
+    # declarations: what is left only depends on the platform layout.
+    palette = {
+        key: _STATIC_COLOR if isinstance(value, str) and value.startswith("#") else value
+        for key, value in _STYLE_PALETTES[RibbonStyle.Office2016Blue].items()
+    }
+    sheet = build(RibbonStyle.Office2016Blue, platform_layout, palette)
+    rules = []
+    for selector, body in _STYLE_RULE_PATTERN.findall(sheet):
+        selector = selector.strip()
+        if any(selector.startswith(prefix) for prefix in _THEMED_CHROME_SELECTORS.values()):
+            continue
+        declarations = [
+            declaration.strip()
+            for declaration in body.split(";")
+            if declaration.strip() and _STATIC_COLOR not in declaration
+        ]
+        if declarations:
+            rules.append(f"{selector} {{ {'; '.join(declarations)}; }}")
+    return "\n".join(rules)
+
+
+def _style_rules(sheet, selector_prefix):
+    return "\n".join(
+        f"{selector.strip()} {{{body}}}"
+        for selector, body in _STYLE_RULE_PATTERN.findall(sheet)
+        if selector.strip().startswith(selector_prefix)
+    )
+
+
 class LqStyle:
     """Ribbon style sheet factory."""
 
@@ -216,7 +298,123 @@ class LqStyle:
 
     @staticmethod
     def get_ribbon_style(style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
-        p = LqStyle.palette(style)
+        return _cached_style_sheet("ribbon", style, platform_layout, LqStyle._build_ribbon_style)
+
+    @staticmethod
+    def get_window_style(style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
+        return _cached_style_sheet("window", style, platform_layout, LqStyle._build_window_style)
+
+    @staticmethod
+    def get_group_style(style=RibbonStyle.Office2016Blue):
+        return _cached_style_sheet("group", style, None, LqStyle._build_group_style)
+
+    @staticmethod
+    def get_button_style(style=RibbonStyle.Office2016Blue):
+        return _cached_style_sheet("button", style, None, LqStyle._build_button_style)
+
+    @staticmethod
+    def get_full_style(style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
+        return _cached_style_sheet("full", style, platform_layout, LqStyle._build_full_style)
+
+    @staticmethod
+    def get_static_style(platform_layout=RibbonPlatformLayout.Classic):
+        """Theme-independent window sheet used with palette theming."""
+        return _cached_style_sheet(
+            "static",
+            RibbonStyle.Office2016Blue,
+            platform_layout,
+            lambda style, layout: "\n".join(
+                _static_style_sheet(build, layout)
+                for build in (
+                    LqStyle._build_window_style,
+                    LqStyle._build_group_style,
+                    LqStyle._build_button_style,
+                )
+            ),
+        )
+
+    @staticmethod
+    def get_static_ribbon_style(platform_layout=RibbonPlatformLayout.Classic):
+        """Theme-independent ribbon bar sheet used with palette theming."""
+        return _cached_style_sheet(
+            "static_ribbon",
+            RibbonStyle.Office2016Blue,
+            platform_layout,
+            lambda style, layout: _static_style_sheet(LqStyle._build_ribbon_style, layout),
+        )
+
+    @staticmethod
+    def get_chrome_style(part, style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
+        """Themed rules for one ribbon chrome part ("tab_bar" or "search")."""
+        selector = _THEMED_CHROME_SELECTORS[part]
+        return _cached_style_sheet(
+            f"chrome_{part}",
+            style,
+            platform_layout,
+            lambda style, layout: _style_rules(LqStyle.get_ribbon_style(style, layout), selector),
+        )
+
+    @staticmethod
+    def qpalette(style=RibbonStyle.Office2016Blue, base=None):
+        """Return a QPalette carrying the style colours for palette theming."""
+        colors = LqStyle.palette(style)
+        palette = QPalette(base) if base is not None else QPalette()
+        for role, key in _PALETTE_ROLE_KEYS:
+            palette.setColor(role, QColor(colors[key]))
+        return palette
+
+    @staticmethod
+    def propagate_palette(root, palette):
+        """Set palette on root and carry its theme roles into style sheet widgets.
+
+        Style sheet polishing pins a widget's palette, so Qt's own propagation
+        stops at those widgets. A child role is updated only while it still
+        matches its parent's previous colour, which keeps deliberate overrides.
+        """
+        roles = [role for role, _key in _PALETTE_ROLE_KEYS]
+        root_previous = root.palette()
+        root.setPalette(palette)
+        root_current = root.palette()
+        previous = {root: root_previous}
+        current = {root: root_current}
+        for widget in root.findChildren(QWidget):
+            parent = widget.parentWidget()
+            if parent not in previous:
+                continue
+            widget_palette = widget.palette()
+            previous[widget] = QPalette(widget_palette)
+            parent_previous, parent_current = previous[parent], current[parent]
+            changed = False
+            for role in roles:
+                color = widget_palette.color(role)
+                if color == parent_previous.color(role):
+                    target = parent_current.color(role)
+                elif color == root_previous.color(role):
+                    target = root_current.color(role)
+                else:
+                    continue
+                if color != target:
+                    widget_palette.setColor(role, target)
+                    changed = True
+            if changed:
+                widget.setPalette(widget_palette)
+            current[widget] = widget_palette
+
+    @staticmethod
+    def clear_style_sheet_cache():
+        _STYLE_SHEET_CACHE.clear()
+
+    @staticmethod
+    def apply_style_sheet(widget, style_sheet):
+        """Set style_sheet on widget unless it is already applied; returns True if set."""
+        if widget.styleSheet() == style_sheet:
+            return False
+        widget.setStyleSheet(style_sheet)
+        return True
+
+    @staticmethod
+    def _build_ribbon_style(style, platform_layout, p=None):
+        p = p or LqStyle.palette(style)
         style = _coerce_style(style)
         platform_layout = _coerce_platform_layout(platform_layout)
         if platform_layout == RibbonPlatformLayout.MacOS:
@@ -367,8 +565,8 @@ class LqStyle:
         """
 
     @staticmethod
-    def get_window_style(style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
-        p = LqStyle.palette(style)
+    def _build_window_style(style, platform_layout, p=None):
+        p = p or LqStyle.palette(style)
         platform_layout = _coerce_platform_layout(platform_layout)
         mac_layout = platform_layout == RibbonPlatformLayout.MacOS
         status_bg = "#f6f6f6" if mac_layout else p["caption_bg"]
@@ -407,8 +605,8 @@ class LqStyle:
         """
 
     @staticmethod
-    def get_group_style(style=RibbonStyle.Office2016Blue):
-        p = LqStyle.palette(style)
+    def _build_group_style(style, platform_layout=None, p=None):
+        p = p or LqStyle.palette(style)
         return f"""
         QGroupBox#lqRibbonGroup {{
             background-color: transparent;
@@ -429,8 +627,8 @@ class LqStyle:
         """
 
     @staticmethod
-    def get_button_style(style=RibbonStyle.Office2016Blue):
-        p = LqStyle.palette(style)
+    def _build_button_style(style, platform_layout=None, p=None):
+        p = p or LqStyle.palette(style)
         return f"""
         QToolButton {{
             background-color: transparent;
@@ -458,6 +656,13 @@ class LqStyle:
             text-align: left;
             qproperty-iconSize: 16px;
         }}
+        QToolButton[buttonStyle="2"] {{
+            padding: 2px;
+            margin: 1px;
+            min-height: 22px;
+            max-height: 24px;
+            qproperty-iconSize: 16px;
+        }}
         QToolButton:hover {{
             background-color: {p["group_hover"]};
             border-color: {p["command_hover_border"]};
@@ -475,7 +680,7 @@ class LqStyle:
         """
 
     @staticmethod
-    def get_full_style(style=RibbonStyle.Office2016Blue, platform_layout=RibbonPlatformLayout.Classic):
+    def _build_full_style(style, platform_layout):
         return "\n".join(
             [
                 LqStyle.get_window_style(style, platform_layout),
@@ -8,6 +8,7 @@ Run with:
 import os
 import sys
 import json
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(
@@ -20,7 +21,7 @@ sys.path.insert(
 )
 
 from PySide6.QtCore import QEvent, Qt
-from PySide6.QtGui import QColor, QMouseEvent
+from PySide6.QtGui import QAction, QColor, QIcon, QMouseEvent
 from PySide6.QtTest import QTest
 from PySide6.QtWidgets import (
     QApplication,
@@ -3552,6 +3553,466 @@ def test_minimization_disabled_blocks_collapse():
     window.close()
 
 
+def test_idle_ribbon_only_filters_tab_bar_events():
+    window, ribbon, *_ = _window()
+    assert ribbon.isScopedEventFilterEnabled()
+    assert not ribbon.isApplicationEventFilterActive()
+    _app().processEvents()
+    ribbon.resetFilteredEventCount()
+    content = window.centralWidget()
+    for _ in range(20):
+        content.update()
+        content.repaint()
+        _app().processEvents()
+    assert ribbon.filteredEventCount() == 0
+
+    ribbon.setRibbonMinimized(True)
+    _click_tab(ribbon, 0)
+    assert ribbon.isApplicationEventFilterActive()
+    ribbon.resetFilteredEventCount()
+    content.repaint()
+    _app().processEvents()
+    assert ribbon.filteredEventCount() > 0
+
+    QTest.mouseClick(content, Qt.MouseButton.LeftButton)
+    _app().processEvents()
+    assert not _temporary_expanded(ribbon)
+    assert not ribbon.isApplicationEventFilterActive()
+    window.close()
+
+
+def test_application_event_filter_mode_can_be_restored():
+    window, ribbon, *_ = _window()
+    ribbon.setScopedEventFilterEnabled(False)
+    assert ribbon.isApplicationEventFilterActive()
+    _double_click_tab(ribbon, 0)
+    assert ribbon.isRibbonMinimized()
+    _double_click_tab(ribbon, 0)
+    assert not ribbon.isRibbonMinimized()
+    ribbon.setScopedEventFilterEnabled(True)
+    assert not ribbon.isApplicationEventFilterActive()
+    window.close()
+
+
+def test_layout_requests_coalesce_on_large_ribbon():
+    window, ribbon, *_ = _window()
+    for page_index in range(15):
+        page = ribbon.addPage(f"Page {page_index}")
+        for group_index in range(10):
+            page.addGroup(f"Group {group_index}").addAction(QIcon(), "Run")
+    _app().processEvents()
+    with patch.object(
+        ribbon, "_apply_group_layout_metrics", wraps=ribbon._apply_group_layout_metrics
+    ) as apply_metrics:
+        for width in range(700, 900, 20):
+            window.resize(width, 420)
+            _app().processEvents()
+        assert apply_metrics.call_count == 0
+        assert ribbon.tabBar().width() == ribbon.width()
+
+        page = ribbon.currentPage()
+        for group_index in range(5):
+            page.addGroup(f"Extra {group_index}")
+        _app().processEvents()
+        assert apply_metrics.call_count == 0
+
+        ribbon.setPlatformLayout(RibbonPlatformLayout.MacOS)
+        ribbon.setPlatformLayout(RibbonPlatformLayout.MacOS)
+        assert apply_metrics.call_count == 1
+    assert page.groups[-1].minimumHeight() == 86
+    window.close()
+
+
+def test_update_transaction_defers_pages_until_commit():
+    window, ribbon, *_ = _window()
+    ribbon.setPlatformLayout(RibbonPlatformLayout.MacOS)
+    _app().processEvents()
+    initial_count = ribbon.count()
+    changes = []
+    ribbon.currentChanged.connect(changes.append)
+
+    with ribbon.updateTransaction() as batch:
+        assert batch is ribbon
+        ribbon.beginUpdate()
+        for page_index in range(5):
+            page = ribbon.addPage(f"Batch {page_index}")
+            for group_index in range(4):
+                page.addGroup(f"Group {group_index}").addAction(QIcon(), "Run")
+        ribbon.endUpdate()
+        assert ribbon.isUpdating()
+        moved = ribbon.page(0)
+        ribbon.movePage(0, ribbon.pageCount() - 1)
+        assert ribbon.pages[-1] is moved and ribbon.pageCount() == initial_count + 5
+        removed = ribbon.addPage("Batch Removed")
+        ribbon.removePage(removed)
+        ribbon.set_page_enabled(ribbon.pageIndex(page), False)
+        first = ribbon.insertPage(initial_count, "Batch First")
+        first.addGroup("Group").addAction(QIcon(), "Run")
+        assert ribbon.isUpdating()
+        assert ribbon.count() == initial_count - 1
+        assert page.groups[0].minimumHeight() != 86
+        assert changes == []
+
+    assert not ribbon.isUpdating()
+    assert ribbon.count() == ribbon.pageCount() == initial_count + 6
+    assert all(ribbon.indexOf(tab_page) == index for index, tab_page in enumerate(ribbon.pages))
+    assert ribbon.pages.index(first) == ribbon.indexOf(first) == initial_count
+    assert ribbon.pages[-1] is moved and removed not in ribbon.pages
+    assert not ribbon.isTabEnabled(ribbon.indexOf(page))
+    assert ribbon.currentWidget() is first
+    assert changes == [initial_count]
+    assert all(group.minimumHeight() == 86 for group in page.groups)
+    ribbon.endUpdate()
+    assert changes == [initial_count]
+    window.close()
+
+
+def test_search_index_tracks_registration_and_action_changes():
+    window, ribbon, *_ = _window()
+    actions = []
+    for index in range(2000):
+        action = QAction(f"Command {index} Item", window)
+        ribbon.registerSearchAction(action, [f"alias{index}"])
+        actions.append(action)
+    format_action = QAction("Format Painter", window)
+    ribbon.registerSearchAction(format_action, ["clone style"])
+    search_index = ribbon.searchIndex()
+
+    assert len(search_index) == len(ribbon.searchActions()) == 2001
+    assert ribbon.searchAction("format painter") is format_action
+    assert ribbon.searchAction("fp") is format_action
+    assert ribbon.searchAction("clone sty") is format_action
+    assert ribbon.searchAction("alias1999") is actions[1999]
+    assert search_index.matches("frmt pntr") == [format_action]
+
+    format_action.setText("Brush Styles")
+    assert ribbon.searchAction("format painter") is None
+    assert ribbon.searchAction("brush") is format_action
+    format_action.setData(["paste formatting"])
+    assert ribbon.searchAction("clone style") is None
+    assert ribbon.searchAction("paste formatting") is format_action
+
+    ribbon.unregisterSearchAction(format_action)
+    assert format_action not in search_index
+    assert ribbon.searchAction("brush") is None
+    format_action.setText("Format Painter")
+    assert search_index.matches("format") == []
+    window.close()
+
+
+def test_ranked_search_orders_by_match_quality_and_recency():
+    window, ribbon, *_ = _window()
+    ribbon.clearRecentSearchActions()
+    texts = [
+        "Margins", "Image Nudge Settings", "Quick Insert",
+        "Inspect Styles", "Inspect Links", "Ins",
+    ]
+    actions = {text: QAction(text, window) for text in texts}
+    for action in actions.values():
+        ribbon.registerSearchAction(action)
+
+    ranked = ribbon.rankedSearchActions("ins")
+    assert [action.text() for action, _score in ranked] == [
+        "Ins", "Inspect Styles", "Inspect Links", "Quick Insert",
+        "Image Nudge Settings", "Margins",
+    ]
+    scores = [score for _action, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert [action.text() for action, _score in ribbon.rankedSearchActions("ins", 2)] == [
+        "Ins", "Inspect Styles",
+    ]
+
+    assert ribbon.triggerSearchAction("Inspect Links")
+    assert ribbon.triggerSearchAction("Margins")
+    assert [action.text() for action, _score in ribbon.rankedSearchActions("insp")] == [
+        "Inspect Links", "Inspect Styles",
+    ]
+    assert ribbon.rankedSearchActions("ins")[-1][0] is actions["Margins"]
+    assert ribbon.searchAction("ins") is actions["Ins"]
+    window.close()
+
+
+def test_scheduled_search_popup_debounces_and_reuses_rows():
+    window, ribbon, *_ = _window()
+    window.show()
+    _app().processEvents()
+    search = ribbon.searchLineEdit()
+    ribbon.setSearchDocumentResults(
+        [f"Report {index}.docx" for index in range(50000)] + ["Quarterly Plan.docx"]
+    )
+    search.setPopupDebounceInterval(10)
+    search.setPopupSliceInterval(1)
+
+    def settle():
+        for _attempt in range(500):
+            if not search.isPopupPending():
+                break
+            QTest.qWait(5)
+        assert not search.isPopupPending()
+
+    search.schedulePopup("rep")
+    search.schedulePopup("quart")
+    assert search.isPopupPending()
+    assert search._popup_query != "quart"
+    settle()
+    rows = [action.text() for action in search._popup.actions()]
+    assert search._popup_query == "quart"
+    assert rows[:2] == ["Document Results", "Quarterly Plan.docx"]
+    assert not any(row.startswith("Report") for row in rows)
+    leading = search._popup.actions()[:2]
+
+    search.schedulePopup("quarterly")
+    settle()
+    assert search._popup.actions()[:2] == leading
+    assert search._popup.actions()[-1].text().endswith('"quarterly"')
+    search.showPopup("quarterly")
+    assert search._popup.actions()[:2] == leading
+    search.closePopup()
+
+    def endless_documents(query, limit):
+        index = 0
+        while True:
+            index += 1
+            yield f"{query} {index}"
+
+    search.setMaxSearchItemCount(10 ** 9)
+    ribbon.setSearchDocumentProvider(endless_documents)
+    search.schedulePopup("draft")
+    QTest.qWait(50)
+    assert search.isPopupPending()
+    window.close()
+    window.deleteLater()
+    _app().sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    QTest.qWait(20)
+
+
+def test_search_result_providers_stream_and_stop_at_item_limit():
+    import asyncio
+    import sqlite3
+
+    from LqRibbon import LqRibbonSqliteSearchProvider
+
+    window, ribbon, *_ = _window()
+    window.show()
+    _app().processEvents()
+    search = ribbon.searchLineEdit()
+    search.setMaxSearchItemCount(8)
+    search.setPopupDebounceInterval(0)
+    consumed = []
+
+    def documents(query, limit):
+        for index in range(1000):
+            consumed.append(index)
+            yield f"{query} draft {index}"
+
+    database = sqlite3.connect(":memory:")
+    database.execute("CREATE VIRTUAL TABLE files USING fts5(path)")
+    database.executemany(
+        "INSERT INTO files VALUES (?)",
+        [("budget/quarterly.xlsx",), ("notes/quarter close.md",), ("misc/readme.txt",)],
+    )
+    ribbon.setSearchDocumentProvider(documents)
+    ribbon.setSearchRelatedFilesProvider(
+        LqRibbonSqliteSearchProvider(database, "files", "path")
+    )
+
+    search.showPopup("quarter")
+    rows = [action.text() for action in search._popup.actions()]
+    assert rows[:5] == ["Document Results"] + [f"quarter draft {index}" for index in range(4)]
+    assert len(consumed) <= 5
+    assert rows[5] == "Related Files"
+    assert set(rows[6:8]) == {"budget/quarterly.xlsx", "notes/quarter close.md"}
+
+    class AsyncFiles:
+        async def search(self, query, limit):
+            for name in ("alpha", "beta", "gamma", "delta", "omega"):
+                await asyncio.sleep(0.001)
+                yield f"{name} {query}.txt"
+
+    ribbon.setSearchDocumentProvider(None)
+    ribbon.setSearchRelatedFilesProvider(AsyncFiles())
+    search.schedulePopup("plan")
+    for _attempt in range(500):
+        if not search.isPopupPending():
+            break
+        QTest.qWait(5)
+    rows = [action.text() for action in search._popup.actions()]
+    assert rows[:5] == [
+        "Related Files", "alpha plan.txt", "beta plan.txt", "gamma plan.txt", "delta plan.txt",
+    ]
+    assert "omega plan.txt" not in rows
+    search.closePopup()
+    window.close()
+
+
+def test_simplified_mode_reuses_buttons_and_overflows_by_width():
+    window, ribbon, *_ = _window()
+    page = ribbon.page(0)
+    icon = window.style().standardIcon(window.style().StandardPixmap.SP_DialogApplyButton)
+    for index in range(3):
+        group = page.addGroup(f"Tools {index}")
+        for command in range(4):
+            group.addAction(icon, f"Tool {index}.{command}")
+    hidden_group = ribbon.page(1).groups[0]
+    buttons = [button for group in page.groups for button in group.buttons]
+    ribbon.setCurrentIndex(0)
+    window.resize(1600, 420)
+    _app().processEvents()
+
+    ribbon.setSimplifiedMode(True)
+    for _ in range(3):
+        _app().processEvents()
+    assert all(group.simplifiedMode() for group in page.groups)
+    assert not hidden_group.simplifiedMode()
+    assert [button for group in page.groups for button in group.buttons] == buttons
+    assert all(
+        button.toolButtonStyle() == Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+        for button in buttons
+    )
+    assert not any(group.title_label.isVisible() for group in page.groups)
+    assert all(group.geometry().bottom() < page.height() for group in page.groups)
+    overflow_button = page.findChild(QToolButton, "lqRibbonPageOverflowButton")
+    assert overflow_button is None or not overflow_button.isVisible()
+
+    window.resize(500, 420)
+    _app().processEvents()
+    overflow_button = page.findChild(QToolButton, "lqRibbonPageOverflowButton")
+    assert overflow_button.isVisible()
+    hidden = [button for button in buttons if not button.isVisible()]
+    assert hidden and hidden == buttons[len(buttons) - len(hidden):]
+    page.overflowMenu().aboutToShow.emit()
+    overflow_actions = [
+        action for action in page.overflowMenu().actions() if not action.isSeparator()
+    ]
+    assert overflow_actions == [button.defaultAction() for button in hidden]
+
+    counts = dict(page._overflow_cache)
+    window.resize(1600, 420)
+    _app().processEvents()
+    window.resize(500, 420)
+    _app().processEvents()
+    assert page._overflow_cache == counts
+    assert hidden == [button for button in buttons if not button.isVisible()]
+
+    ribbon.setCurrentIndex(1)
+    _app().processEvents()
+    assert hidden_group.simplifiedMode()
+
+    ribbon.setSimplifiedMode(False)
+    ribbon.setCurrentIndex(0)
+    window.resize(1600, 420)
+    _app().processEvents()
+    assert not any(group.simplifiedMode() for group in page.groups)
+    assert all(button.isVisible() for button in buttons)
+    assert all(
+        button.toolButtonStyle() == Qt.ToolButtonStyle.ToolButtonTextUnderIcon
+        for button in buttons
+    )
+    assert not overflow_button.isVisible()
+    window.close()
+
+
+def test_simplified_overflow_keeps_application_hidden_commands():
+    window, ribbon, *_ = _window()
+    page = ribbon.page(0)
+    icon = window.style().standardIcon(window.style().StandardPixmap.SP_DialogApplyButton)
+    for index in range(3):
+        group = page.addGroup(f"Tools {index}")
+        for command in range(4):
+            group.addAction(icon, f"Tool {index}.{command}")
+    hidden_group = page.groups[-2]
+    hidden_group.hide()
+    hidden_button = page.groups[-1].buttons[1]
+    hidden_button.hide()
+    ribbon.setCurrentIndex(0)
+    window.resize(1600, 420)
+    _app().processEvents()
+
+    ribbon.setSimplifiedMode(True)
+    for _ in range(3):
+        _app().processEvents()
+    items, _ = page._overflow_layout()
+    assert hidden_button not in [widget for _, widget in items]
+    assert hidden_group not in [group for group, _ in items]
+
+    window.resize(300, 420)
+    _app().processEvents()
+    window.resize(1600, 420)
+    _app().processEvents()
+    assert hidden_button.isHidden() and hidden_group.isHidden()
+    assert all(
+        button.isVisible()
+        for group in page.groups
+        if group is not hidden_group
+        for button in group.buttons
+        if button is not hidden_button
+    )
+
+    ribbon.setSimplifiedMode(False)
+    _app().processEvents()
+    assert hidden_button.isHidden() and hidden_group.isHidden()
+    window.close()
+
+
+def test_async_search_providers_stream_without_blocking_and_log_errors():
+    import asyncio
+    import threading
+    import unittest
+
+    window, ribbon, *_ = _window()
+    window.show()
+    _app().processEvents()
+    search = ribbon.searchLineEdit()
+    search.setMaxSearchItemCount(8)
+    threads_before = set(threading.enumerate())
+    gate = threading.Event()
+    release = threading.Timer(5.0, gate.set)
+    release.start()
+
+    class GatedFiles:
+        async def search(self, query, limit):
+            while not gate.is_set():
+                await asyncio.sleep(0.001)
+            for name in ("alpha", "beta"):
+                yield f"{name} {query}.txt"
+
+    ribbon.setSearchRelatedFilesProvider(GatedFiles())
+    search.showPopup("plan")
+    assert not gate.is_set()
+    assert search.isPopupPending()
+    assert "alpha plan.txt" not in [action.text() for action in search._popup.actions()]
+    gate.set()
+    release.cancel()
+    for _attempt in range(500):
+        if not search.isPopupPending():
+            break
+        QTest.qWait(5)
+    rows = [action.text() for action in search._popup.actions()]
+    assert rows[:3] == ["Related Files", "alpha plan.txt", "beta plan.txt"]
+
+    class BrokenFiles:
+        async def search(self, query, limit):
+            yield f"first {query}.txt"
+            raise ValueError("index offline")
+
+    ribbon.setSearchRelatedFilesProvider(BrokenFiles())
+    with unittest.TestCase().assertLogs("LqRibbonPy.lq_ribbon_extras", "ERROR") as logs:
+        search.schedulePopup("plan")
+        for _attempt in range(500):
+            if not search.isPopupPending():
+                break
+            QTest.qWait(5)
+    assert "index offline" in "\n".join(logs.output)
+    assert "first plan.txt" in [action.text() for action in search._popup.actions()]
+    workers = [
+        thread for thread in set(threading.enumerate()) - threads_before
+        if thread.name == "LqRibbonSearchWorker"
+    ]
+    assert len(workers) == 1
+    search.closePopup()
+    window.close()
+
+
 def main():
     _app()
     tests = [
@@ -3678,6 +4139,17 @@ def main():
         test_double_click_temporary_expanded_tab_restores_permanently,
         test_collapsed_click_other_page_temporarily_expands_selected_page,
         test_minimization_disabled_blocks_collapse,
+        test_idle_ribbon_only_filters_tab_bar_events,
+        test_application_event_filter_mode_can_be_restored,
+        test_layout_requests_coalesce_on_large_ribbon,
+        test_update_transaction_defers_pages_until_commit,
+        test_search_index_tracks_registration_and_action_changes,
+        test_ranked_search_orders_by_match_quality_and_recency,
+        test_scheduled_search_popup_debounces_and_reuses_rows,
+        test_search_result_providers_stream_and_stop_at_item_limit,
+        test_async_search_providers_stream_without_blocking_and_log_errors,
+        test_simplified_mode_reuses_buttons_and_overflows_by_width,
+        test_simplified_overflow_keeps_application_hidden_commands,
     ]
     for test in tests:
         test()
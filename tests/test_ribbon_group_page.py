@@ -4,20 +4,44 @@ Smoke tests for Ribbon group/page mutation helpers.
 
 import os
 import sys
+import tracemalloc
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import QEvent, QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QAction, QColor, QIcon, QImage, QPainter, QPixmap
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QComboBox, QLabel, QToolButton
 
-from LqRibbon import LqRibbonGroup, LqRibbonPage
+from LqRibbon import (
+    LqRibbonBar,
+    LqRibbonButtonControl,
+    LqRibbonControlSizeDefinition,
+    LqRibbonGallery,
+    LqRibbonGalleryGroup,
+    LqRibbonGalleryItem,
+    LqRibbonGroup,
+    LqRibbonPage,
+    LqRibbonThumbnailCache,
+    LqRibbonToolBarControl,
+    RibbonMainWindow,
+    RibbonPlatformLayout,
+)
 
 
 def _group_titles(page):
     return [str(group.title) for group in page.groups]
 
 
+def _dispose(*widgets):
+    """Close and delete widgets now so their teardown does not run in a later test."""
+    for widget in widgets:
+        widget.close()
+        widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
 def test_insert_existing_group_keeps_requested_order():
     page = LqRibbonPage("Home")
     one = page.addGroup("One")
@@ -54,3 +78,635 @@ def test_group_clear_removes_all_action_widgets():
     assert group.controlByAction(custom_action) is None
     assert group.main_layout.indexOf(custom_widget) == -1
     group.deleteLater()
+
+
+def _classic_ribbon():
+    ribbon = LqRibbonBar()
+    ribbon.setPlatformLayout(RibbonPlatformLayout.Classic)
+    return ribbon
+
+
+def _build_page(ribbon, group_count):
+    page = ribbon.addPage("Home")
+    for index in range(group_count):
+        page.addGroup(f"Group {index}").addAction(QIcon(), "Run")
+    return page
+
+
+def test_group_metrics_scale_linearly_with_group_count():
+    small = _classic_ribbon()
+    large = _classic_ribbon()
+    with patch.object(
+        small, "_apply_group_metrics", wraps=small._apply_group_metrics
+    ) as small_metrics, patch.object(
+        large, "_apply_group_metrics", wraps=large._apply_group_metrics
+    ) as large_metrics:
+        _build_page(small, 50)
+        page = _build_page(large, 200)
+
+        assert small_metrics.call_count == 50
+        assert large_metrics.call_count == 200
+        page.updateLayout()
+        large.setPlatformLayout(RibbonPlatformLayout.Classic)
+        assert large_metrics.call_count == 200
+
+        large.setPlatformLayout(RibbonPlatformLayout.MacOS)
+        assert large_metrics.call_count == 400
+        large.updateLayout()
+        assert large_metrics.call_count == 600
+    assert all(group.title_label.height() == 16 for group in page.groups)
+    small.deleteLater()
+    large.deleteLater()
+
+
+def test_lazy_pages_build_on_first_activation_or_search():
+    ribbon = LqRibbonBar()
+    built = []
+
+    def factory(page):
+        built.append(page.title())
+        group = page.addGroup("Commands")
+        action = group.addAction(QIcon(), f"{page.title()} Command")
+        ribbon.registerSearchAction(action)
+
+    pages = [
+        ribbon.addLazyPage(f"Tab {index}", factory, lambda index=index: [f"Tab {index} Command"])
+        for index in range(17)
+    ]
+    pages.append(ribbon.addLazyPage("Tab 17", factory))
+
+    assert ribbon.count() == 18
+    assert built == ["Tab 0"]
+    assert ribbon.currentWidget() is pages[0]
+    assert not pages[1].isMaterialized()
+    assert not hasattr(pages[1], "scroll_area")
+
+    ribbon.setCurrentIndex(5)
+    assert built == ["Tab 0", "Tab 5"]
+    assert pages[5].groupCount() == 1
+    assert not pages[5].materialize()
+
+    assert ribbon.searchAction("Missing Command") is None
+    assert ribbon.searchAction("Tab 17 Command") is None
+    assert built == ["Tab 0", "Tab 5"]
+
+    action = ribbon.searchAction("Tab 3 Command")
+    assert action is not None and action.text() == "Tab 3 Command"
+    assert built == ["Tab 0", "Tab 5", "Tab 3"]
+    assert not pages[1].isMaterialized()
+    assert not pages[17].isMaterialized()
+
+    assert pages[17].lazySearchTerms() == ["Tab 17"]
+    action = ribbon.searchAction("Tab 17")
+    assert action is not None and action.text() == "Tab 17 Command"
+    assert built == ["Tab 0", "Tab 5", "Tab 3", "Tab 17"]
+    assert not pages[1].isMaterialized()
+    ribbon.deleteLater()
+
+
+def test_virtualized_gallery_paints_cells_without_item_widgets():
+    group = LqRibbonGalleryGroup()
+    for index in range(5000):
+        group.addItem(f"Style {index}")
+    group.item(3).setVisible(False)
+    gallery = LqRibbonGallery()
+    gallery.setVirtualized(True)
+    gallery.setColumnCount(4)
+    gallery.setRowCount(3)
+    gallery.setGalleryGroup(group)
+    gallery.resize(gallery.sizeHint())
+    gallery.show()
+    QApplication.processEvents()
+    clicked = []
+    gallery.itemClicked.connect(clicked.append)
+
+    assert gallery.findChildren(QToolButton) == []
+    assert gallery.totalRowCount() == 1250
+    assert gallery.maxScrollRow() == 1247
+    first = gallery.visualRect(0)
+    assert gallery.itemAt(first.center()) == 0
+    assert gallery.itemAt(gallery.visualRect(4).center()) == 4
+    assert gallery.visualRect(3).isNull()
+    assert gallery.itemAt(QPoint(first.right() + 2, first.center().y())) == -1
+
+    gallery.ensureVisible(4000)
+    assert gallery.scrollRow() == (3999 // 4) - 2
+    rect = gallery.visualRect(4000)
+    QTest.mouseClick(gallery, Qt.MouseButton.LeftButton, pos=rect.center())
+    assert [item.caption() for item in clicked] == ["Style 4000"]
+    assert gallery.checkedIndex() == 4000
+
+    gallery.setVirtualized(False)
+    QApplication.processEvents()
+    buttons = gallery.findChildren(QToolButton)
+    assert len(buttons) == 12
+    assert [button.text() for button in buttons if button.isChecked()] == ["Style 4000"]
+    _dispose(gallery)
+
+
+def test_gallery_group_batches_changes_and_updates_views_incrementally():
+    group = LqRibbonGalleryGroup()
+    gallery = LqRibbonGallery()
+    with patch.object(gallery, "updateLayout", wraps=gallery.updateLayout) as rebuilds:
+        gallery.setGalleryGroup(group)
+        events = []
+        group.itemsInserted.connect(lambda first, last: events.append(("inserted", first, last)))
+        group.itemsRemoved.connect(lambda first, last: events.append(("removed", first, last)))
+        group.itemChanged.connect(lambda index: events.append(("changed", index)))
+        group.modelReset.connect(lambda: events.append(("reset",)))
+
+        items = group.addItems(f"Item {index}" for index in range(5000))
+        for index in range(1000):
+            group.addItem(f"Extra {index}")
+        assert events[0] == ("inserted", 0, 4999)
+        assert events[-1] == ("inserted", 5999, 5999)
+        assert rebuilds.call_count == 2
+        assert items[4321].getIndex() == 4321
+
+        group.insertItem(0, LqRibbonGalleryItem("Front"))
+        assert items[4321].getIndex() == 4322
+        assert rebuilds.call_count == 3
+        assert gallery._buttons[0].text() == "Front"
+        group.item(100).setCaption("Far away")
+        assert rebuilds.call_count == 3
+        group.item(2).setCaption("Renamed")
+        assert events[-1] == ("changed", 2)
+        assert rebuilds.call_count == 4
+
+        front = group.takeItem(0)
+        assert front.getIndex() == -1
+        assert items[0].getIndex() == 0
+        assert events[-1] == ("removed", 0, 0)
+
+        events.clear()
+        group.beginReset()
+        group.addItems(["One", "Two"])
+        group.remove(0)
+        group.item(0).setCaption("First")
+        group.endReset()
+        assert events == [("reset",)]
+        assert group.itemCount() == 6001
+    _dispose(gallery)
+
+
+class _DictGalleryItem:
+    """The gallery item layout before slots: own QIcon and role dict per item."""
+
+    def __init__(self, caption, icon=None):
+        self._caption = str(caption)
+        self._icon = icon if isinstance(icon, QIcon) else QIcon(icon or "")
+        self._tool_tip = ""
+        self._status_tip = ""
+        self._data = {}
+        self._index = -1
+        self._separator = False
+        self._enabled = True
+        self._visible = True
+
+
+def _allocated_bytes(factory, count):
+    tracemalloc.start()
+    try:
+        items = [factory(f"Font {index}") for index in range(count)]
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(items) == count
+    return size
+
+
+def test_slotted_gallery_items_use_less_memory_than_dict_items():
+    item = LqRibbonGalleryItem("Plain")
+    assert not hasattr(item, "__dict__")
+    assert item.icon() is LqRibbonGalleryItem("Other").icon()
+    assert item.icon().isNull()
+    assert item.data() is None and item._data is None
+    item.setData(Qt.ItemDataRole.UserRole, "Arial")
+    assert item.data() == "Arial"
+    item.setVisible(False)
+    item.setSeparator(True)
+    assert not item.isVisible() and item.isSeparator() and item.isEnabled()
+
+    slotted = _allocated_bytes(LqRibbonGalleryItem, 10000)
+    legacy = _allocated_bytes(_DictGalleryItem, 10000)
+    assert slotted < legacy * 0.6
+
+
+def test_gallery_thumbnails_decode_in_background_into_shared_lru_cache(tmp_path):
+    paths = []
+    for index, color in enumerate(("red", "green", "blue")):
+        image = QImage(400, 300, QImage.Format.Format_RGB32)
+        image.fill(QColor(color))
+        path = str(tmp_path / f"template{index}.png")
+        assert image.save(path)
+        paths.append(path)
+    rendered = []
+
+    def render(size):
+        rendered.append(QSize(size))
+        image = QImage(size, QImage.Format.Format_RGB32)
+        image.fill(QColor("yellow"))
+        return image
+
+    cache = LqRibbonThumbnailCache()
+    group = LqRibbonGalleryGroup()
+    for index, path in enumerate(paths):
+        group.addThumbnailItem(f"Template {index}", path)
+    group.addThumbnailItem("Generated", render)
+    gallery = LqRibbonGallery()
+    gallery.setVirtualized(True)
+    gallery.setThumbnailCache(cache)
+    gallery.setGalleryGroup(group)
+    gallery.resize(gallery.sizeHint())
+    gallery.show()
+    QApplication.processEvents()
+
+    size = QSize(64, 32)
+    assert all(cache.isPending(path, size) or cache.contains(path, size) for path in paths)
+    assert cache.waitForDone(5000)
+    QApplication.processEvents()
+    assert cache.count() == 4
+    assert rendered == [size]
+    thumbnail = cache.thumbnail(paths[0], size)
+    assert thumbnail.size() == QSize(42, 32)
+    assert thumbnail.pixelColor(10, 10) == QColor("red")
+
+    buttons_gallery = LqRibbonGallery()
+    buttons_gallery.setThumbnailCache(cache)
+    buttons_gallery.setGalleryGroup(group)
+    assert all(not button.icon().isNull() for button in buttons_gallery._buttons)
+    assert rendered == [size]
+
+    cache.setMaxCost(thumbnail.sizeInBytes() * 3)
+    assert cache.count() == 4
+    gallery.hide()
+    QApplication.processEvents()
+    cache.thumbnail(paths[2], size)
+    QApplication.processEvents()
+    assert cache.count() == 2
+    assert cache.contains(paths[2], size)
+    assert not cache.contains(paths[0], size)
+    _dispose(gallery, buttons_gallery)
+
+
+def test_gallery_keeps_visible_thumbnails_cached_above_max_cost():
+    rendered = []
+
+    def source(color):
+        def render(size):
+            rendered.append(color)
+            image = QImage(size, QImage.Format.Format_RGB32)
+            image.fill(QColor(color))
+            return image
+
+        return render
+
+    colors = ("red", "green", "blue", "magenta")
+    sources = [source(color) for color in colors]
+    size = QSize(64, 32)
+    cache = LqRibbonThumbnailCache(max_cost=QImage(size, QImage.Format.Format_RGB32).sizeInBytes())
+    group = LqRibbonGalleryGroup()
+    for color, render in zip(colors, sources):
+        group.addThumbnailItem(color, render)
+    gallery = LqRibbonGallery()
+    gallery.setVirtualized(True)
+    gallery.setThumbnailCache(cache)
+    gallery.setGalleryGroup(group)
+    gallery.resize(gallery.sizeHint())
+    gallery.show()
+    for _ in range(10):
+        QApplication.processEvents()
+        assert cache.waitForDone(5000)
+        gallery.repaint()
+
+    assert sorted(rendered) == sorted(colors)
+    assert cache.count() == len(colors)
+    assert cache.totalCost() > cache.maxCost()
+    assert not any(cache.isPending(render, size) for render in sources)
+    _dispose(gallery)
+
+
+def test_gallery_items_from_map_share_one_masked_atlas():
+    colors = [QColor("red"), QColor("green"), QColor("blue"), QColor("magenta")]
+    sheet = QPixmap(64, 16)
+    painter = QPainter(sheet)
+    for index, color in enumerate(colors):
+        painter.fillRect(QRect(index * 16, 0, 16, 16), color)
+    painter.fillRect(QRect(32, 0, 4, 4), QColor("magenta"))
+    painter.end()
+
+    group = LqRibbonGalleryGroup()
+    items = [
+        group.addItemFromMap(f"Symbol {index}", index % 4, sheet, QSize(16, 16), QColor("magenta"))
+        for index in range(400)
+    ]
+    atlas = items[0].atlas()
+    assert all(item.atlas() is atlas for item in items)
+    assert atlas.count() == 4
+    assert items[6].mapIndex() == 2
+    assert atlas.sourceRect(2) == QRect(32, 0, 16, 16)
+    assert not atlas.pixmap().mask().isNull()
+    icon_image = items[2].icon().pixmap(16, 16).toImage()
+    assert icon_image.pixelColor(8, 8) == QColor("blue")
+    assert icon_image.pixelColor(1, 1).alpha() == 0
+    assert items[6].icon().cacheKey() == items[2].icon().cacheKey()
+    atlas.setIconCacheLimit(2)
+    first_key = items[0].icon().cacheKey()
+    items[1].icon()
+    items[2].icon()
+    assert len(atlas._icons) == 2
+    assert items[0].icon().cacheKey() != first_key
+    assert items[0].icon().pixmap(16, 16).toImage().pixelColor(8, 8) == colors[0]
+
+    gallery = LqRibbonGallery()
+    gallery.setVirtualized(True)
+    gallery.setGalleryGroup(group)
+    gallery.resize(gallery.sizeHint())
+    frame = gallery.grab().toImage()
+    center = gallery.visualRect(1).center()
+    assert frame.pixelColor(center.x(), gallery.visualRect(1).top() + 12) == QColor("green")
+    _dispose(gallery)
+
+
+def test_gallery_scroll_buttons_reuse_cells_and_popup_shares_the_group():
+    group = LqRibbonGalleryGroup()
+    group.addItems(f"Style {index}" for index in range(10000))
+    gallery = LqRibbonGallery()
+    gallery.setGalleryGroup(group)
+    gallery.setScrollButtonsVisible(True)
+    gallery.resize(gallery.sizeHint())
+    gallery.show()
+    QApplication.processEvents()
+
+    cells = list(gallery._buttons)
+    scroll_up = gallery.findChild(QToolButton, "lqRibbonGalleryScrollUp")
+    scroll_down = gallery.findChild(QToolButton, "lqRibbonGalleryScrollDown")
+    assert not scroll_up.isEnabled()
+    scroll_down.click()
+    scroll_down.click()
+    assert gallery.scrollRow() == 2
+    assert gallery._buttons == cells
+    assert gallery._buttons[0].text() == "Style 8"
+    assert scroll_up.isEnabled()
+    gallery.setScrollRow(gallery.maxScrollRow())
+    assert not scroll_down.isEnabled()
+    assert gallery._buttons[-1].text() == "Style 9999"
+
+    gallery.findChild(QToolButton, "lqRibbonGalleryExpand").click()
+    QApplication.processEvents()
+    popup = gallery.popupGallery()
+    assert gallery.isPopupVisible()
+    assert popup.gallery.galleryGroup() is group
+    assert group.itemCount() == 10000
+    assert popup.gallery.isVirtualized()
+    assert popup.findChildren(QToolButton) == []
+    assert gallery._buttons == cells
+    assert popup.scroll_bar.value() == popup.gallery.scrollRow() == popup.gallery.maxScrollRow()
+
+    popup.scroll_bar.setValue(0)
+    assert popup.gallery.scrollRow() == 0
+    rect = popup.gallery.visualRect(5)
+    QTest.mouseClick(popup.gallery, Qt.MouseButton.LeftButton, pos=rect.center())
+    assert not gallery.isPopupVisible()
+    assert gallery.checkedIndex() == 5
+    assert gallery.scrollRow() == 1
+    assert gallery.popupGallery() is popup
+    _dispose(gallery)
+
+
+def test_groups_reduce_right_to_left_from_precomputed_width_tables():
+    sizes = LqRibbonControlSizeDefinition
+    window = RibbonMainWindow()
+    page = window.ribbonBar().addPage("Home")
+    for index in range(4):
+        group = page.addGroup(f"Group {index}")
+        for command in range(3):
+            group.addAction(QIcon(), f"Command {index}.{command}")
+        for command in range(2):
+            group.add_action(
+                QIcon(), f"Small {index}.{command}", Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+            )
+    window.resize(1600, 500)
+    window.show()
+    QApplication.processEvents()
+
+    table = page.groups[0].widthTable()
+    assert [size for size, _ in table] == [
+        sizes.GroupLarge,
+        sizes.GroupMedium,
+        sizes.GroupSmall,
+        sizes.GroupPopup,
+    ]
+    assert [width for _, width in table] == sorted((width for _, width in table), reverse=True)
+    assert not any(group.isReduced() for group in page.groups)
+    buttons = list(page.groups[3].buttons)
+
+    # Measuring leaves the laid out group untouched.
+    laid_out = [(button.toolButtonStyle(), button.geometry()) for button in page.groups[0].buttons]
+    page.groups[0].invalidateWidthTable()
+    assert page.groups[0].widthTable() == table
+    QApplication.processEvents()
+    assert [
+        (button.toolButtonStyle(), button.geometry()) for button in page.groups[0].buttons
+    ] == laid_out
+
+    full = sum(group.widthTable()[0][1] for group in page.groups)
+    window.resize(full - table[0][1] + table[1][1] - 20, 500)
+    QApplication.processEvents()
+    assert [group.currentSize() for group in page.groups] == [
+        sizes.GroupLarge,
+        sizes.GroupLarge,
+        sizes.GroupMedium,
+        sizes.GroupMedium,
+    ]
+    medium_style = page.groups[3].buttons[0].toolButtonStyle()
+    assert medium_style == Qt.ToolButtonStyle.ToolButtonTextBesideIcon
+    assert page.groups[3].width() == page.groups[3].widthTable()[1][1]
+
+    window.resize(300, 500)
+    QApplication.processEvents()
+    assert all(group.currentSize() == sizes.GroupPopup for group in page.groups)
+    assert not page.groups[3].title_label.isVisible()
+    popup_button = page.groups[3].findChild(QToolButton, "lqRibbonGroupPopupButton")
+    popup_button.click()
+    popup = page.groups[3].reducedPopup()
+    assert popup.isVisible()
+    assert buttons[0].parentWidget() is popup and buttons[0].isVisible()
+    popup.hide()
+
+    window.resize(1600, 500)
+    QApplication.processEvents()
+    assert not any(group.isReduced() for group in page.groups)
+    assert list(page.groups[3].buttons) == buttons
+    assert buttons[0].parentWidget() is page.groups[3] and buttons[0].isVisible()
+    assert buttons[0].toolButtonStyle() == Qt.ToolButtonStyle.ToolButtonTextUnderIcon
+    for size, width in table:
+        page.groups[0].setCurrentSize(size)
+        assert page.groups[0].sizeHint().width() == width
+    _dispose(window)
+
+
+def test_control_size_definitions_keep_the_application_state():
+    sizes = LqRibbonControlSizeDefinition
+    window = RibbonMainWindow()
+    group = window.ribbonBar().addPage("Home").addGroup("Font")
+    control = LqRibbonButtonControl()
+    control.setLabel("Bold")
+    control.sizeDefinition(sizes.GroupMedium).setEnabled(False)
+    control.sizeDefinition(sizes.GroupSmall).setVisible(False)
+    group.addControl(control)
+    window.show()
+    QApplication.processEvents()
+
+    control.setEnabled(False)
+    group.setCurrentSize(sizes.GroupMedium)
+    group.setCurrentSize(sizes.GroupLarge)
+    assert not control.isEnabled()
+    control.setEnabled(True)
+    group.setCurrentSize(sizes.GroupMedium)
+    assert not control.isEnabled()
+
+    group.setCurrentSize(sizes.GroupSmall)
+    assert control.isEnabled() and control.isHidden()
+    control.show()
+    assert control.isHidden()
+    group.setCurrentSize(sizes.GroupLarge)
+    assert control.isVisible()
+
+    control.hide()
+    for size in (sizes.GroupSmall, sizes.GroupPopup, sizes.GroupLarge):
+        group.setCurrentSize(size)
+        assert control.isHidden()
+    control.show()
+    assert control.isVisible()
+    _dispose(window)
+
+
+def test_group_and_button_size_hints_are_cached_until_content_changes():
+    window = RibbonMainWindow()
+    page = window.ribbonBar().addPage("Home")
+    group = page.addGroup("Clipboard")
+    action = group.addAction(QIcon(), "Paste")
+    button = group.controlByAction(action)
+    window.resize(900, 500)
+    window.show()
+    QApplication.processEvents()
+
+    group.sizeHint()
+    button.sizeHint()
+    group_hint = group._size_hint
+    button_hint = button._size_hint
+    for width in range(880, 700, -20):
+        window.resize(width, 500)
+        QApplication.processEvents()
+    assert group._size_hint is group_hint
+    assert button._size_hint is button_hint
+    assert group.sizeHint() == group_hint and group.sizeHint() is not group_hint
+
+    action.setText("Paste Special With Formatting")
+    assert button._size_hint is None
+    QApplication.processEvents()
+    QApplication.processEvents()
+    assert button.sizeHint().width() > button_hint.width()
+    assert group.width() > group_hint.width()
+
+    button.sizeHint()
+    button.setSimplifiedMode(True)
+    assert button._size_hint is None
+    assert button.sizeHint() == QToolButton.sizeHint(button)
+    _dispose(window)
+
+
+def test_toolbar_control_moves_trailing_actions_into_a_persistent_overflow_menu():
+    control = LqRibbonToolBarControl()
+    actions = [control.addAction(f"Format {index}") for index in range(6)]
+    actions.append(control.addSeparator())
+    combo = QComboBox()
+    actions.append(control.addWidget(combo))
+    full_width = control.sizeHint().width()
+    control.resize(full_width, 30)
+    control.show()
+    QApplication.processEvents()
+    menu = control.overflowMenu()
+    assert control.overflowMenu() is menu
+    assert control.isOverflowMenuIsEmpty() and control.overflowCount() == 0
+
+    toolbar_right = control.toolbar.layout().contentsMargins().right()
+    separator_right = control.toolbar.widgetForAction(actions[6]).geometry().right()
+    overflow_button = control.findChild(QToolButton, "lqRibbonToolBarOverflowButton")
+    button_width = overflow_button.sizeHint().width()
+
+    control.resize(full_width // 2, 30)
+    QApplication.processEvents()
+    kept = control.toolbar.actions()
+    overflowed = menu.actions()
+    assert not control.isOverflowMenuIsEmpty()
+    assert kept + overflowed == actions and control.overflowCount() == len(overflowed)
+    assert combo.parent() is menu
+    assert not control.toolbar.findChild(QToolButton, "qt_toolbar_ext_button").isVisible()
+
+    control.resize(full_width, 30)
+    QApplication.processEvents()
+    control.resize(full_width // 2, 30)
+    QApplication.processEvents()
+    assert control.toolbar.actions() == kept and menu.actions() == overflowed
+
+    # A cut next to the separator leaves it in neither the toolbar nor the menu.
+    for right in (separator_right, separator_right - 1):
+        control.resize(right + 1 + toolbar_right + button_width, 30)
+        QApplication.processEvents()
+        assert control.toolbar.actions() == actions[:6]
+        assert menu.actions() == actions[7:] and control.overflowCount() == 1
+        assert not control.toolbar.findChild(QToolButton, "qt_toolbar_ext_button").isVisible()
+
+    control.resize(full_width, 30)
+    QApplication.processEvents()
+    assert control.isOverflowMenuIsEmpty() and combo.parent() is control.toolbar
+    actions[0].setText("Format with a much longer label")
+    QApplication.processEvents()
+    assert control.sizeHint().width() > full_width
+    assert control.overflowCount() > 0
+    control.clear()
+    assert control.isOverflowMenuIsEmpty() and not control.toolbar.actions()
+    _dispose(control)
+
+
+def test_group_action_and_button_lookups_follow_text_changes_and_removal():
+    group = LqRibbonGroup("Tools")
+    actions = [group.addAction(QIcon(), f"Command {index}") for index in range(300)]
+    duplicate = group.addAction(QIcon(), "Command 7")
+    custom_widget = QLabel("custom")
+    custom_action = group.addWidget(QIcon(), "Custom", custom_widget)
+
+    assert group.get_action("Command 7") is actions[7]
+    assert group.get_button("Command 250") is group.controlByAction(actions[250])
+    assert group.get_action("Custom") is custom_action and group.get_button("Custom") is None
+    group.set_action_enabled("Command 3", False)
+    assert not actions[3].isEnabled()
+
+    actions[7].setText("Renamed")
+    assert group.get_action("Renamed") is actions[7]
+    assert group.get_action("Command 7") is duplicate
+    assert group.get_button("Renamed").text() == "Renamed"
+    actions[2].setText("Command 5")
+    assert group.get_action("Command 5") is actions[2]
+    inserted = group.insertAction(actions[1], QAction("Command 5", group))
+    assert group.get_action("Command 5") is inserted
+    assert group.actions.index(inserted) == 1
+    control = QLabel("control")
+    group.addControl(control)
+    group.removeControl(control)
+    assert group.controlCount() == 0 and group.controlByWidget(control) is None
+
+    button = group.controlByAction(actions[10])
+    group.remove(button)
+    assert group.get_action("Command 10") is None
+    assert actions[10] not in group.actions and button not in group.buttons
+    group.remove(custom_widget)
+    assert group.get_action("Custom") is None and group.controlByAction(custom_action) is None
+
+    group.clear()
+    assert group.get_action("Command 0") is None and not group._actions_by_text
+    actions[0].setText("After clear")
+    assert group.get_action("After clear") is None
+    _dispose(group)
@@ -8,6 +8,7 @@ Run with:
 import os
 import sys
 import tempfile
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(
@@ -19,12 +20,18 @@ sys.path.insert(
     ),
 )
 
-from PySide6.QtCore import QSettings, Qt
+from PySide6.QtCore import QEvent, QObject, QSettings, QSize, Qt
 from PySide6.QtGui import QColor, QIcon, QPalette
 from PySide6.QtTest import QTest
 from PySide6.QtWidgets import QApplication, QFrame, QStackedWidget, QWidget, QMdiArea, QVBoxLayout
 
-from LqRibbon import LqStyle, RibbonPlatformLayout, RibbonMainWindow, RibbonStyle
+from LqRibbon import (
+    LqIconGenerator,
+    LqStyle,
+    RibbonPlatformLayout,
+    RibbonMainWindow,
+    RibbonStyle,
+)
 from main_window import (
     MainWindow,
     SYSTEM_RIBBON_STYLE_VALUE,
@@ -39,6 +46,19 @@ def _app():
     return app or QApplication([])
 
 
+class _EventTypeRecorder(QObject):
+    """Record the types of the events delivered to a watched object."""
+
+    def __init__(self, watched):
+        super().__init__(watched)
+        self.types = []
+        watched.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        self.types.append(event.type())
+        return False
+
+
 def test_default_style_is_office_2016_blue():
     window = RibbonMainWindow()
     assert window.ribbonStyle() == RibbonStyle.Office2016Blue
@@ -76,6 +96,64 @@ def test_window_style_pass_through_updates_full_stylesheet():
     window.close()
 
 
+def test_style_sheets_are_memoized_and_reapplied_only_on_change():
+    full = LqStyle.get_full_style(RibbonStyle.Microsoft365Dark, RibbonPlatformLayout.MacOS)
+    assert LqStyle.get_full_style(int(RibbonStyle.Microsoft365Dark), "macos") is full
+    assert LqStyle.get_ribbon_style(RibbonStyle.Microsoft365Dark) is not LqStyle.get_ribbon_style(
+        RibbonStyle.Microsoft365Dark, RibbonPlatformLayout.MacOS
+    )
+
+    palette = LqStyle.palette(RibbonStyle.Microsoft365Dark)
+    original_text = palette["text"]
+    try:
+        palette["text"] = "#abcdef"
+        assert "#abcdef" in LqStyle.get_group_style(RibbonStyle.Microsoft365Dark)
+    finally:
+        palette["text"] = original_text
+    assert "#abcdef" not in LqStyle.get_group_style(RibbonStyle.Microsoft365Dark)
+
+    widget = QWidget()
+    sheet = LqStyle.get_button_style(RibbonStyle.Office2016Blue)
+    assert LqStyle.apply_style_sheet(widget, sheet)
+    assert not LqStyle.apply_style_sheet(widget, sheet)
+    assert widget.styleSheet() == sheet
+    widget.deleteLater()
+
+
+def test_palette_theming_switches_style_without_repolishing_commands():
+    window = RibbonMainWindow()
+    ribbon = window.ribbonBar()
+    ribbon.setPlatformLayout(RibbonPlatformLayout.Classic)
+    group = ribbon.addPage("General").addGroup("Actions")
+    group.addAction(QIcon(), "Apply", Qt.ToolButtonStyle.ToolButtonTextUnderIcon)
+    button = group.get_button("Apply")
+    window.setPaletteThemingEnabled(True)
+    window.resize(640, 260)
+    window.show()
+    _app().processEvents()
+
+    window_sheet = window.styleSheet()
+    ribbon_sheet = ribbon.styleSheet()
+    assert LqStyle.palette(RibbonStyle.Office2016Blue)["ribbon_bg"] not in ribbon_sheet
+    button_events = _EventTypeRecorder(button)
+    window.setRibbonStyle(RibbonStyle.Microsoft365Dark)
+    _app().processEvents()
+    dark = LqStyle.palette(RibbonStyle.Microsoft365Dark)
+    assert window.styleSheet() == window_sheet
+    assert ribbon.styleSheet() == ribbon_sheet
+    assert button_events.types and QEvent.Type.Polish not in button_events.types
+    assert button.palette().color(QPalette.ColorRole.ButtonText) == QColor(dark["text"])
+    assert button.palette().color(QPalette.ColorRole.Highlight) == QColor(dark["group_hover"])
+    assert dark["tab_indicator"] in ribbon.tabBar().styleSheet()
+    assert dark["field_bg"] in ribbon.searchBar().styleSheet()
+
+    window.setPaletteThemingEnabled(False)
+    assert ribbon.tabBar().styleSheet() == ""
+    assert dark["tab_indicator"] in ribbon.styleSheet()
+    assert dark["text"] in window.styleSheet()
+    window.close()
+
+
 def test_fluent_tab_radius_applies_to_m365_only():
     blue_style = LqStyle.get_ribbon_style(RibbonStyle.Office2016Blue)
     light_style = LqStyle.get_ribbon_style(RibbonStyle.Microsoft365Light)
@@ -282,6 +360,108 @@ def test_page_command_area_three_sided_border_is_rendered():
     window.close()
 
 
+def test_frame_paint_resources_are_cached_between_repaints():
+    window = RibbonMainWindow()
+    ribbon = window.ribbonBar()
+    ribbon.setPlatformLayout(RibbonPlatformLayout.Classic)
+    page = ribbon.addPage("General")
+    page.addGroup("Actions").addAction(QIcon(), "Apply")
+    window.resize(640, 260)
+    window.show()
+    _app().processEvents()
+
+    with patch.object(
+        page, "_apply_surface_palette", wraps=page._apply_surface_palette
+    ) as surface_updates, patch.object(
+        ribbon, "_command_frame_outer_color", wraps=ribbon._command_frame_outer_color
+    ) as outer_color_lookups:
+        ribbon.grab()
+        page.grab()
+        bar_resources = ribbon._paint_resources
+        page_resources = page._paint_resources
+        outer_color_lookups.reset_mock()
+        ribbon.grab()
+        page.grab()
+        assert ribbon._paint_resources is bar_resources
+        assert page._paint_resources is page_resources
+        surface_updates.assert_not_called()
+        outer_color_lookups.assert_not_called()
+
+        ribbon.setRibbonStyle(RibbonStyle.Microsoft365Dark)
+        dark_bg = QColor(LqStyle.palette(RibbonStyle.Microsoft365Dark)["ribbon_bg"])
+        surface_updates.assert_called_once_with(dark_bg)
+        assert page.palette().color(QPalette.ColorRole.Window) == dark_bg
+        page.grab()
+        assert page._paint_resources is not page_resources
+        assert page._paint_resources["background_color"] == dark_bg
+        surface_updates.assert_called_once_with(dark_bg)
+
+    content = QWidget()
+    window.setCentralWidget(content)
+    ribbon.grab()
+    content_palette = content.palette()
+    content_palette.setColor(QPalette.ColorRole.Window, QColor("#123456"))
+    content.setPalette(content_palette)
+    ribbon.grab()
+    assert ribbon._paint_resources["outer_color"] == QColor("#123456")
+    mdi_area = QMdiArea()
+    mdi_area.setBackground(QColor("#654321"))
+    window.setCentralWidget(mdi_area)
+    ribbon.grab()
+    assert ribbon._paint_resources["outer_color"] == QColor("#654321")
+    window.close()
+
+
+def test_command_area_lookups_are_cached_and_follow_central_widget():
+    window = RibbonMainWindow()
+    central = QWidget()
+    central_palette = central.palette()
+    central_palette.setColor(QPalette.ColorRole.Window, QColor("#f3f3f3"))
+    central.setPalette(central_palette)
+    QVBoxLayout(central)
+    window.setCentralWidget(central)
+    ribbon = window.ribbonBar()
+    ribbon.setPlatformLayout(RibbonPlatformLayout.Classic)
+    ribbon.addPage("General")
+    window.resize(640, 260)
+    window.show()
+    _app().processEvents()
+
+    with patch.object(
+        ribbon, "_find_command_area_stack", wraps=ribbon._find_command_area_stack
+    ) as stack_lookups, patch.object(
+        ribbon, "_watch_central_widget", wraps=ribbon._watch_central_widget
+    ) as mdi_scans:
+        for width in range(640, 760, 20):
+            window.resize(width, 260)
+            _app().processEvents()
+            ribbon.grab()
+        assert ribbon._command_frame_outer_color() == QColor("#f3f3f3")
+    stack_lookups.assert_not_called()
+    mdi_scans.assert_not_called()
+    assert ribbon._command_frame_outer_color() == QColor("#f3f3f3")
+
+    holder = QWidget()
+    central.layout().addWidget(holder)
+    assert ribbon._command_frame_outer_color() == QColor("#f3f3f3")
+    nested = QMdiArea(holder)
+    nested.setBackground(QColor("#6a6a6a"))
+    assert ribbon._command_frame_outer_color() == QColor("#6a6a6a")
+    nested.setParent(None)
+    assert ribbon._command_frame_outer_color() == QColor("#f3f3f3")
+
+    mdi_area = QMdiArea(central)
+    mdi_area.setBackground(QColor("#8a8a8a"))
+    central.layout().addWidget(mdi_area)
+    assert ribbon._command_frame_outer_color() == QColor("#8a8a8a")
+
+    replacement = QMdiArea()
+    replacement.setBackground(QColor("#5a5a5a"))
+    window.setCentralWidget(replacement)
+    assert ribbon._command_frame_outer_color() == QColor("#5a5a5a")
+    window.close()
+
+
 def test_python_frame_theme_uses_frameless_window_and_buttons():
     window = MainWindow()
     window.show()
@@ -584,6 +764,38 @@ def test_example_style_choice_persists_to_settings():
         window.close()
 
 
+def test_icon_generator_caches_icons_and_renders_at_device_pixel_ratio():
+    _app()
+    LqIconGenerator.clear_cache()
+    first = LqIconGenerator.get_action_icons()
+    assert LqIconGenerator.cache_size() == 9
+    atlas = LqIconGenerator.atlas()
+    assert atlas.width() >= 9 * 24
+    second = LqIconGenerator.get_action_icons()
+    assert LqIconGenerator.atlas() is atlas
+    assert all(first[name].cacheKey() == second[name].cacheKey() for name in first)
+    assert (
+        LqIconGenerator.create_colored_icon("V", "#5F9EA0").cacheKey()
+        == first["Version"].cacheKey()
+    )
+
+    hidpi = LqIconGenerator.create_colored_icon("A", "#4682B4", device_pixel_ratio=2.0)
+    pixmap = hidpi.pixmap(QSize(24, 24), 2.0)
+    assert pixmap.devicePixelRatio() == 2.0
+    assert pixmap.size() == QSize(48, 48)
+    assert hidpi.cacheKey() != first["Language"].cacheKey()
+    assert pixmap.toImage().pixelColor(24, 6) == QColor("#4682B4")
+
+    LqIconGenerator.set_cache_limit(4)
+    try:
+        assert LqIconGenerator.cache_size() == 4
+        LqIconGenerator.create_colored_icon("Z", "#123456")
+        assert LqIconGenerator.cache_size() == 4
+    finally:
+        LqIconGenerator.set_cache_limit(256)
+        LqIconGenerator.clear_cache()
+
+
 def main():
     _app()
     tests = [
@@ -607,6 +819,7 @@ def main():
         test_example_high_contrast_style_preview_pass,
         test_example_touch_mouse_spacing_toggle_tracks_preview,
         test_example_style_choice_persists_to_settings,
+        test_icon_generator_caches_icons_and_renders_at_device_pixel_ratio,
     ]
     for test in tests:
         test()